@@ -1,27 +1,56 @@
 """Flask application factory for Observatorio Estadual de Ilhas de Calor – PE."""
 from __future__ import annotations
 
+import logging
+
 from flask import Flask
 
 from .config import get_config
-from .extensions import cors, db, ma
+from .extensions import cache, cors, db, ma
 from .routes import register_blueprints
+from .utils.db_pool import init_db_pool
+from .utils.db_routing import init_db_routing
+from .utils.metrics import init_metrics
+from .utils.serialization import init_json
+from .utils.sql_profiler import init_sql_profiler
 
 
 def create_app() -> Flask:
     """Create and configure the Flask application."""
     app = Flask(__name__, instance_relative_config=False)
     app.config.from_object(get_config())
+    init_json(app)
+    init_db_routing(app)
+    init_db_pool(app)
 
     # Initialize extensions
     cors.init_app(app)
     db.init_app(app)
     ma.init_app(app)
+    cache.init_app(app)
 
     # Register blueprints
     register_blueprints(app)
+    init_metrics(app)
+    init_sql_profiler(app)
+
+    if app.config.get("GOLD_CUBE_ENABLED"):
+        _preload_gold_cube(app)
 
     return app
 
 
+def _preload_gold_cube(app: Flask) -> None:
+    """Load the GOLD cube at startup so the first request does not pay for it."""
+    from .services.gold_cube import get_gold_cube
+
+    with app.app_context():
+        try:
+            get_gold_cube()
+        except Exception as e:  # DB not reachable yet: the first request loads it
+            logging.getLogger(__name__).warning("GOLD cube preload failed: %s", e)
+        finally:
+            db.session.remove()
+
+
 __all__ = ["create_app"]
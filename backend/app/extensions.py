@@ -5,10 +5,14 @@ from flask_cors import CORS
 from flask_marshmallow import Marshmallow
 from flask_sqlalchemy import SQLAlchemy
 
+from .utils.cache import ResponseCache
+from .utils.db_routing import RoutingSession
+
 # Initialize extensions (bound in create_app)
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 ma = Marshmallow()
 cors = CORS()
+cache = ResponseCache()
 
 
-__all__ = ["db", "ma", "cors"]
+__all__ = ["db", "ma", "cors", "cache"]
@@ -2,7 +2,7 @@
 from .climate import ClimateHourly, ClimateHourlySchema
 from .stations import Station, StationSchema
 from .metrics import DailyMetrics, DailyMetricsSchema
-from .gold import GoldClimaPeDiario
+from .gold import GOLD_METRIC_COLUMNS, GoldClimaPeDiario
 
 __all__ = [
     "ClimateHourly",
@@ -12,4 +12,5 @@ __all__ = [
     "DailyMetrics",
     "DailyMetricsSchema",
     "GoldClimaPeDiario",
+    "GOLD_METRIC_COLUMNS",
 ]
@@ -26,6 +26,11 @@ class ClimateHourly(db.Model):
 
     __table_args__ = (Index("ix_climate_station_date", "station_code", "datetime_utc"),)
 
+    @classmethod
+    def row_columns(cls) -> list:
+        """All columns as a select list (the fields ``ClimateHourlySchema`` dumps)."""
+        return [getattr(cls, column.key) for column in cls.__table__.columns]
+
     def __repr__(self) -> str:  # pragma: no cover
         return f"<ClimateHourly {self.station_code} {self.datetime_utc}>"
 
@@ -5,8 +5,24 @@ from __future__ import annotations
 
 from datetime import datetime
 
+from sqlalchemy import Float, cast
+
 from app.extensions import db
 
+# Numeric metric columns, in to_dict order
+GOLD_METRIC_COLUMNS = (
+    "temp_media",
+    "temp_max",
+    "temp_min",
+    "umidade_media",
+    "precipitacao_total",
+    "radiacao_total",
+    "amplitude_termica",
+    "aparente_media",
+    "heat_index_max",
+    "rolling_heat_7d",
+)
+
 
 class GoldClimaPeDiario(db.Model):
     """Daily aggregated climate metrics by city."""
@@ -40,22 +56,31 @@ class GoldClimaPeDiario(db.Model):
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
-        return {
+        data = {
             "id": self.id,
             "id_cidade": self.id_cidade,
             "data": self.data.isoformat() if self.data else None,
-            "temp_media": float(self.temp_media) if self.temp_media else None,
-            "temp_max": float(self.temp_max) if self.temp_max else None,
-            "temp_min": float(self.temp_min) if self.temp_min else None,
-            "umidade_media": float(self.umidade_media) if self.umidade_media else None,
-            "precipitacao_total": float(self.precipitacao_total) if self.precipitacao_total else None,
-            "radiacao_total": float(self.radiacao_total) if self.radiacao_total else None,
-            "amplitude_termica": float(self.amplitude_termica) if self.amplitude_termica else None,
-            "aparente_media": float(self.aparente_media) if self.aparente_media else None,
-            "heat_index_max": float(self.heat_index_max) if self.heat_index_max else None,
-            "rolling_heat_7d": float(self.rolling_heat_7d) if self.rolling_heat_7d else None,
-            "risco_calor": self.risco_calor,
         }
+        for name in GOLD_METRIC_COLUMNS:
+            value = getattr(self, name)
+            data[name] = float(value) if value is not None else None
+        data["risco_calor"] = self.risco_calor
+        return data
+
+    @classmethod
+    def row_columns(cls) -> list:
+        """``to_dict`` fields as a select list, numerics cast to float in SQL.
+
+        Selecting these instead of the entity skips ORM hydration and the
+        per-row ``Decimal`` conversion on long series.
+        """
+        return [
+            cls.id,
+            cls.id_cidade,
+            cls.data,
+            *(cast(getattr(cls, name), Float).label(name) for name in GOLD_METRIC_COLUMNS),
+            cls.risco_calor,
+        ]
 
 
-__all__ = ["GoldClimaPeDiario"]
+__all__ = ["GoldClimaPeDiario", "GOLD_METRIC_COLUMNS"]
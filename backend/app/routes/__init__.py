@@ -9,6 +9,8 @@ def register_blueprints(app: Flask) -> None:
     from .api_stations import bp as stations_bp
     from .api_simulation import bp as simulation_bp
     from .api_analytics import bp as analytics_bp
+    from .api_export import bp as export_bp
+    from .api_metrics import bp as metrics_bp
     from .api_gold import api_gold as gold_bp
     from .api_geo import api_geo_bp as geo_bp
     from .dashboard import dashboard_bp
@@ -19,6 +21,8 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(stations_bp)
     app.register_blueprint(simulation_bp)
     app.register_blueprint(analytics_bp)
+    app.register_blueprint(export_bp)
+    app.register_blueprint(metrics_bp)
     app.register_blueprint(gold_bp)
     app.register_blueprint(geo_bp)
     app.register_blueprint(dashboard_bp)
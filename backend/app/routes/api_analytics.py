@@ -4,10 +4,12 @@ from __future__ import annotations
 from flask import Blueprint, request
 
 from ..services.analytics_service import (
-    compute_heat_alerts,
+    ALERTS_PAGE_SIZE,
+    compute_heat_alerts_page,
     compute_rank_hottest_stations,
     compute_statewide_heat_map,
 )
+from ..utils.pagination import cursor_headers
 from ..utils.responses import error, success
 
 bp = Blueprint("api_analytics", __name__, url_prefix="/api/analytics")
@@ -31,9 +33,19 @@ def hottest():
 
 @bp.get("/alerts")
 def alerts():
+    """Hourly records at or above ``threshold``, hottest first, paged by cursor
+    (``X-Next-Cursor`` / ``Link`` headers, ``?cursor=`` to continue)."""
     try:
         threshold = float(request.args.get("threshold", 40.0))
     except Exception:
         return error("Invalid threshold", status=400)
-    data = compute_heat_alerts(threshold)
-    return success(data)
+    try:
+        limit = min(max(int(request.args.get("limit", ALERTS_PAGE_SIZE)), 1), ALERTS_PAGE_SIZE)
+    except Exception:
+        return error("Invalid limit", status=400)
+    try:
+        data, next_cursor = compute_heat_alerts_page(threshold, request.args.get("cursor"), limit)
+    except ValueError as e:
+        return error(str(e), status=400)
+    body, status = success(data)
+    return body, status, cursor_headers(next_cursor)
@@ -4,25 +4,103 @@ from __future__ import annotations
 from flask import Blueprint, request
 
 from ..services.climate_service import (
+    MAX_HOURLY_ROWS,
     compute_trends,
-    get_climate_by_station,
+    get_climate_page,
     get_daily_summary,
     list_years_available,
 )
+from ..utils.conditional import conditional
+from ..utils.downsample import DOWNSAMPLE_METHODS
+from ..utils.pagination import cursor_headers
 from ..utils.responses import error, success
+from ..utils.serialization import arrow_response, response_format
 
 bp = Blueprint("api_climate", __name__, url_prefix="/api/climate")
 
+MIN_POINTS, MAX_POINTS = 3, 20000
+DOWNSAMPLE_METRICS = (
+    "temperature",
+    "humidity",
+    "wind_speed",
+    "radiation",
+    "precipitation",
+    "apparent_temperature",
+    "heat_index",
+)
+
 
 @bp.get("/station/<code>")
+@conditional("climate")
 def climate_by_station(code: str):
+    """Hourly rows, newest first, in pages of ``limit`` rows (default 5000).
+
+    When more rows exist the response carries ``X-Next-Cursor`` and a
+    ``Link: rel="next"`` header; pass the value back as ``?cursor=``.
+    ``?format=columnar`` (or ``arrow``) returns one array per field.
+    ``?points=N`` downsamples the whole range to about N rows in one page;
+    ``downsample=lttb|minmax`` picks the method and ``metric`` the series the
+    points are chosen on (default temperature).
+    """
     start = request.args.get("start")
     end = request.args.get("end")
-    data = get_climate_by_station(code, start, end)
-    return success(data)
+    try:
+        fmt = response_format(request.args.get("format"))
+        options = _downsample_args()
+        options["limit"] = _page_size()
+        data, next_cursor = get_climate_page(
+            code,
+            start,
+            end,
+            cursor=request.args.get("cursor"),
+            columnar=fmt != "rows",
+            iso_dates=fmt != "arrow",
+            **options,
+        )
+    except ValueError as e:
+        return error(str(e), status=400)
+    headers = cursor_headers(next_cursor)
+    if fmt == "arrow":
+        response = arrow_response(data)
+        response.headers.update(headers)
+        return response
+    if fmt == "columnar":
+        data = {**data, "total": len(data["id"]), "next_cursor": next_cursor}
+    body, status = success(data)
+    return body, status, headers
+
+
+def _page_size() -> int:
+    try:
+        limit = int(request.args.get("limit", MAX_HOURLY_ROWS))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if not 1 <= limit <= MAX_HOURLY_ROWS:
+        raise ValueError(f"limit must be between 1 and {MAX_HOURLY_ROWS}")
+    return limit
+
+
+def _downsample_args() -> dict:
+    points = request.args.get("points")
+    if not points:
+        return {}
+    try:
+        points = int(points)
+    except ValueError:
+        raise ValueError("points must be an integer")
+    if not MIN_POINTS <= points <= MAX_POINTS:
+        raise ValueError(f"points must be between {MIN_POINTS} and {MAX_POINTS}")
+    method = request.args.get("downsample", "lttb")
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"downsample must be one of: {', '.join(DOWNSAMPLE_METHODS)}")
+    metric = request.args.get("metric", "temperature")
+    if metric not in DOWNSAMPLE_METRICS:
+        raise ValueError(f"metric must be one of: {', '.join(DOWNSAMPLE_METRICS)}")
+    return {"points": points, "method": method, "metric": metric}
 
 
 @bp.get("/station/<code>/daily")
+@conditional("climate")
 def climate_daily(code: str):
     try:
         limit = int(request.args.get("limit", 30))
@@ -33,12 +111,14 @@ def climate_daily(code: str):
 
 
 @bp.get("/years")
+@conditional("climate")
 def climate_years():
     data = list_years_available()
     return success(data)
 
 
 @bp.get("/<code>/trends")
+@conditional("climate")
 def climate_trends(code: str):
     data = compute_trends(code)
     if not data:
@@ -0,0 +1,84 @@
+"""Bulk export endpoints (streamed NDJSON / CSV)."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from flask import Blueprint, Response, request, stream_with_context
+
+from ..services.export_service import EXPORT_MIMETYPES, export_rows
+from ..utils.db_pool import statement_timeout
+from ..utils.responses import error
+
+bp = Blueprint("api_export", __name__, url_prefix="/api/export")
+
+
+def _date_arg(name: str):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Invalid {name} format. Use YYYY-MM-DD")
+
+
+def _list_arg(name: str) -> list:
+    return [item.strip() for item in request.args.get(name, "").split(",") if item.strip()]
+
+
+def _wants_gzip() -> bool:
+    flag = request.args.get("gzip")
+    if flag is not None:
+        return flag.lower() in {"1", "true", "yes", "on"}
+    return "gzip" in request.accept_encodings
+
+
+def _export(dataset: str, ids, start, end):
+    fmt = (request.args.get("format") or "ndjson").lower()
+    compress = _wants_gzip()
+    try:
+        chunks = export_rows(dataset, fmt, ids=ids, start=start, end=end, compress=compress)
+    except ValueError as e:
+        return error(str(e), status=400)
+    filename = f"{dataset}.{'ndjson' if fmt == 'ndjson' else 'csv'}"
+    response = Response(stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response.headers["Vary"] = "Accept-Encoding"
+    if compress:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+@bp.get("/gold")
+@statement_timeout(0)  # long by design; streamed in batches
+def export_gold():
+    """Daily GOLD rows for ``ids`` (comma-separated id_cidade, default all), ``start``..``end`` inclusive.
+
+    ``format=ndjson`` (default) or ``csv``. The body is gzip-compressed when
+    the client accepts it (or with ``gzip=1``; ``gzip=0`` disables it).
+    """
+    try:
+        ids = [int(i) for i in _list_arg("ids")]
+    except ValueError:
+        return error("ids must be comma-separated integers", status=400)
+    try:
+        start, end = _date_arg("start"), _date_arg("end")
+    except ValueError as e:
+        return error(str(e), status=400)
+    return _export("gold", ids, start, end)
+
+
+@bp.get("/bronze")
+@statement_timeout(0)
+def export_bronze():
+    """Hourly BRONZE rows for ``stations`` (comma-separated codes, default all), ``start``..``end`` inclusive.
+
+    Same ``format`` and gzip options as ``/api/export/gold``.
+    """
+    try:
+        start, end = _date_arg("start"), _date_arg("end")
+    except ValueError as e:
+        return error(str(e), status=400)
+    # Whole days: the end date's hours are included
+    end = end + timedelta(days=1) if end else None
+    return _export("bronze", _list_arg("stations"), start, end)
@@ -4,13 +4,25 @@ API routes para servir dados geográficos em GeoJSON.
 
 Endpoints:
   - GET /api/geo/municipios-pe: Retorna GeoJSON com todos os municípios de PE
+    (``?detail=low|medium|high`` para malhas simplificadas, ``&format=topojson``)
   - GET /api/geo/estado-pe: Retorna GeoJSON com a geometria do estado de PE
+  - GET /api/geo/tiles/<z>/<x>/<y>.mvt: Vector tile (MVT) com o risco de calor
+    mais recente de cada município
+
+Os arquivos são carregados uma vez por processo, minificados e mantidos em
+memória já comprimidos (gzip/brotli); cada requisição só escolhe os bytes
+conforme o ``Accept-Encoding``. Os níveis de detalhe são gerados por
+``scripts/build_geo_lod.py`` (Visvalingam com topologia preservada).
 """
 
+import gzip
 from pathlib import Path
 
-from flask import Blueprint, jsonify, send_from_directory, current_app
-import json
+from flask import Blueprint, jsonify, send_from_directory, current_app, request
+
+from app.services.geo_assets import get_geo_asset, preload_geo_assets
+from app.services.tile_service import MAX_ZOOM, get_tile
+from app.utils.conditional import conditional, conditional_file
 
 api_geo_bp = Blueprint('api_geo', __name__, url_prefix='/api/geo')
 
@@ -19,38 +31,88 @@ GEO_DIR = Path(__file__).parent.parent / 'static' / 'geo'
 MUNICIPIOS_PE_FILE = GEO_DIR / 'municipios_pe.geojson'
 ESTADO_PE_FILE = GEO_DIR / 'estado_pe.geojson'
 
+# Níveis de detalhe gerados por scripts/build_geo_lod.py
+DETAIL_LEVELS = ('low', 'medium', 'high')
+GEO_FORMATS = ('geojson', 'topojson')
+
+# As malhas só mudam quando o script do IBGE roda; ETag garante revalidação
+GEO_CACHE_CONTROL = 'public, max-age=86400, stale-while-revalidate=604800'
+
+
+def _lod_file(detail: str, fmt: str) -> Path:
+    return GEO_DIR / f'municipios_pe.{detail}.{fmt}'
+
+
+def _municipios_file():
+    """Resolve o arquivo de municípios pedido via ``detail``/``format`` (None se inválido)."""
+    detail = request.args.get('detail')
+    fmt = request.args.get('format', 'geojson')
+    if fmt not in GEO_FORMATS or (detail is not None and detail not in DETAIL_LEVELS):
+        return None
+    if detail is None:
+        return MUNICIPIOS_PE_FILE if fmt == 'geojson' else None
+    path = _lod_file(detail, fmt)
+    if not path.exists() and fmt == 'geojson':
+        # Sem o build de LOD, cai para a malha completa
+        return MUNICIPIOS_PE_FILE
+    return path
+
+
+@api_geo_bp.record_once
+def _preload(state):
+    """Carrega e comprime os GeoJSON na inicialização de cada worker."""
+    lod_files = [_lod_file(d, f) for d in DETAIL_LEVELS for f in GEO_FORMATS]
+    preload_geo_assets([MUNICIPIOS_PE_FILE, ESTADO_PE_FILE] + [p for p in lod_files if p.exists()])
+
+
+def _serve_geo_asset(path: Path, descricao: str):
+    """Retorna o GeoJSON pré-comprimido com negociação de Content-Encoding."""
+    asset = get_geo_asset(path)
+    if asset is None:
+        return jsonify({
+            'success': False,
+            'error': f'Arquivo de {descricao} não encontrado ({path.name}). Execute: python scripts/fetch_ibge_malhas_pe.py'
+        }), 404
+
+    body, encoding = asset.negotiate(request.accept_encodings)
+    response = current_app.response_class(body, status=200, mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = GEO_CACHE_CONTROL
+    return response
+
 
 @api_geo_bp.route('/municipios-pe', methods=['GET'])
+@conditional_file(_municipios_file)
 def get_municipios_pe():
     """
     Retorna GeoJSON com todos os municípios de Pernambuco.
     
+    Query parameters:
+        detail: low | medium | high (opcional; sem ele, malha em resolução total)
+        format: geojson (padrão) | topojson (requer ``detail``)
+    
     Returns:
-        JSON (GeoJSON FeatureCollection) com as geometrias de todos os municípios
+        JSON (GeoJSON FeatureCollection ou TopoJSON Topology) com as geometrias
+        de todos os municípios, comprimido com brotli ou gzip quando o cliente aceita
         
     Status Codes:
         200: Sucesso
+        304: Não modificado (If-None-Match / If-Modified-Since)
+        400: ``detail`` ou ``format`` inválido
         404: Arquivo não encontrado (execute `python scripts/fetch_ibge_malhas_pe.py`)
         500: Erro ao ler arquivo
     """
     try:
-        if not MUNICIPIOS_PE_FILE.exists():
+        path = _municipios_file()
+        if path is None:
             return jsonify({
                 'success': False,
-                'error': 'Arquivo de municípios PE não encontrado. Execute: python scripts/fetch_ibge_malhas_pe.py'
-            }), 404
-        
-        # Ler e retornar o arquivo GeoJSON
-        with open(MUNICIPIOS_PE_FILE, 'r', encoding='utf-8') as f:
-            geojson_data = json.load(f)
-        
-        # Registrar no log (opcional)
-        current_app.logger.info(
-            f"Servindo GeoJSON de municípios PE: {len(geojson_data.get('features', []))} features"
-        )
-        
-        return jsonify(geojson_data), 200
-        
+                'error': "Parâmetros inválidos: detail deve ser low, medium ou high; "
+                         "format deve ser geojson ou topojson (topojson requer detail)"
+            }), 400
+        return _serve_geo_asset(path, 'municípios PE')
     except Exception as e:
         current_app.logger.error(f"Erro ao servir GeoJSON de municípios: {e}")
         return jsonify({
@@ -60,36 +122,23 @@ def get_municipios_pe():
 
 
 @api_geo_bp.route('/estado-pe', methods=['GET'])
+@conditional_file(ESTADO_PE_FILE)
 def get_estado_pe():
     """
     Retorna GeoJSON com a geometria do estado de Pernambuco.
     
     Returns:
-        JSON (GeoJSON FeatureCollection) com a geometria do estado
+        JSON (GeoJSON FeatureCollection) com a geometria do estado,
+        comprimido com brotli ou gzip quando o cliente aceita
         
     Status Codes:
         200: Sucesso
+        304: Não modificado (If-None-Match / If-Modified-Since)
         404: Arquivo não encontrado (execute `python scripts/fetch_ibge_malhas_pe.py`)
         500: Erro ao ler arquivo
     """
     try:
-        if not ESTADO_PE_FILE.exists():
-            return jsonify({
-                'success': False,
-                'error': 'Arquivo de estado PE não encontrado. Execute: python scripts/fetch_ibge_malhas_pe.py'
-            }), 404
-        
-        # Ler e retornar o arquivo GeoJSON
-        with open(ESTADO_PE_FILE, 'r', encoding='utf-8') as f:
-            geojson_data = json.load(f)
-        
-        # Registrar no log (opcional)
-        current_app.logger.info(
-            f"Servindo GeoJSON do estado PE: {len(geojson_data.get('features', []))} features"
-        )
-        
-        return jsonify(geojson_data), 200
-        
+        return _serve_geo_asset(ESTADO_PE_FILE, 'estado PE')
     except Exception as e:
         current_app.logger.error(f"Erro ao servir GeoJSON do estado: {e}")
         return jsonify({
@@ -98,7 +147,52 @@ def get_estado_pe():
         }), 500
 
 
+@api_geo_bp.route('/tiles/<int:z>/<int:x>/<int:y>.mvt', methods=['GET'])
+@conditional('gold')
+def get_tile_mvt(z: int, x: int, y: int):
+    """
+    Retorna um vector tile (Mapbox Vector Tile) da camada ``municipios``.
+    
+    As geometrias vêm das malhas simplificadas (low até z7, medium até z9,
+    high acima) recortadas ao tile; cada feição traz ``codigo_ibge``, ``nome``,
+    ``id_cidade``, ``data``, ``risco_calor``, ``risco``, ``heat_index_max`` e
+    ``temp_max`` do dia GOLD mais recente. Tiles renderizados ficam em disco
+    (``TILE_CACHE_DIR``) por versão dos dados GOLD.
+    
+    Returns:
+        application/vnd.mapbox-vector-tile (gzip quando o cliente aceita);
+        corpo vazio para tiles fora de Pernambuco
+        
+    Status Codes:
+        200: Sucesso
+        304: Não modificado (If-None-Match / If-Modified-Since)
+        400: Coordenadas de tile inválidas
+        500: Erro ao gerar o tile
+    """
+    if not 0 <= z <= MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        return jsonify({
+            'success': False,
+            'error': f'Tile inválido: z deve estar entre 0 e {MAX_ZOOM} e x, y entre 0 e 2^z - 1'
+        }), 400
+    try:
+        cache_dir = current_app.config.get('TILE_CACHE_DIR')
+        tile = get_tile(z, x, y, Path(cache_dir) if cache_dir else None)
+        response = current_app.response_class(tile, status=200, mimetype='application/vnd.mapbox-vector-tile')
+        if tile and request.accept_encodings.quality('gzip') > 0:
+            response.set_data(gzip.compress(tile, compresslevel=6))
+            response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+    except Exception as e:
+        current_app.logger.error(f"Erro ao gerar tile {z}/{x}/{y}: {e}")
+        return jsonify({
+            'success': False,
+            'error': f'Erro ao gerar tile: {str(e)}'
+        }), 500
+
+
 @api_geo_bp.route('/municipios-pe/raw', methods=['GET'])
+@conditional_file(MUNICIPIOS_PE_FILE)
 def get_municipios_pe_raw():
     """
     Retorna o arquivo GeoJSON bruto (raw) com content-type correto.
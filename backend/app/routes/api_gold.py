@@ -5,20 +5,54 @@ Routes:
     GET /api/gold/<cidade_id>/diario    - Last 7 days + current day
     GET /api/gold/<cidade_id>/risco     - Current heat risk
     GET /api/gold/<cidade_id>/serie     - Full daily time series
+    GET /api/gold/<cidade_id>/resumo    - Latest day + 7-day trend
+    GET /api/gold/batch                 - Series of several cities at once
+    GET /api/gold/resumo                - /resumo of every city
+    GET /api/gold/cidades               - Cities with GOLD data
+    GET /api/gold/mapa                  - Latest risk per municipality
+    GET /api/gold/cache                 - Response cache hit/miss counters
+
+GOLD data only changes when the ETL runs ``run-gold``; read endpoints are
+cached per worker and invalidated by the data-version stamp bumped in
+``etl.load.load_gold``; the same stamp drives their ETag/Last-Modified.
+With ``GOLD_CUBE_ENABLED`` they are answered from the in-memory GOLD cube
+(``app.services.gold_cube``) instead of the database.
 """
 from __future__ import annotations
 
+import logging
 from datetime import datetime, timedelta
+from itertools import groupby
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import Float, Integer, any_, bindparam, cast
+from sqlalchemy.dialects.postgresql import ARRAY
 
-from app.models.gold import GoldClimaPeDiario
+from app.extensions import cache, db
+from app.models.gold import GOLD_METRIC_COLUMNS, GoldClimaPeDiario
+from app.services import gold_cube
+from app.services.gold_summary_service import city_summaries
+from app.services.map_service import latest_risk_by_city
+from app.utils.conditional import conditional, utc_today
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
 from app.utils.responses import success, error
+from app.utils.serialization import arrow_response, response_format, row_columns, row_dicts
+
+logger = logging.getLogger(__name__)
 
 api_gold = Blueprint("api_gold", __name__, url_prefix="/api/gold")
 
 
+def _cube():
+    """The in-memory GOLD cube when enabled and loadable, else None (use SQL)."""
+    if not current_app.config.get("GOLD_CUBE_ENABLED"):
+        return None
+    return gold_cube.get_gold_cube()
+
+
 @api_gold.route("/<int:cidade_id>/diario", methods=["GET"])
+@conditional("gold", per_day=True)
+@cache.cached("gold", per_day=True)
 def get_last_days(cidade_id: int):
     """
     Get last 7 days + current day of daily climate metrics.
@@ -41,11 +75,16 @@ def get_last_days(cidade_id: int):
     """
     try:
         # Get last 8 days (7 previous + today)
-        today = datetime.utcnow().date()
+        today = utc_today()
         start_date = today - timedelta(days=7)
+
+        cube = _cube()
+        if cube is not None:
+            return success(gold_cube.last_days(cube, cidade_id, today))
         
         records = (
-            GoldClimaPeDiario.query.filter(
+            db.session.query(*GoldClimaPeDiario.row_columns())
+            .filter(
                 GoldClimaPeDiario.id_cidade == cidade_id,
                 GoldClimaPeDiario.data >= start_date,
             )
@@ -53,17 +92,28 @@ def get_last_days(cidade_id: int):
             .all()
         )
         
-        if not records:
-            return success([])
-        
-        data = [record.to_dict() for record in records]
-        return success(data)
+        return success(row_dicts(records))
     
     except Exception as e:
         return error(f"Failed to retrieve daily metrics: {str(e)}", status=500)
 
 
+def _columnar_response(columns: dict, fmt: str, next_cursor=None):
+    if fmt == "arrow":
+        response = arrow_response(columns)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return response
+    total = len(next(iter(columns.values()), []))
+    return success({**columns, "total": total, "next_cursor": next_cursor})
+
+
+_RISK_FIELDS = ("data", "risco_calor", "heat_index_max", "temp_max", "temp_media", "umidade_media")
+
+
 @api_gold.route("/<int:cidade_id>/risco", methods=["GET"])
+@conditional("gold")
+@cache.cached("gold")
 def get_current_risk(cidade_id: int):
     """
     Get current (latest) heat risk classification.
@@ -80,10 +130,17 @@ def get_current_risk(cidade_id: int):
         }
     """
     try:
+        cube = _cube()
+        if cube is not None:
+            latest = gold_cube.latest(cube, cidade_id)
+            if not latest:
+                return error("No risk data found for this city", status=404)
+            return success({k: latest[k] for k in _RISK_FIELDS})
+
+        columns = {c.key: c for c in GoldClimaPeDiario.row_columns()}
         record = (
-            GoldClimaPeDiario.query.filter(
-                GoldClimaPeDiario.id_cidade == cidade_id,
-            )
+            db.session.query(*(columns[name] for name in _RISK_FIELDS))
+            .filter(GoldClimaPeDiario.id_cidade == cidade_id)
             .order_by(GoldClimaPeDiario.data.desc())
             .first()
         )
@@ -91,22 +148,15 @@ def get_current_risk(cidade_id: int):
         if not record:
             return error("No risk data found for this city", status=404)
         
-        data = {
-            "data": record.data.isoformat() if record.data else None,
-            "risco_calor": record.risco_calor,
-            "heat_index_max": float(record.heat_index_max) if record.heat_index_max else None,
-            "temp_max": float(record.temp_max) if record.temp_max else None,
-            "temp_media": float(record.temp_media) if record.temp_media else None,
-            "umidade_media": float(record.umidade_media) if record.umidade_media else None,
-        }
-        
-        return success(data)
+        return success(row_dicts([record])[0])
     
     except Exception as e:
         return error(f"Failed to retrieve risk data: {str(e)}", status=500)
 
 
 @api_gold.route("/<int:cidade_id>/serie", methods=["GET"])
+@conditional("gold")
+@cache.cached("gold")
 def get_time_series(cidade_id: int):
     """
     Get full daily time series of climate metrics.
@@ -114,7 +164,9 @@ def get_time_series(cidade_id: int):
     Query parameters:
         start_date: YYYY-MM-DD (optional)
         end_date: YYYY-MM-DD (optional)
-        limit: max records to return (default: 365)
+        limit: max records per page (default: 365)
+        cursor: next_cursor of the previous page (optional)
+        format: rows (default) | columnar | arrow
     
     Returns:
         {
@@ -123,16 +175,32 @@ def get_time_series(cidade_id: int):
                 { "data": "2025-01-01", ... },
                 ...
             ],
-            "total": 365
+            "total": 365,
+            "next_cursor": "WzEsIjIwMjYtMDEtMDEiXQ"
         }
+
+        Pages are keyed on (id_cidade, data); ``next_cursor`` is null on the
+        last page. With ``format=columnar`` one array per field:
+        ``{"success": true, "data": {"data": ["2025-01-01", ...],
+        "temp_max": [32.1, ...], ..., "total": 365, "next_cursor": ...}}``;
+        ``format=arrow`` returns the same columns as an Arrow IPC stream
+        (next cursor in the ``X-Next-Cursor`` header).
     """
     try:
         # Parse query parameters
         start_date = request.args.get("start_date")
         end_date = request.args.get("end_date")
         limit = request.args.get("limit", default=365, type=int)
+        if limit < 1:
+            return error("limit must be at least 1", status=400)
+        try:
+            fmt = response_format(request.args.get("format"))
+        except ValueError as e:
+            return error(str(e), status=400)
         
-        query = GoldClimaPeDiario.query.filter(GoldClimaPeDiario.id_cidade == cidade_id)
+        query = db.session.query(*GoldClimaPeDiario.row_columns()).filter(
+            GoldClimaPeDiario.id_cidade == cidade_id
+        )
         
         if start_date:
             try:
@@ -148,25 +216,155 @@ def get_time_series(cidade_id: int):
             except ValueError:
                 return error("Invalid end_date format. Use YYYY-MM-DD", status=400)
         
-        # Order by date and limit
-        records = (
-            query.order_by(GoldClimaPeDiario.data.asc())
-            .limit(limit)
-            .all()
-        )
-        
-        if not records:
-            return success({"data": [], "total": 0})
+        cursor = request.args.get("cursor")
+        keys = (GoldClimaPeDiario.id_cidade, GoldClimaPeDiario.data)
+        after = None
+        if cursor:
+            try:
+                cursor_city, after = decode_cursor(cursor, keys)
+            except ValueError as e:
+                return error(str(e), status=400)
+            if cursor_city != cidade_id:
+                return error("Invalid cursor", status=400)
+
+        cube = _cube()
+        if cube is not None:
+            window = dict(start=start_date or None, end=end_date or None, limit=limit, after=after)
+            if fmt == "rows":
+                data, more = gold_cube.series(cube, cidade_id, **window)
+                next_cursor = encode_cursor([cidade_id, data[-1]["data"]]) if more else None
+                return success({"data": data, "total": len(data), "next_cursor": next_cursor})
+            columns, more = gold_cube.series_columns(cube, cidade_id, iso_dates=fmt != "arrow", **window)
+            next_cursor = encode_cursor([cidade_id, columns["data"][-1]]) if more else None
+            return _columnar_response(columns, fmt, next_cursor)
+
+        records, next_cursor = keyset_page(query, keys, limit, cursor)
         
-        data = [record.to_dict() for record in records]
+        if fmt != "rows":
+            names = [c.key for c in GoldClimaPeDiario.row_columns()]
+            columns = row_columns(records, names, iso_dates=fmt != "arrow")
+            return _columnar_response(columns, fmt, next_cursor)
+
+        data = row_dicts(records)
         
-        return success({"data": data, "total": len(data)})
+        return success({"data": data, "total": len(data), "next_cursor": next_cursor})
     
     except Exception as e:
         return error(f"Failed to retrieve time series: {str(e)}", status=500)
 
 
+# Upper bound on cities compared in one /batch request
+MAX_BATCH_CITIES = 50
+
+
+def _batch_columns_sql(cidade_ids: list, metrics: tuple, start_date, end_date) -> dict:
+    """All requested cities' rows in one ``id_cidade = ANY(:ids)`` query, as columns per city."""
+    query = (
+        db.session.query(
+            GoldClimaPeDiario.id_cidade,
+            GoldClimaPeDiario.data,
+            *(cast(getattr(GoldClimaPeDiario, name), Float).label(name) for name in metrics),
+            GoldClimaPeDiario.risco_calor,
+        )
+        .filter(GoldClimaPeDiario.id_cidade == any_(bindparam("ids", cidade_ids, type_=ARRAY(Integer))))
+        .order_by(GoldClimaPeDiario.id_cidade, GoldClimaPeDiario.data)
+    )
+    if start_date:
+        query = query.filter(GoldClimaPeDiario.data >= start_date)
+    if end_date:
+        query = query.filter(GoldClimaPeDiario.data <= end_date)
+
+    names = ["data", *metrics, "risco_calor"]
+    return {
+        cidade_id: row_columns([row[1:] for row in rows], names)
+        for cidade_id, rows in groupby(query.all(), key=lambda row: row[0])
+    }
+
+
+@api_gold.route("/batch", methods=["GET"])
+@conditional("gold")
+@cache.cached("gold")
+def get_batch_series():
+    """
+    Daily series of several cities in one request (e.g. the comparison view).
+
+    Query parameters:
+        ids: comma-separated id_cidade (required, at most 50)
+        metrics: comma-separated GOLD metrics (default: all)
+        start: YYYY-MM-DD (optional)
+        end: YYYY-MM-DD (optional)
+        format: rows (default) | columnar
+
+    Returns:
+        {
+            "success": true,
+            "data": [
+                {
+                    "id_cidade": 1,
+                    "total": 365,
+                    "serie": [{ "data": "2025-01-01", "temp_max": 32.1, ..., "risco_calor": "Alto" }, ...]
+                },
+                ...
+            ]
+        }
+
+        Cities come in the order of ``ids``; a city without data has an
+        empty ``serie``. With ``format=columnar`` each ``serie`` is one
+        array per field instead.
+    """
+    try:
+        try:
+            cidade_ids = list(dict.fromkeys(int(i) for i in request.args.get("ids", "").split(",") if i.strip()))
+        except ValueError:
+            return error("ids must be comma-separated integers", status=400)
+        if not cidade_ids:
+            return error("ids is required", status=400)
+        if len(cidade_ids) > MAX_BATCH_CITIES:
+            return error(f"At most {MAX_BATCH_CITIES} cities per request", status=400)
+
+        requested = [m.strip() for m in request.args.get("metrics", "").split(",") if m.strip()]
+        unknown = [m for m in requested if m not in GOLD_METRIC_COLUMNS]
+        if unknown:
+            return error(f"Unknown metrics: {', '.join(unknown)}", status=400)
+        metrics = tuple(m for m in GOLD_METRIC_COLUMNS if m in requested) or GOLD_METRIC_COLUMNS
+
+        fmt = (request.args.get("format") or "rows").lower()
+        if fmt not in ("rows", "columnar"):
+            return error("format must be one of: rows, columnar", status=400)
+
+        dates = {}
+        for name in ("start", "end"):
+            value = request.args.get(name)
+            try:
+                dates[name] = datetime.strptime(value, "%Y-%m-%d").date() if value else None
+            except ValueError:
+                return error(f"Invalid {name} format. Use YYYY-MM-DD", status=400)
+
+        cube = _cube()
+        if cube is not None:
+            by_city = gold_cube.batch_columns(cube, cidade_ids, metrics, dates["start"], dates["end"])
+        else:
+            by_city = _batch_columns_sql(cidade_ids, metrics, dates["start"], dates["end"])
+
+        data = []
+        for cidade_id in cidade_ids:
+            columns = by_city.get(cidade_id)
+            total = len(columns["data"]) if columns else 0
+            if fmt == "columnar":
+                serie = columns or {name: [] for name in ("data", *metrics, "risco_calor")}
+            else:
+                serie = [dict(zip(columns, values)) for values in zip(*columns.values())] if columns else []
+            data.append({"id_cidade": cidade_id, "total": total, "serie": serie})
+
+        return success(data)
+
+    except Exception as e:
+        return error(f"Failed to retrieve batch series: {str(e)}", status=500)
+
+
 @api_gold.route("/cidades", methods=["GET"])
+@conditional("gold")
+@cache.cached("gold")
 def list_cities():
     """
     Get list of all cities with GOLD climate data.
@@ -222,6 +420,8 @@ def list_cities():
 
 
 @api_gold.route("/<int:cidade_id>/resumo", methods=["GET"])
+@conditional("gold", per_day=True)
+@cache.cached("gold", per_day=True)
 def get_city_summary(cidade_id: int):
     """
     Get summary metrics for a city (latest day + 7-day trend).
@@ -246,81 +446,63 @@ def get_city_summary(cidade_id: int):
     """
     try:
         # Get today's data
-        today = datetime.utcnow().date()
-        today_record = (
-            GoldClimaPeDiario.query.filter(
-                GoldClimaPeDiario.id_cidade == cidade_id,
-                GoldClimaPeDiario.data == today
-            )
-            .first()
-        )
-        
-        if not today_record:
-            # Fallback to latest available date
-            today_record = (
-                GoldClimaPeDiario.query.filter(
-                    GoldClimaPeDiario.id_cidade == cidade_id
-                )
-                .order_by(GoldClimaPeDiario.data.desc())
-                .first()
-            )
-        
-        if not today_record:
+        today = utc_today()
+
+        cube = _cube()
+        if cube is not None:
+            data = gold_cube.summary(cube, cidade_id, today)
+            if not data:
+                return error(f"No data found for city {cidade_id}", status=404)
+            return success(data)
+
+        summaries = city_summaries(today, cidade_id)
+        if not summaries:
             return error(f"No data found for city {cidade_id}", status=404)
         
-        # Get last 7 days for trend analysis
-        start_date = today_record.data - timedelta(days=7)
-        last_7_days = (
-            GoldClimaPeDiario.query.filter(
-                GoldClimaPeDiario.id_cidade == cidade_id,
-                GoldClimaPeDiario.data >= start_date,
-                GoldClimaPeDiario.data <= today_record.data
-            )
-            .order_by(GoldClimaPeDiario.data.asc())
-            .all()
-        )
-        
-        # Calculate 7-day statistics
-        dias_risco_alto_7d = sum(
-            1 for r in last_7_days 
-            if r.risco_calor in ["Alto", "Muito Alto", "Extremo"]
-        )
-        
-        # Calculate temperature trend (compare first 3 days vs last 3 days)
-        if len(last_7_days) >= 6:
-            temp_media_first_3 = sum(r.temp_media or 0 for r in last_7_days[:3]) / 3
-            temp_media_last_3 = sum(r.temp_media or 0 for r in last_7_days[-3:]) / 3
-            tendencia = "aumentando" if temp_media_last_3 > temp_media_first_3 else "diminuindo"
-        else:
-            tendencia = "estável"
-        
-        data = {
-            "id_cidade": today_record.id_cidade,
-            "nome_cidade": today_record.nome_cidade,
-            "uf": today_record.uf,
-            "codigo_ibge": today_record.codigo_ibge,
-            "data_atual": today_record.data.isoformat(),
-            "risco_calor": today_record.risco_calor,
-            "heat_index_max": today_record.heat_index_max,
-            "temp_max": today_record.temp_max,
-            "temp_media": today_record.temp_media,
-            "temp_min": today_record.temp_min,
-            "umidade_media": today_record.umidade_media,
-            "dias_risco_alto_7d": dias_risco_alto_7d,
-            "tendencia_temp": tendencia
-        }
-        
-        return success(data)
+        return success(summaries[0])
     
     except Exception as e:
         return error(f"Failed to retrieve city summary: {str(e)}", status=500)
 
 
+@api_gold.route("/resumo", methods=["GET"])
+@conditional("gold", per_day=True)
+@cache.cached("gold", per_day=True)
+def get_all_summaries():
+    """
+    ``/<cidade_id>/resumo`` of every city with GOLD data, in one query.
+
+    Returns:
+        {
+            "success": true,
+            "data": [
+                { "id_cidade": 1, "nome_cidade": "Recife", "data_atual": "2025-12-07", ... },
+                ...
+            ]
+        }
+    """
+    try:
+        today = utc_today()
+
+        cube = _cube()
+        if cube is not None:
+            summaries = (gold_cube.summary(cube, cidade_id, today) for cidade_id in cube.city_ids.tolist())
+            return success([s for s in summaries if s])
+
+        return success(city_summaries(today))
+
+    except Exception as e:
+        return error(f"Failed to retrieve city summaries: {str(e)}", status=500)
+
+
 @api_gold.route("/mapa", methods=["GET"])
+@conditional("gold")
+@cache.cached("gold")
 def get_map_data():
     """
     Get heat risk data for map visualization by municipality.
-    Returns latest risk classification for each city.
+    Returns latest risk classification for each city (observed rows only),
+    with the mean ``heat_index_max`` over all of its days.
     
     Returns:
         {
@@ -330,65 +512,25 @@ def get_map_data():
                     "id_cidade": 1,
                     "nome_cidade": "Recife",
                     "uf": "PE",
-                    "risco": 72,
+                    "risco": 60,
                     "categoria": "Alto",
-                    "heat_index_avg": 35.2
+                    "heat_index_avg": 35.2,
+                    "data_atualizacao": "2025-01-31"
                 },
                 ...
             ]
         }
     """
     try:
-        from sqlalchemy import func, desc, and_
-        
-        # Get latest data for each city
-        latest_records = (
-            db.session.query(
-                GoldClimaPeDiario.id_cidade,
-                GoldClimaPeDiario.nome_cidade,
-                GoldClimaPeDiario.uf,
-                GoldClimaPeDiario.risco_calor,
-                func.avg(GoldClimaPeDiario.heat_index_max).label('heat_index_avg'),
-                func.max(GoldClimaPeDiario.data).label('latest_date')
-            )
-            .filter(GoldClimaPeDiario.uf == 'PE')
-            .group_by(
-                GoldClimaPeDiario.id_cidade,
-                GoldClimaPeDiario.nome_cidade,
-                GoldClimaPeDiario.uf,
-                GoldClimaPeDiario.risco_calor
-            )
-            .order_by(desc(GoldClimaPeDiario.id_cidade))
-            .all()
-        )
-        
-        if not latest_records:
+        cube = _cube()
+        if cube is not None:
+            return success(gold_cube.map_rows(cube))
+
+        municipios = latest_risk_by_city("PE")
+        if not municipios:
             logger.warning("No risk data found for map")
             return success([])
-        
-        # Build response with risco score (0-100)
-        municipios = []
-        for record in latest_records:
-            # Map category to risk score
-            risk_scores = {
-                'Baixo': 20,
-                'Moderado': 40,
-                'Alto': 60,
-                'Muito Alto': 80,
-                'Extremo': 100
-            }
-            risco_score = risk_scores.get(record.risco_calor, 50)
-            
-            municipios.append({
-                'id_cidade': record.id_cidade,
-                'nome_cidade': record.nome_cidade,
-                'uf': record.uf,
-                'risco': risco_score,
-                'categoria': record.risco_calor,
-                'heat_index_avg': round(float(record.heat_index_avg) if record.heat_index_avg else 0, 1),
-                'data_atualizacao': record.latest_date.isoformat() if record.latest_date else None
-            })
-        
+
         logger.info(f"Retrieved map data for {len(municipios)} municipalities")
         return success(municipios)
     
@@ -397,4 +539,18 @@ def get_map_data():
         return error(f"Failed to retrieve map data: {str(e)}", status=500)
 
 
+@api_gold.route("/cache", methods=["GET"])
+def get_cache_stats():
+    """
+    Get response cache counters for this worker (for monitoring).
+
+    Returns:
+        {
+            "success": true,
+            "data": {"backend": "memory", "hits": 120, "misses": 8, ...}
+        }
+    """
+    return success(cache.stats())
+
+
 __all__ = ["api_gold"]
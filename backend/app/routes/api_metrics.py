@@ -0,0 +1,48 @@
+"""Operational metrics of this worker (connection pools, replica, caches)."""
+from __future__ import annotations
+
+from flask import Blueprint, current_app
+from sqlalchemy import text
+
+from ..extensions import db
+from ..utils.db_pool import pool_stats
+from ..utils.db_routing import replica_status
+from ..utils.responses import error, success
+
+bp = Blueprint("api_metrics", __name__, url_prefix="/api/metrics")
+
+_SERVER_CONNECTIONS_SQL = text(
+    """
+    SELECT current_setting('max_connections')::int AS max_connections,
+           (SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()) AS connections
+    """
+)
+
+
+@bp.get("/db")
+def db_metrics():
+    """Pool counters of this worker per bind, pool settings and server connection usage.
+
+    Counters are per worker process: sum them over the gunicorn workers
+    (each answers for itself) when sizing pools against max_connections.
+    """
+    config = current_app.config
+    data = {
+        "pools": pool_stats(db.engines),
+        "settings": {
+            "pool_size": config.get("DB_POOL_SIZE"),
+            "max_overflow": config.get("DB_MAX_OVERFLOW"),
+            "pool_timeout": config.get("DB_POOL_TIMEOUT"),
+            "pool_recycle": config.get("DB_POOL_RECYCLE"),
+            "pool_pre_ping": config.get("DB_POOL_PRE_PING"),
+            "statement_timeout_ms": config.get("DB_STATEMENT_TIMEOUT_MS"),
+            "max_connections_per_worker": (config.get("DB_POOL_SIZE") or 0) + (config.get("DB_MAX_OVERFLOW") or 0),
+        },
+        "replica": replica_status(),
+    }
+    try:
+        data["server"] = dict(db.session.execute(_SERVER_CONNECTIONS_SQL).one()._mapping)
+    except Exception as e:
+        db.session.rollback()
+        return error(f"Failed to read server connection usage: {str(e)}", status=500)
+    return success(data)
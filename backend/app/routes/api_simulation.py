@@ -1,10 +1,20 @@
 """Simulation endpoints."""
 from __future__ import annotations
 
+from datetime import date
+from typing import List, Optional
+
+import numpy as np
 from flask import Blueprint, request
 
+from ..services.simulation_engine import SCENARIO_KEYS
 from ..services.simulation_service import (
+    MAX_GRID_STEPS,
+    MAX_SCENARIOS,
     simulate_future_heat_scenario,
+    simulate_grid,
+    simulate_scenario_batch,
+    simulate_statewide,
     simulate_rainfall_change,
     simulate_temperature_increase,
 )
@@ -28,6 +38,29 @@ def _payload() -> dict:
     return {}
 
 
+def _hours(payload: dict) -> Optional[int]:
+    """``hours`` of history to simulate (None = all); ValueError unless a positive integer."""
+    if payload.get("hours") in (None, ""):
+        return None
+    hours = int(payload["hours"])
+    if hours < 1:
+        raise ValueError("hours must be at least 1")
+    return hours
+
+
+def _axis(spec, default: List[float]) -> List[float]:
+    """Grid axis from a list of values or ``{"min", "max", "steps"}``."""
+    if spec is None:
+        return default
+    if isinstance(spec, dict):
+        steps = int(spec.get("steps", 5))
+        if steps < 1:
+            raise ValueError("steps must be positive")
+        values = np.linspace(float(spec.get("min", 0)), float(spec.get("max", 0)), steps)
+        return [round(float(v), 4) for v in values]
+    return [float(v) for v in spec]
+
+
 @bp.post("/temperature")
 def simulate_temperature():
     payload = _payload()
@@ -59,3 +92,76 @@ def simulate_future():
         return error("station_code is required", status=400)
     data = simulate_future_heat_scenario(station_code, climate_variables)
     return success(data)
+
+
+@bp.post("/batch")
+def simulate_batch():
+    """Evaluate many scenarios at once and return per-station summaries.
+
+    Body: ``{"scenarios": [{"temperature": 2, "humidity": -10}, ...],
+    "station_code": "A301", "hours": 720}``; without ``station_code`` every
+    station is simulated.
+    """
+    payload = _payload()
+    scenarios = payload.get("scenarios")
+    if not isinstance(scenarios, list) or not scenarios:
+        return error("scenarios must be a non-empty list", status=400)
+    if len(scenarios) > MAX_SCENARIOS:
+        return error(f"At most {MAX_SCENARIOS} scenarios per request", status=400)
+    try:
+        scenarios = [{k: float(s.get(k) or 0) for k in SCENARIO_KEYS} for s in scenarios]
+        hours = _hours(payload)
+    except (AttributeError, TypeError, ValueError):
+        return error("scenario values must be numeric and hours a positive integer", status=400)
+    data = simulate_scenario_batch(scenarios, station_code=payload.get("station_code"), hours=hours)
+    if payload.get("station_code") and not data:
+        return error("Station not found", status=404)
+    return success(data)
+
+
+@bp.post("/grid")
+def simulate_sensitivity_grid():
+    """Sensitivity sweep of "Alto+" risk days over temperature x humidity deltas.
+
+    Body: ``{"temperature": {"min": 0, "max": 4, "steps": 5},
+    "humidity": {"min": -20, "max": 20, "steps": 5}, "station_code": "A301",
+    "hours": 720}``; each axis may also be a list of deltas. Without
+    ``station_code`` every station is swept.
+    """
+    payload = _payload()
+    try:
+        temperature = _axis(payload.get("temperature"), [0.0, 1.0, 2.0, 3.0, 4.0])
+        humidity = _axis(payload.get("humidity"), [-20.0, -10.0, 0.0, 10.0, 20.0])
+        hours = _hours(payload)
+    except (AttributeError, TypeError, ValueError):
+        return error("temperature/humidity must be a list or {min, max, steps}; hours must be a positive integer", status=400)
+    if not temperature or not humidity:
+        return error("temperature and humidity axes must not be empty", status=400)
+    if len(temperature) > MAX_GRID_STEPS or len(humidity) > MAX_GRID_STEPS:
+        return error(f"At most {MAX_GRID_STEPS} steps per axis", status=400)
+    stations = simulate_grid(temperature, humidity, station_code=payload.get("station_code"), hours=hours)
+    if payload.get("station_code") and not stations:
+        return error("Station not found", status=404)
+    return success({"temperature": temperature, "humidity": humidity, "stations": stations})
+
+
+@bp.post("/statewide")
+def simulate_statewide_scenario():
+    """Apply one scenario to every city's GOLD series.
+
+    Body: ``{"climate_variables": {"temperature": 2, "humidity": -5},
+    "start": "2024-01-01", "end": "2024-12-31"}``. Returns the per-city change
+    in "Alto+" risk days, largest increase first.
+    """
+    payload = _payload()
+    climate_variables = payload.get("climate_variables", {}) or {}
+    try:
+        climate_variables = {k: float(climate_variables.get(k) or 0) for k in ("temperature", "humidity")}
+        start = date.fromisoformat(payload["start"]) if payload.get("start") else None
+        end = date.fromisoformat(payload["end"]) if payload.get("end") else None
+    except (AttributeError, TypeError, ValueError):
+        return error("climate_variables must be numeric and start/end ISO dates", status=400)
+    data = simulate_statewide(climate_variables, start=start, end=end)
+    if data is None:
+        return error("GOLD data unavailable", status=503)
+    return success(data)
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from flask import Blueprint
 
-from ..services.station_service import get_station_details, list_stations
+from ..services.station_service import get_station_details, get_station_neighbors, list_stations
 from ..utils.responses import error, success
 
 bp = Blueprint("api_stations", __name__, url_prefix="/api/stations")
@@ -20,3 +20,13 @@ def station_detail(code: str):
     if not data:
         return error("Station not found", status=404)
     return success(data)
+
+
+@bp.get("/<code>/neighbors")
+def station_neighbors(code: str):
+    neighbors = get_station_neighbors(code)
+    if neighbors is None:
+        return error("Station neighbor graph not built; run the build-neighbors ETL step", status=503)
+    if not neighbors:
+        return error("Station not found in neighbor graph", status=404)
+    return success(neighbors)
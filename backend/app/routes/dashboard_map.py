@@ -10,8 +10,9 @@ from __future__ import annotations
 from flask import Blueprint, render_template
 import logging
 
-from app.models import GoldClimaPeDiario
-from app.extensions import db
+from app.services.map_service import latest_risk_by_ibge
+from app.utils.conditional import conditional
+from app.utils.data_version import get_data_version
 from app.utils.responses import success, error
 
 logger = logging.getLogger(__name__)
@@ -40,78 +41,54 @@ def map_main():
 
 
 @map_bp.route("/dados", methods=["GET"])
+@conditional("gold")
 def map_risk_data():
     """API endpoint returning heat risk data by municipality.
     
+    Latest day per municipality; municipalities without a station use the
+    interpolated estimate (``interpolado: true``).
+    
     Returns JSON with municipality data:
     {
         "success": true,
         "data": [
             {
                 "id_cidade": 1,
+                "codigo_ibge": 2611606,
                 "nome_cidade": "Recife",
-                "indice_risco": 72,
+                "uf": "PE",
+                "risco": 60,
                 "categoria": "Alto",
-                "lat": -8.05,
-                "lon": -34.9
+                "heat_index_avg": 35.2,
+                "data": "2024-12-31",
+                "interpolado": false
             },
             ...
         ]
     }
     """
     try:
-        # Query latest risk data by municipality
-        from sqlalchemy import func, desc
-        
-        # Get latest month data for each city
-        latest_risk = (
-            db.session.query(
-                GoldClimaPeDiario.id_cidade,
-                GoldClimaPeDiario.nome_cidade,
-                GoldClimaPeDiario.uf,
-                GoldClimaPeDiario.risco_calor,
-                func.avg(GoldClimaPeDiario.heat_index_max).label('heat_index_avg'),
-                func.row_number().over(
-                    partition_by=GoldClimaPeDiario.id_cidade,
-                    order_by=desc(GoldClimaPeDiario.data)
-                ).label('rn')
-            )
-            .filter(GoldClimaPeDiario.uf == 'PE')
-            .all()
-        )
-        
-        if not latest_risk:
-            logger.warning("No risk data found in database")
-            return success([])
-        
-        # Build response with risco score (0-100) based on heat_index_avg
-        municipios = []
-        seen_ids = set()
-        
-        for record in latest_risk:
-            if record.id_cidade in seen_ids:
-                continue
-            seen_ids.add(record.id_cidade)
-            
-            # Map risco_calor category to risk score (0-100)
-            risk_scores = {
-                'Baixo': 20,
-                'Moderado': 40,
-                'Alto': 60,
-                'Muito Alto': 80,
-                'Extremo': 100
+        risk = latest_risk_by_ibge(get_data_version("gold").version)
+        if risk is None:
+            return error("Failed to retrieve risk data", status=500)
+
+        municipios = [
+            {
+                'id_cidade': attrs['id_cidade'],
+                'codigo_ibge': codigo_ibge,
+                'nome_cidade': attrs['nome_cidade'],
+                'uf': attrs['uf'],
+                'risco': attrs['risco'],
+                'categoria': attrs['risco_calor'],
+                'heat_index_avg': round(attrs['heat_index_max'] or 0, 1),
+                'data': attrs['data'],
+                'interpolado': attrs['interpolado'],
             }
-            risco_score = risk_scores.get(record.risco_calor, 50)
-            
-            municipios.append({
-                'id_cidade': record.id_cidade,
-                'nome_cidade': record.nome_cidade,
-                'uf': record.uf,
-                'risco': risco_score,
-                'categoria': record.risco_calor,
-                'heat_index_avg': round(float(record.heat_index_avg) if record.heat_index_avg else 0, 1)
-            })
-        
+            for codigo_ibge, attrs in risk.items()
+        ]
+        if not municipios:
+            logger.warning("No risk data found in database")
+
         logger.info(f"Retrieved risk data for {len(municipios)} municipalities")
         return success(municipios)
     
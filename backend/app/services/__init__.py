@@ -1,28 +1,48 @@
 """Service layer exports."""
-from .climate_service import compute_trends, get_climate_by_station, get_daily_summary, list_years_available
-from .station_service import get_station_details, list_stations
+from .climate_service import (
+    compute_trends,
+    get_climate_by_station,
+    get_climate_columns,
+    get_climate_page,
+    get_daily_summary,
+    list_years_available,
+)
+from .station_service import get_station_details, get_station_neighbors, list_stations
 from .simulation_service import (
     simulate_future_heat_scenario,
+    simulate_grid,
     simulate_rainfall_change,
+    simulate_scenario_batch,
+    simulate_statewide,
     simulate_temperature_increase,
 )
 from .analytics_service import (
     compute_heat_alerts,
+    compute_heat_alerts_page,
     compute_rank_hottest_stations,
     compute_statewide_heat_map,
 )
+from .export_service import export_rows
 
 __all__ = [
     "get_climate_by_station",
+    "get_climate_columns",
+    "get_climate_page",
     "get_daily_summary",
     "list_years_available",
     "compute_trends",
     "list_stations",
     "get_station_details",
+    "get_station_neighbors",
     "simulate_temperature_increase",
     "simulate_rainfall_change",
     "simulate_future_heat_scenario",
+    "simulate_scenario_batch",
+    "simulate_grid",
+    "simulate_statewide",
     "compute_statewide_heat_map",
     "compute_rank_hottest_stations",
     "compute_heat_alerts",
+    "compute_heat_alerts_page",
+    "export_rows",
 ]
@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy import and_, func
 
 from ..extensions import db
 from ..models import ClimateHourly, Station
+from ..utils.pagination import keyset_page
+from ..utils.serialization import row_dicts
+from .station_graph import get_station_graph
 
 
 def _parse_date(value: str | date | datetime | None) -> date | None:
@@ -24,7 +27,12 @@ def _parse_date(value: str | date | datetime | None) -> date | None:
 
 
 def compute_statewide_heat_map(target_date: str | date | datetime) -> List[Dict[str, Any]]:
-    """Return average apparent temperature per station for a given date."""
+    """Return average apparent temperature per station for a given date.
+
+    When the ETL neighbor graph exists, each station also gets the
+    inverse-distance mean heat index of its nearest stations and its anomaly
+    against that mean.
+    """
     day = _parse_date(target_date)
     if not day:
         return []
@@ -45,7 +53,19 @@ def compute_statewide_heat_map(target_date: str | date | datetime) -> List[Dict[
         )
         .all()
     )
-    return [dict(row._mapping) for row in results]
+    stations = [dict(row._mapping) for row in results]
+
+    # Anomaly against the weighted mean of the precomputed nearest stations
+    graph = get_station_graph()
+    if graph is not None:
+        neighbor_hi = graph.neighbor_mean({s["station_code"]: s["avg_heat_index"] for s in stations})
+        for s in stations:
+            mean = neighbor_hi.get(s["station_code"])
+            s["neighbor_heat_index"] = mean
+            s["heat_index_anomaly"] = (
+                float(s["avg_heat_index"]) - mean if mean is not None and s["avg_heat_index"] is not None else None
+            )
+    return stations
 
 
 def compute_rank_hottest_stations(limit: int = 10) -> List[Dict[str, Any]]:
@@ -64,26 +84,40 @@ def compute_rank_hottest_stations(limit: int = 10) -> List[Dict[str, Any]]:
     return [dict(row._mapping) for row in results]
 
 
-def compute_heat_alerts(threshold: float) -> List[Dict[str, Any]]:
-    """Return records exceeding the given heat threshold."""
-    results = (
-        ClimateHourly.query.filter(
-            and_(
-                ClimateHourly.apparent_temperature.isnot(None),
-                ClimateHourly.apparent_temperature >= threshold,
-            )
+ALERTS_PAGE_SIZE = 500
+
+
+def compute_heat_alerts_page(
+    threshold: float, cursor: Optional[str] = None, limit: int = ALERTS_PAGE_SIZE
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of records exceeding the threshold, hottest first, and the next cursor.
+
+    Pages are keyed on (apparent_temperature, station_code, datetime_utc, id).
+    """
+    query = db.session.query(*ClimateHourly.row_columns()).filter(
+        and_(
+            ClimateHourly.apparent_temperature.isnot(None),
+            ClimateHourly.apparent_temperature >= threshold,
         )
-        .order_by(ClimateHourly.apparent_temperature.desc())
-        .limit(500)
-        .all()
     )
-    from ..models import ClimateHourlySchema
+    keys = (
+        ClimateHourly.apparent_temperature,
+        ClimateHourly.station_code,
+        ClimateHourly.datetime_utc,
+        ClimateHourly.id,
+    )
+    rows, next_cursor = keyset_page(query, keys, limit, cursor, descending=True)
+    return row_dicts(rows), next_cursor
+
 
-    return ClimateHourlySchema(many=True).dump(results)
+def compute_heat_alerts(threshold: float) -> List[Dict[str, Any]]:
+    """Return records exceeding the given heat threshold."""
+    return compute_heat_alerts_page(threshold)[0]
 
 
 __all__ = [
     "compute_statewide_heat_map",
     "compute_rank_hottest_stations",
     "compute_heat_alerts",
+    "compute_heat_alerts_page",
 ]
@@ -2,14 +2,19 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from sqlalchemy import func
 
 from ..extensions import db
-from ..models import ClimateHourly, ClimateHourlySchema
+from ..models import ClimateHourly
+from ..utils.downsample import downsample_indices
+from ..utils.pagination import keyset_page
+from ..utils.serialization import row_columns, row_dicts
 
-schema_many = ClimateHourlySchema(many=True)
+# Rows returned without downsampling (newest first)
+MAX_HOURLY_ROWS = 5000
 
 
 def _parse_datetime(value: str | datetime | None) -> Optional[datetime]:
@@ -23,17 +28,82 @@ def _parse_datetime(value: str | datetime | None) -> Optional[datetime]:
         return None
 
 
-def get_climate_by_station(station_code: str, start: str | datetime | None, end: str | datetime | None) -> List[dict]:
-    """Return climate rows for a station between optional start/end datetimes."""
-    query = ClimateHourly.query.filter(ClimateHourly.station_code == station_code)
+def _station_rows(
+    station_code: str,
+    start: str | datetime | None,
+    end: str | datetime | None,
+    cursor: Optional[str] = None,
+    limit: int = MAX_HOURLY_ROWS,
+    points: Optional[int] = None,
+    method: str = "lttb",
+    metric: str = "temperature",
+) -> Tuple[list, Optional[str]]:
+    query = db.session.query(*ClimateHourly.row_columns()).filter(ClimateHourly.station_code == station_code)
     start_dt = _parse_datetime(start)
     end_dt = _parse_datetime(end)
     if start_dt:
         query = query.filter(ClimateHourly.datetime_utc >= start_dt)
     if end_dt:
         query = query.filter(ClimateHourly.datetime_utc <= end_dt)
-    results = query.order_by(ClimateHourly.datetime_utc.desc()).limit(5000).all()
-    return schema_many.dump(results)
+    if not points:
+        # climate_hourly has no unique (station_code, datetime_utc): id breaks ties
+        keys = (ClimateHourly.station_code, ClimateHourly.datetime_utc, ClimateHourly.id)
+        return keyset_page(query, keys, limit, cursor, descending=True)
+
+    # Downsampling reads the whole range, so nothing is truncated
+    rows = query.order_by(ClimateHourly.datetime_utc.asc()).all()
+    if not rows:
+        return rows, None
+    x = np.array([r.datetime_utc for r in rows], dtype="datetime64[s]").astype(np.float64)
+    y = np.array([getattr(r, metric) for r in rows], dtype=float)
+    keep = downsample_indices(x, y, points, method)
+    return [rows[i] for i in keep[::-1]], None
+
+
+def get_climate_page(
+    station_code: str,
+    start: str | datetime | None,
+    end: str | datetime | None,
+    cursor: Optional[str] = None,
+    limit: int = MAX_HOURLY_ROWS,
+    columnar: bool = False,
+    iso_dates: bool = True,
+    **downsample: Any,
+) -> Tuple[Any, Optional[str]]:
+    """One page of a station's hourly rows, newest first, and the next cursor.
+
+    Pages hold ``limit`` rows and continue after ``cursor`` (keyset on
+    ``(station_code, datetime_utc, id)``). With ``points`` the whole range is
+    instead reduced to about that many rows, chosen on ``metric`` by
+    ``method`` ("lttb" or "minmax"), in a single page; rows missing that
+    metric are left out. ``columnar`` returns one list per column.
+    """
+    rows, next_cursor = _station_rows(station_code, start, end, cursor, limit, **downsample)
+    if columnar:
+        keys = [c.key for c in ClimateHourly.row_columns()]
+        return row_columns(rows, keys, iso_dates=iso_dates), next_cursor
+    return row_dicts(rows), next_cursor
+
+
+def get_climate_by_station(
+    station_code: str,
+    start: str | datetime | None,
+    end: str | datetime | None,
+    **options: Any,
+) -> List[dict]:
+    """Return climate rows for a station between optional start/end datetimes."""
+    return get_climate_page(station_code, start, end, **options)[0]
+
+
+def get_climate_columns(
+    station_code: str,
+    start: str | datetime | None,
+    end: str | datetime | None,
+    iso_dates: bool = True,
+    **options: Any,
+) -> Dict[str, list]:
+    """Same rows as ``get_climate_by_station``, one list per column."""
+    return get_climate_page(station_code, start, end, columnar=True, iso_dates=iso_dates, **options)[0]
 
 
 def get_daily_summary(station_code: str, limit: int = 30) -> List[Dict[str, Any]]:
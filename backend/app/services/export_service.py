@@ -0,0 +1,175 @@
+"""Streaming bulk exports of the GOLD daily and BRONZE hourly tables.
+
+Rows are read through a server-side cursor (``yield_per``) and encoded batch
+by batch as NDJSON or CSV, optionally gzip-compressed on the fly, so memory
+use stays constant whatever the size of the export. The generators are meant
+to be wrapped in a streaming Flask response (``stream_with_context``) so
+the session stays open while the body is sent.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from sqlalchemy import bindparam, select, text
+
+from ..extensions import db
+from ..models import GoldClimaPeDiario
+
+try:  # optional, much faster encoder
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Rows fetched from the server-side cursor (and encoded) per round trip
+EXPORT_BATCH_ROWS = 5000
+
+BRONZE_COLUMNS = (
+    "codigo_estacao",
+    "data_hora_utc",
+    "precipitacao_mm",
+    "pressao_hpa",
+    "radiacao_kj_m2",
+    "temp_ar_c",
+    "temp_ponto_orvalho_c",
+    "temp_max_ant",
+    "temp_min_ant",
+    "umid_rel_pct",
+    "umid_max_ant",
+    "umid_min_ant",
+    "vento_dir_graus",
+    "vento_rajada_ms",
+    "vento_vel_ms",
+)
+
+_BRONZE_NUMERIC = set(BRONZE_COLUMNS[2:])
+_BRONZE_SELECT = ", ".join(
+    f"CAST(b.{name} AS FLOAT) AS {name}" if name in _BRONZE_NUMERIC else name for name in BRONZE_COLUMNS
+)
+
+
+def _bronze_query(station_codes: Optional[Sequence[str]], start, end):
+    conditions = ["TRUE"]
+    params = {}
+    if station_codes:
+        conditions.append("e.codigo_estacao IN :codes")
+        params["codes"] = list(station_codes)
+    if start is not None:
+        conditions.append("b.data_hora_utc >= :start")
+        params["start"] = start
+    if end is not None:
+        conditions.append("b.data_hora_utc < :end")
+        params["end"] = end
+    query = text(
+        f"""
+        SELECT {_BRONZE_SELECT}
+        FROM bronze_clima_pe_horario b
+        JOIN dim_estacao e ON e.id_estacao = b.id_estacao
+        WHERE {" AND ".join(conditions)}
+        ORDER BY b.id_estacao, b.data_hora_utc
+        """
+    )
+    if station_codes:
+        query = query.bindparams(bindparam("codes", expanding=True))
+    return query, params
+
+
+def _gold_query(city_ids: Optional[Sequence[int]], start, end):
+    query = select(*GoldClimaPeDiario.row_columns())
+    if city_ids:
+        query = query.where(GoldClimaPeDiario.id_cidade.in_(list(city_ids)))
+    if start is not None:
+        query = query.where(GoldClimaPeDiario.data >= start)
+    if end is not None:
+        query = query.where(GoldClimaPeDiario.data <= end)
+    return query.order_by(GoldClimaPeDiario.id_cidade, GoldClimaPeDiario.data), {}
+
+
+def _stream(query, params: dict) -> Iterator[tuple]:
+    """Yield (keys, batch) pairs from a server-side cursor, starting with an empty batch."""
+    result = db.session.execute(query.execution_options(yield_per=EXPORT_BATCH_ROWS), params)
+    try:
+        keys = list(result.keys())
+        yield keys, []  # so the CSV header is written even when nothing matches
+        for batch in result.partitions(EXPORT_BATCH_ROWS):
+            yield keys, batch
+    finally:
+        result.close()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _ndjson_chunks(batches: Iterable[tuple]) -> Iterator[bytes]:
+    for keys, batch in batches:
+        if not batch:
+            continue
+        if orjson is not None:
+            lines = [orjson.dumps(dict(zip(keys, row)), default=_json_default) for row in batch]
+        else:
+            lines = [json.dumps(dict(zip(keys, row)), default=_json_default).encode() for row in batch]
+        yield b"\n".join(lines) + b"\n"
+
+
+def _csv_chunks(batches: Iterable[tuple]) -> Iterator[bytes]:
+    header = False
+    for keys, batch in batches:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if not header:
+            writer.writerow(keys)
+            header = True
+        writer.writerows([_json_default(v) if isinstance(v, (date, datetime)) else v for v in row] for row in batch)
+        yield buffer.getvalue().encode()
+
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_rows(
+    dataset: str,
+    fmt: str = "ndjson",
+    ids: Optional[Sequence] = None,
+    start=None,
+    end=None,
+    compress: bool = False,
+) -> Iterator[bytes]:
+    """Encoded body chunks of a ``gold`` (by city ids) or ``bronze`` (by station codes) export.
+
+    Gold rows are bounded by ``start <= data <= end``; bronze rows by
+    ``start <= data_hora_utc < end``. Rows come ordered by city/station
+    and time.
+    """
+    if dataset == "gold":
+        query, params = _gold_query(ids, start, end)
+    elif dataset == "bronze":
+        query, params = _bronze_query(ids, start, end)
+    else:
+        raise ValueError(f"Unknown export dataset: {dataset}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+    encode = _csv_chunks if fmt == "csv" else _ndjson_chunks
+    chunks = encode(_stream(query, params))
+    return _gzip_chunks(chunks) if compress else chunks
+
+
+__all__ = ["BRONZE_COLUMNS", "EXPORT_BATCH_ROWS", "EXPORT_FORMATS", "EXPORT_MIMETYPES", "export_rows"]
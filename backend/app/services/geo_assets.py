@@ -0,0 +1,95 @@
+"""In-memory, pre-compressed GeoJSON assets served by the geo API.
+
+Each file is parsed once per worker process, re-serialized without
+whitespace and kept as identity, gzip and (when the optional ``brotli``
+package is installed) brotli bodies, so a request only picks bytes.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+try:  # optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+@dataclass
+class GeoAsset:
+    path: Path
+    mtime_ns: int
+    feature_count: int
+    bodies: Dict[str, bytes] = field(default_factory=dict)  # encoding -> bytes
+
+    @property
+    def size(self) -> int:
+        return len(self.bodies["identity"])
+
+    def negotiate(self, accept_encodings) -> Tuple[bytes, Optional[str]]:
+        """Pick the best body for a werkzeug ``Accept-Encoding`` header."""
+        for encoding in ("br", "gzip"):
+            if encoding in self.bodies and accept_encodings.quality(encoding) > 0:
+                return self.bodies[encoding], encoding
+        return self.bodies["identity"], None
+
+
+_assets: Dict[Path, GeoAsset] = {}
+_lock = threading.Lock()
+
+
+def _build_asset(path: Path, mtime_ns: int) -> GeoAsset:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    bodies = {"identity": raw, "gzip": gzip.compress(raw, compresslevel=GZIP_LEVEL)}
+    if brotli is not None:
+        bodies["br"] = brotli.compress(raw, quality=BROTLI_QUALITY)
+    asset = GeoAsset(path, mtime_ns, len(data.get("features", [])), bodies)
+    logger.info(
+        "Loaded %s: %d features, %d bytes (%s)",
+        path.name,
+        asset.feature_count,
+        asset.size,
+        ", ".join(f"{enc}={len(body)}" for enc, body in bodies.items() if enc != "identity"),
+    )
+    return asset
+
+
+def get_geo_asset(path: Path) -> Optional[GeoAsset]:
+    """Return the cached asset for ``path``, rebuilding it if the file changed."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    asset = _assets.get(path)
+    if asset is not None and asset.mtime_ns == mtime_ns:
+        return asset
+    with _lock:
+        asset = _assets.get(path)
+        if asset is None or asset.mtime_ns != mtime_ns:
+            asset = _build_asset(path, mtime_ns)
+            _assets[path] = asset
+    return asset
+
+
+def preload_geo_assets(paths: Iterable[Path]) -> None:
+    """Warm the cache at startup; missing or broken files are only logged."""
+    for path in paths:
+        try:
+            get_geo_asset(path)
+        except Exception as e:
+            logger.error("Could not preload %s: %s", path, e)
+
+
+__all__ = ["GeoAsset", "get_geo_asset", "preload_geo_assets"]
@@ -0,0 +1,394 @@
+"""Columnar in-memory copy of the GOLD daily tables.
+
+``gold_clima_pe_diario`` (and, when present, the interpolated estimates of
+``gold_clima_pe_interpolado``) are read once per ETL stamp for ``gold`` into a
+dense ``(city, day, metric)`` float32 cube, so statewide computations are
+array operations instead of one query per city. Observed rows win over
+interpolated ones for the same city and day.
+
+With ``GOLD_CUBE_ENABLED`` the ``api_gold`` read endpoints are answered from
+the cube too (observed rows only, as the SQL path does); the helpers at the
+end of this module build the same payloads as those endpoints.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import text
+
+from ..extensions import db
+from ..models import GOLD_METRIC_COLUMNS
+from ..utils.data_version import get_data_version
+from .map_service import RISK_SCORES
+
+logger = logging.getLogger(__name__)
+
+GOLD_METRICS = GOLD_METRIC_COLUMNS
+
+_METRIC_COLUMNS = ", ".join(f"CAST({m} AS FLOAT) AS {m}" for m in GOLD_METRICS)
+
+_ROWS_SQL = text(
+    f"""
+    SELECT id_cidade, data, {_METRIC_COLUMNS}, risco_calor, FALSE AS interpolado, id
+    FROM gold_clima_pe_diario
+    UNION ALL
+    SELECT id_cidade, data, {_METRIC_COLUMNS}, risco_calor, TRUE AS interpolado, NULL AS id
+    FROM gold_clima_pe_interpolado
+    """
+)
+
+# Databases created before the interpolation stage have no such table
+_OBSERVED_ROWS_SQL = text(
+    f"""
+    SELECT id_cidade, data, {_METRIC_COLUMNS}, risco_calor, FALSE AS interpolado, id
+    FROM gold_clima_pe_diario
+    """
+)
+
+_CITIES_SQL = text("SELECT id_cidade, nome_cidade, uf, codigo_ibge FROM dim_cidade_pe")
+
+
+@dataclass
+class GoldCube:
+    city_ids: np.ndarray  # (C,) id_cidade, ascending
+    days: np.ndarray  # (D,) datetime64[D], ascending
+    values: np.ndarray  # (C, D, M) float32, NaN where missing
+    risk: np.ndarray  # (C, D) object, risco_calor or None
+    present: np.ndarray  # (C, D) bool, a GOLD row exists
+    interpolated: np.ndarray  # (C, D) bool, the row is an interpolated estimate
+    row_ids: np.ndarray  # (C, D) int64, gold_clima_pe_diario.id or -1
+    cities: Dict[int, dict]  # id_cidade -> {nome_cidade, uf, codigo_ibge}
+
+    def metric(self, name: str) -> np.ndarray:
+        """``(C, D)`` view of one metric."""
+        return self.values[:, :, GOLD_METRICS.index(name)]
+
+    def city_row(self, id_cidade: int) -> Optional[int]:
+        row = int(np.searchsorted(self.city_ids, id_cidade))
+        if row < len(self.city_ids) and self.city_ids[row] == id_cidade:
+            return row
+        return None
+
+    def day_slice(self, start=None, end=None) -> slice:
+        """Columns between two dates (inclusive); None leaves that side open."""
+        lo = 0 if start is None else int(np.searchsorted(self.days, np.datetime64(start, "D"), side="left"))
+        hi = len(self.days) if end is None else int(np.searchsorted(self.days, np.datetime64(end, "D"), side="right"))
+        return slice(lo, hi)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.values, self.risk, self.present, self.interpolated, self.row_ids))
+
+    def observed(self, row: int) -> np.ndarray:
+        """Day columns of a city that come from ``gold_clima_pe_diario``."""
+        return np.flatnonzero(self.present[row] & ~self.interpolated[row])
+
+
+def _read_rows():
+    for query in (_ROWS_SQL, _OBSERVED_ROWS_SQL):
+        try:
+            return db.session.execute(query).all()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning("GOLD cube query failed (%s); trying fallback", e)
+    return None
+
+
+def _read_cities() -> Dict[int, dict]:
+    try:
+        rows = db.session.execute(_CITIES_SQL).all()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning("Could not read dim_cidade_pe: %s", e)
+        return {}
+    return {
+        int(r.id_cidade): {"nome_cidade": r.nome_cidade, "uf": r.uf, "codigo_ibge": r.codigo_ibge} for r in rows
+    }
+
+
+def build_cube(rows, cities: Dict[int, dict]) -> GoldCube:
+    columns = list(zip(*rows)) if rows else [()] * (len(GOLD_METRICS) + 5)
+    city_ids, city_pos = np.unique(np.array(columns[0], dtype=np.int64), return_inverse=True)
+    days, day_pos = np.unique(np.array(columns[1], dtype="datetime64[D]"), return_inverse=True)
+    metrics = np.array(columns[2 : 2 + len(GOLD_METRICS)], dtype=np.float32).reshape(len(GOLD_METRICS), -1)
+    risk_col = np.array(columns[2 + len(GOLD_METRICS)], dtype=object)
+    interp_col = np.array(columns[3 + len(GOLD_METRICS)], dtype=bool)
+    id_col = np.array([-1 if v is None else v for v in columns[4 + len(GOLD_METRICS)]], dtype=np.int64)
+
+    shape = (len(city_ids), len(days))
+    values = np.full(shape + (len(GOLD_METRICS),), np.nan, dtype=np.float32)
+    risk = np.full(shape, None, dtype=object)
+    present = np.zeros(shape, dtype=bool)
+    interpolated = np.zeros(shape, dtype=bool)
+    row_ids = np.full(shape, -1, dtype=np.int64)
+    # Interpolated rows are written first so observed rows overwrite them
+    for mask in (interp_col, ~interp_col):
+        c, d = city_pos[mask], day_pos[mask]
+        values[c, d] = metrics[:, mask].T
+        risk[c, d] = risk_col[mask]
+        present[c, d] = True
+        interpolated[c, d] = interp_col[mask]
+        row_ids[c, d] = id_col[mask]
+    return GoldCube(
+        city_ids=city_ids,
+        days=days,
+        values=values,
+        risk=risk,
+        present=present,
+        interpolated=interpolated,
+        row_ids=row_ids,
+        cities=cities,
+    )
+
+
+# stamp -> (built_at monotonic, cube); one cube per worker
+_cache: Dict[int, Tuple[float, GoldCube]] = {}
+
+
+def get_gold_cube() -> Optional[GoldCube]:
+    """Return the cube for the current GOLD stamp, or None if GOLD cannot be read.
+
+    While the stamp is 0 (never bumped by the ETL) the cube is rebuilt every
+    ``DATA_VERSION_CHECK_INTERVAL`` seconds instead of on every call.
+    """
+    version = get_data_version("gold").version
+    cached = _cache.get(version)
+    if cached is not None:
+        built_at, cube = cached
+        if version or time.monotonic() - built_at < current_app.config.get("DATA_VERSION_CHECK_INTERVAL", 30):
+            return cube
+    rows = _read_rows()
+    if rows is None:
+        return None
+    cube = build_cube(rows, _read_cities())
+    logger.info(
+        "Loaded GOLD cube v%s: %s cities x %s days (%.1f MB)",
+        version,
+        len(cube.city_ids),
+        len(cube.days),
+        cube.nbytes / 1e6,
+    )
+    _cache.clear()
+    _cache[version] = (time.monotonic(), cube)
+    return cube
+
+
+# ---------------------------------------------------------------------------
+# Endpoint payloads (same shape as the SQL path of api_gold)
+# ---------------------------------------------------------------------------
+
+HIGH_RISK_CLASSES = ("Alto", "Muito Alto", "Extremo")
+
+
+def _value(x) -> Optional[float]:
+    return None if np.isnan(x) else round(float(x), 2)
+
+
+def _records(cube: GoldCube, row: int, cols: np.ndarray) -> List[dict]:
+    """``GoldClimaPeDiario.to_dict`` rows for the given day columns of a city."""
+    block = cube.values[row, cols]
+    days = cube.days[cols].astype(object)
+    return [
+        {
+            "id": int(cube.row_ids[row, col]),
+            "id_cidade": int(cube.city_ids[row]),
+            "data": day.isoformat(),
+            **{m: _value(v) for m, v in zip(GOLD_METRICS, values)},
+            "risco_calor": cube.risk[row, col],
+        }
+        for col, day, values in zip(cols.tolist(), days, block)
+    ]
+
+
+def _observed_cols(cube: GoldCube, id_cidade: int) -> Optional[tuple]:
+    row = cube.city_row(id_cidade)
+    if row is None:
+        return None
+    cols = cube.observed(row)
+    return (row, cols) if len(cols) else None
+
+
+def last_days(cube: GoldCube, id_cidade: int, today: date, days: int = 7) -> List[dict]:
+    """Rows from ``today - days`` on, newest first (``/diario``)."""
+    found = _observed_cols(cube, id_cidade)
+    if found is None:
+        return []
+    row, cols = found
+    cols = cols[cube.days[cols] >= np.datetime64(today - timedelta(days=days), "D")]
+    return _records(cube, row, cols[::-1])
+
+
+def latest(cube: GoldCube, id_cidade: int) -> Optional[dict]:
+    """Most recent row of a city (``/risco``)."""
+    found = _observed_cols(cube, id_cidade)
+    if found is None:
+        return None
+    row, cols = found
+    return _records(cube, row, cols[-1:])[0]
+
+
+def _series_cols(cube: GoldCube, id_cidade: int, start, end, limit: int, after) -> Optional[tuple]:
+    found = _observed_cols(cube, id_cidade)
+    if found is None:
+        return None
+    row, cols = found
+    span = cube.day_slice(start, end)
+    if after is not None:
+        span = slice(max(span.start, cube.day_slice(start=after).start), span.stop)
+        if span.start < len(cube.days) and cube.days[span.start] == np.datetime64(after, "D"):
+            span = slice(span.start + 1, span.stop)
+    cols = cols[(cols >= span.start) & (cols < span.stop)]
+    limit = max(limit, 0)
+    return row, cols[:limit], len(cols) > limit
+
+
+def series(
+    cube: GoldCube, id_cidade: int, start=None, end=None, limit: int = 365, after=None
+) -> Tuple[List[dict], bool]:
+    """Rows between two dates (after ``after``), oldest first, at most ``limit``.
+
+    Returns the rows and whether more follow (``/serie``).
+    """
+    found = _series_cols(cube, id_cidade, start, end, limit, after)
+    if found is None:
+        return [], False
+    row, cols, more = found
+    return _records(cube, row, cols), more
+
+
+def series_columns(
+    cube: GoldCube,
+    id_cidade: int,
+    start=None,
+    end=None,
+    limit: int = 365,
+    after=None,
+    iso_dates: bool = True,
+) -> Tuple[Dict[str, list], bool]:
+    """The ``series`` rows as one list per field (``/serie?format=columnar``)."""
+    found = _series_cols(cube, id_cidade, start, end, limit, after)
+    if found is None:
+        return {name: [] for name in ("id", "id_cidade", "data", *GOLD_METRICS, "risco_calor")}, False
+    row, cols, more = found
+    days = cube.days[cols].astype(object)
+    block = np.round(cube.values[row, cols].astype(float), 2)
+    columns = {
+        "id": cube.row_ids[row, cols].tolist(),
+        "id_cidade": [id_cidade] * len(cols),
+        "data": [d.isoformat() for d in days] if iso_dates else days.tolist(),
+    }
+    for i, name in enumerate(GOLD_METRICS):
+        columns[name] = [None if v != v else v for v in block[:, i].tolist()]
+    columns["risco_calor"] = cube.risk[row, cols].tolist()
+    return columns, more
+
+
+def batch_columns(
+    cube: GoldCube, city_ids: List[int], metrics: Tuple[str, ...], start=None, end=None
+) -> Dict[int, Dict[str, list]]:
+    """``data``, the chosen metrics and ``risco_calor`` per city, oldest first (``/batch``)."""
+    span = cube.day_slice(start, end)
+    result = {}
+    for id_cidade in city_ids:
+        found = _observed_cols(cube, id_cidade)
+        if found is None:
+            continue
+        row, cols = found
+        cols = cols[(cols >= span.start) & (cols < span.stop)]
+        if not len(cols):
+            continue
+        columns = {"data": [d.isoformat() for d in cube.days[cols].astype(object)]}
+        for name in metrics:
+            values = np.round(cube.metric(name)[row, cols].astype(float), 2).tolist()
+            columns[name] = [None if v != v else v for v in values]
+        columns["risco_calor"] = cube.risk[row, cols].tolist()
+        result[id_cidade] = columns
+    return result
+
+
+def summary(cube: GoldCube, id_cidade: int, today: date) -> Optional[dict]:
+    """Latest day plus the 7-day risk count and temperature trend (``/resumo``)."""
+    found = _observed_cols(cube, id_cidade)
+    if found is None:
+        return None
+    row, cols = found
+    today_col = cols[cube.days[cols] == np.datetime64(today, "D")]
+    current = int(today_col[0]) if len(today_col) else int(cols[-1])
+    day = cube.days[current]
+    window = cols[(cube.days[cols] >= day - np.timedelta64(7, "D")) & (cube.days[cols] <= day)]
+
+    risk = cube.risk[row, window]
+    temp_media = np.nan_to_num(cube.metric("temp_media")[row, window])
+    if len(window) >= 6:
+        tendencia = "aumentando" if temp_media[-3:].sum() / 3 > temp_media[:3].sum() / 3 else "diminuindo"
+    else:
+        tendencia = "estável"
+
+    info = cube.cities.get(int(cube.city_ids[row]), {})
+    record = _records(cube, row, np.array([current]))[0]
+    return {
+        "id_cidade": record["id_cidade"],
+        "nome_cidade": info.get("nome_cidade"),
+        "uf": info.get("uf"),
+        "codigo_ibge": info.get("codigo_ibge"),
+        "data_atual": record["data"],
+        "risco_calor": record["risco_calor"],
+        "heat_index_max": record["heat_index_max"],
+        "temp_max": record["temp_max"],
+        "temp_media": record["temp_media"],
+        "temp_min": record["temp_min"],
+        "umidade_media": record["umidade_media"],
+        "dias_risco_alto_7d": int(sum(r in HIGH_RISK_CLASSES for r in risk)),
+        "tendencia_temp": tendencia,
+    }
+
+
+def map_rows(cube: GoldCube, uf: str = "PE") -> List[dict]:
+    """Latest risk class and mean heat index of every city (``/mapa``)."""
+    observed = cube.present & ~cube.interpolated
+    hi = np.where(observed, cube.metric("heat_index_max"), np.nan)
+    counts = (observed & ~np.isnan(hi)).sum(axis=1)
+    means = np.divide(np.nansum(hi, axis=1), counts, out=np.zeros(len(counts)), where=counts > 0)
+    # Last observed column of each city (argmax over the reversed mask)
+    last = observed.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+
+    out = []
+    for row in np.flatnonzero(observed.any(axis=1))[::-1].tolist():
+        id_cidade = int(cube.city_ids[row])
+        info = cube.cities.get(id_cidade, {})
+        if info.get("uf") != uf:
+            continue
+        categoria = cube.risk[row, last[row]]
+        out.append(
+            {
+                "id_cidade": id_cidade,
+                "nome_cidade": info.get("nome_cidade"),
+                "uf": info.get("uf"),
+                "risco": RISK_SCORES.get(categoria, 50),
+                "categoria": categoria,
+                "heat_index_avg": round(float(means[row]), 1),
+                "data_atualizacao": cube.days[last[row]].astype(object).isoformat(),
+            }
+        )
+    return out
+
+
+__all__ = [
+    "GOLD_METRICS",
+    "GoldCube",
+    "batch_columns",
+    "build_cube",
+    "get_gold_cube",
+    "last_days",
+    "latest",
+    "map_rows",
+    "series",
+    "series_columns",
+    "summary",
+]
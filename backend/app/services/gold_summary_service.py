@@ -0,0 +1,75 @@
+"""Latest-day summaries (``/resumo``) of the GOLD daily table in one query.
+
+The current day of each city is today when there is a row for it, else the
+city's latest day. Its 7-day window (current day and the seven before)
+gives the count of "Alto"-or-worse days and the temperature trend, which
+compares the mean ``temp_media`` of the window's first three rows with the
+last three (missing values count as 0); windows of fewer than six rows are
+"estável". Everything is computed by window functions, so one round trip
+serves one city or all of them.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import bindparam, text
+
+from ..extensions import db
+from .gold_cube import HIGH_RISK_CLASSES
+
+_SUMMARY_SQL = text(
+    """
+    WITH city AS (
+        SELECT
+            g.id_cidade, g.data, g.risco_calor, g.heat_index_max,
+            g.temp_max, g.temp_media, g.temp_min, g.umidade_media,
+            CASE WHEN bool_or(g.data = :today) OVER per_city THEN CAST(:today AS DATE)
+                 ELSE max(g.data) OVER per_city END AS data_atual
+        FROM gold_clima_pe_diario g
+        WHERE CAST(:cidade_id AS INTEGER) IS NULL OR g.id_cidade = :cidade_id
+        WINDOW per_city AS (PARTITION BY g.id_cidade)
+    ),
+    week AS (
+        SELECT
+            city.*,
+            row_number() OVER (PARTITION BY id_cidade ORDER BY data) AS rn_first,
+            row_number() OVER (PARTITION BY id_cidade ORDER BY data DESC) AS rn_last
+        FROM city
+        WHERE data BETWEEN data_atual - 7 AND data_atual
+    )
+    SELECT
+        w.id_cidade, c.nome_cidade, c.uf, c.codigo_ibge, w.data_atual,
+        max(w.risco_calor) FILTER (WHERE w.rn_last = 1) AS risco_calor,
+        CAST(max(w.heat_index_max) FILTER (WHERE w.rn_last = 1) AS FLOAT) AS heat_index_max,
+        CAST(max(w.temp_max) FILTER (WHERE w.rn_last = 1) AS FLOAT) AS temp_max,
+        CAST(max(w.temp_media) FILTER (WHERE w.rn_last = 1) AS FLOAT) AS temp_media,
+        CAST(max(w.temp_min) FILTER (WHERE w.rn_last = 1) AS FLOAT) AS temp_min,
+        CAST(max(w.umidade_media) FILTER (WHERE w.rn_last = 1) AS FLOAT) AS umidade_media,
+        count(*) FILTER (WHERE w.risco_calor IN :high_risk) AS dias_risco_alto_7d,
+        CASE
+            WHEN count(*) < 6 THEN 'estável'
+            WHEN sum(COALESCE(w.temp_media, 0)) FILTER (WHERE w.rn_last <= 3)
+               > sum(COALESCE(w.temp_media, 0)) FILTER (WHERE w.rn_first <= 3) THEN 'aumentando'
+            ELSE 'diminuindo'
+        END AS tendencia_temp
+    FROM week w
+    LEFT JOIN dim_cidade_pe c ON c.id_cidade = w.id_cidade
+    GROUP BY w.id_cidade, c.nome_cidade, c.uf, c.codigo_ibge, w.data_atual
+    ORDER BY w.id_cidade
+    """
+).bindparams(bindparam("high_risk", HIGH_RISK_CLASSES, expanding=True))
+
+
+def city_summaries(today: date, cidade_id: Optional[int] = None) -> List[dict]:
+    """``/resumo`` payloads of one city (``cidade_id``) or of every city with GOLD rows."""
+    rows = db.session.execute(_SUMMARY_SQL, {"today": today, "cidade_id": cidade_id}).all()
+    summaries = []
+    for row in rows:
+        summary = dict(row._mapping)
+        summary["data_atual"] = row.data_atual.isoformat()
+        summaries.append(summary)
+    return summaries
+
+
+__all__ = ["city_summaries"]
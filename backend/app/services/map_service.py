@@ -0,0 +1,131 @@
+"""Latest heat risk per municipality for the map and the vector tiles.
+
+Observed GOLD rows (cities with INMET stations) are combined with the
+interpolated estimates of ``gold_clima_pe_interpolado`` so every
+municipality of the state gets a value; observed data wins when both exist.
+Results are keyed by IBGE code, which is what the GeoJSON features carry.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from ..extensions import db
+
+logger = logging.getLogger(__name__)
+
+RISK_SCORES = {"Baixo": 20, "Moderado": 40, "Alto": 60, "Muito Alto": 80, "Extremo": 100}
+
+_LATEST_COLUMNS = """
+    c.codigo_ibge, c.nome_cidade, c.uf, g.id_cidade, g.data, g.risco_calor,
+    CAST(g.heat_index_max AS FLOAT) AS heat_index_max,
+    CAST(g.temp_max AS FLOAT) AS temp_max
+"""
+
+_LATEST_RISK_SQL = text(
+    f"""
+    SELECT DISTINCT ON (id_cidade) *
+    FROM (
+        SELECT {_LATEST_COLUMNS}, FALSE AS interpolado
+        FROM gold_clima_pe_diario g
+        JOIN dim_cidade_pe c ON c.id_cidade = g.id_cidade
+        WHERE c.codigo_ibge IS NOT NULL
+        UNION ALL
+        SELECT {_LATEST_COLUMNS}, TRUE AS interpolado
+        FROM gold_clima_pe_interpolado g
+        JOIN dim_cidade_pe c ON c.id_cidade = g.id_cidade
+        WHERE c.codigo_ibge IS NOT NULL
+    ) latest
+    ORDER BY id_cidade, data DESC, interpolado
+    """
+)
+
+# Databases created before the interpolation stage have no such table
+_OBSERVED_RISK_SQL = text(
+    f"""
+    SELECT DISTINCT ON (g.id_cidade) {_LATEST_COLUMNS}, FALSE AS interpolado
+    FROM gold_clima_pe_diario g
+    JOIN dim_cidade_pe c ON c.id_cidade = g.id_cidade
+    WHERE c.codigo_ibge IS NOT NULL
+    ORDER BY g.id_cidade, g.data DESC
+    """
+)
+
+# Observed rows only, one per city of ``uf``: latest class, mean heat index (/api/gold/mapa)
+_CITY_RISK_SQL = text(
+    """
+    SELECT DISTINCT ON (g.id_cidade)
+        g.id_cidade, c.nome_cidade, c.uf, g.data, g.risco_calor,
+        CAST(avg(g.heat_index_max) OVER (PARTITION BY g.id_cidade) AS FLOAT) AS heat_index_avg
+    FROM gold_clima_pe_diario g
+    JOIN dim_cidade_pe c ON c.id_cidade = g.id_cidade
+    WHERE c.uf = :uf
+    ORDER BY g.id_cidade DESC, g.data DESC
+    """
+)
+
+_risk: Dict[int, Dict[int, dict]] = {}  # data version -> {codigo_ibge: attributes}
+
+
+def _read_latest_rows():
+    for query in (_LATEST_RISK_SQL, _OBSERVED_RISK_SQL):
+        try:
+            return db.session.execute(query).all()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning("Latest risk query failed (%s); trying fallback", e)
+    return None
+
+
+def latest_risk_by_ibge(version: int) -> Optional[Dict[int, dict]]:
+    """Latest risk attributes per IBGE code, memoized per GOLD data version.
+
+    Version 0 (no stamp yet) is never memoized. Returns None when GOLD cannot
+    be read, so callers can avoid caching results without risk attributes.
+    """
+    if version in _risk:
+        return _risk[version]
+    rows = _read_latest_rows()
+    if rows is None:
+        return None
+    attributes = {}
+    for row in rows:
+        attributes[int(row.codigo_ibge)] = {
+            "id_cidade": row.id_cidade,
+            "nome_cidade": row.nome_cidade,
+            "uf": row.uf,
+            "data": row.data.isoformat() if row.data else None,
+            "risco_calor": row.risco_calor,
+            "risco": RISK_SCORES.get(row.risco_calor, 50),
+            "heat_index_max": row.heat_index_max,
+            "temp_max": row.temp_max,
+            "interpolado": bool(row.interpolado),
+        }
+    if version:
+        _risk.clear()
+        _risk[version] = attributes
+    return attributes
+
+
+def latest_risk_by_city(uf: str = "PE") -> List[dict]:
+    """Latest risk class and mean heat index of every city of ``uf``, newest id first.
+
+    Same payload as ``gold_cube.map_rows``.
+    """
+    return [
+        {
+            "id_cidade": row.id_cidade,
+            "nome_cidade": row.nome_cidade,
+            "uf": row.uf,
+            "risco": RISK_SCORES.get(row.risco_calor, 50),
+            "categoria": row.risco_calor,
+            "heat_index_avg": round(row.heat_index_avg or 0, 1),
+            "data_atualizacao": row.data.isoformat() if row.data else None,
+        }
+        for row in db.session.execute(_CITY_RISK_SQL, {"uf": uf})
+    ]
+
+
+__all__ = ["RISK_SCORES", "latest_risk_by_city", "latest_risk_by_ibge"]
@@ -0,0 +1,321 @@
+"""Vectorized what-if engine over hourly station history.
+
+A station's history is loaded once as NumPy columns; a batch of scenarios is
+applied by broadcasting ``(S, 1)`` deltas against ``(1, N)`` observations, and
+apparent temperature, heat index and risk class are recomputed with the same
+formulas the ETL uses (``etl/transform/compute_heat_metrics.py`` and
+``classify_heat_risk``). The backend image does not ship the ``etl`` package,
+so the formulas are restated here.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ..extensions import db
+from ..models import ClimateHourly
+
+RISK_LEVELS = ("Baixo", "Moderado", "Alto", "Muito Alto", "Extremo")
+UNKNOWN_RISK = "Desconhecido"
+# Heat index at which a day counts as "Alto" or worse
+HIGH_RISK_HEAT_INDEX = 33.0
+
+# Heat index cells evaluated per slab of a grid sweep (bounds peak memory)
+GRID_CHUNK_CELLS = 4_000_000
+
+SCENARIO_KEYS = ("temperature", "temperature_pct", "humidity", "wind_speed", "precipitation")
+
+_COLUMNS = (
+    ClimateHourly.datetime_utc,
+    ClimateHourly.temperature,
+    ClimateHourly.humidity,
+    ClimateHourly.wind_speed,
+    ClimateHourly.precipitation,
+)
+
+
+def apparent_temperature(temp_c, humidity, wind_speed):
+    """Steadman apparent temperature."""
+    e = (humidity / 100.0) * 6.105 * np.exp(17.27 * temp_c / (237.7 + temp_c))
+    return temp_c + 0.33 * e - 0.70 * wind_speed - 4.00
+
+
+def heat_index(temp_c, humidity):
+    """NOAA heat index in Celsius; the air temperature outside hot and humid conditions."""
+    temp_f = temp_c * 9 / 5 + 32
+    hi_f = (
+        -42.379
+        + 2.04901523 * temp_f
+        + 10.14333127 * humidity
+        - 0.22475541 * temp_f * humidity
+        - 0.00683783 * temp_f**2
+        - 0.05481717 * humidity**2
+        + 0.00122874 * temp_f**2 * humidity
+        + 0.00085282 * temp_f * humidity**2
+        - 0.00000199 * temp_f**2 * humidity**2
+    )
+    hi_c = (hi_f - 32) * 5 / 9
+    return np.where((temp_c >= 26) & (humidity >= 40), hi_c, temp_c)
+
+
+def risk_codes(heat_index_values) -> np.ndarray:
+    """Index into ``RISK_LEVELS`` for each heat index, -1 where it is missing."""
+    hi = np.asarray(heat_index_values, dtype=float)
+    codes = np.digitize(hi, (27.0, 33.0, 41.0)) + (hi > 52.0)
+    return np.where(np.isnan(hi), -1, codes)
+
+
+def risk_labels(codes: np.ndarray) -> List[str]:
+    labels = np.array(RISK_LEVELS + (UNKNOWN_RISK,), dtype=object)
+    return labels[codes].tolist()
+
+
+@dataclass
+class StationHistory:
+    """Hourly observations of one station, oldest first."""
+
+    station_code: str
+    datetime_utc: np.ndarray  # datetime64[s]
+    temperature: np.ndarray
+    humidity: np.ndarray
+    wind_speed: np.ndarray
+    precipitation: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.datetime_utc)
+
+    def day_starts(self) -> np.ndarray:
+        """Offsets where a new UTC day begins (rows are sorted by time)."""
+        days = self.datetime_utc.astype("datetime64[D]")
+        if not len(days):
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([[0], np.flatnonzero(days[1:] != days[:-1]) + 1])
+
+
+def _float_column(values: Iterable) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def _history_from_rows(station_code: str, rows: Sequence) -> StationHistory:
+    times, temp, hum, wind, precip = zip(*rows) if rows else ((), (), (), (), ())
+    return StationHistory(
+        station_code=station_code,
+        datetime_utc=np.array(times, dtype="datetime64[s]"),
+        temperature=_float_column(temp),
+        humidity=_float_column(hum),
+        wind_speed=_float_column(wind),
+        precipitation=_float_column(precip),
+    )
+
+
+def load_station_history(station_code: str, limit: Optional[int] = None) -> Optional[StationHistory]:
+    """Most recent ``limit`` hours of a station (all of them if None)."""
+    query = (
+        db.session.query(*_COLUMNS)
+        .filter(ClimateHourly.station_code == station_code)
+        .order_by(ClimateHourly.datetime_utc.desc())
+    )
+    if limit:
+        query = query.limit(limit)
+    rows = query.all()
+    if not rows:
+        return None
+    return _history_from_rows(station_code, rows[::-1])
+
+
+def load_all_histories(hours: Optional[int] = None) -> Dict[str, StationHistory]:
+    """History of every station, optionally only the last ``hours`` before the latest reading."""
+    query = db.session.query(ClimateHourly.station_code, *_COLUMNS)
+    if hours:
+        latest = db.session.query(db.func.max(ClimateHourly.datetime_utc)).scalar()
+        if latest is None:
+            return {}
+        query = query.filter(ClimateHourly.datetime_utc > latest - timedelta(hours=hours))
+    rows = query.order_by(ClimateHourly.station_code, ClimateHourly.datetime_utc).all()
+
+    histories: Dict[str, StationHistory] = {}
+    start = 0
+    for i in range(1, len(rows) + 1):
+        if i == len(rows) or rows[i][0] != rows[start][0]:
+            histories[rows[start][0]] = _history_from_rows(rows[start][0], [r[1:] for r in rows[start:i]])
+            start = i
+    return histories
+
+
+@dataclass
+class ScenarioBatch:
+    """Per-scenario deltas as ``(S, 1)`` columns ready to broadcast."""
+
+    temperature: np.ndarray
+    temperature_pct: np.ndarray
+    humidity: np.ndarray
+    wind_speed: np.ndarray
+    precipitation: np.ndarray
+
+    @classmethod
+    def from_mappings(cls, scenarios: Sequence[Mapping[str, float]]) -> "ScenarioBatch":
+        columns = {
+            key: np.array([float(s.get(key) or 0) for s in scenarios], dtype=float)[:, None]
+            for key in SCENARIO_KEYS
+        }
+        return cls(**columns)
+
+    def __len__(self) -> int:
+        return self.temperature.shape[0]
+
+
+@dataclass
+class ScenarioResult:
+    """Simulated ``(S, N)`` series for one station."""
+
+    history: StationHistory
+    temperature: np.ndarray
+    humidity: np.ndarray
+    wind_speed: np.ndarray
+    precipitation: np.ndarray
+    apparent_temperature: np.ndarray
+    heat_index: np.ndarray
+    risk: np.ndarray
+
+    def daily_max_heat_index(self) -> np.ndarray:
+        """``(S, D)`` daily maxima of the heat index (NaN for days without data)."""
+        starts = self.history.day_starts()
+        if not len(starts):
+            return np.empty((len(self.heat_index), 0))
+        return np.fmax.reduceat(self.heat_index, starts, axis=1)
+
+    def summaries(self) -> List[dict]:
+        daily_max = self.daily_max_heat_index()
+        daily_risk = risk_codes(daily_max)
+        high_days = (daily_max >= HIGH_RISK_HEAT_INDEX).sum(axis=1)
+        valid = ~np.isnan(self.heat_index)
+        n_valid = valid.sum(axis=1)
+        hi_sum = np.where(valid, self.heat_index, 0.0).sum(axis=1)
+        at_valid = ~np.isnan(self.apparent_temperature)
+        at_sum = np.where(at_valid, self.apparent_temperature, 0.0).sum(axis=1)
+        hi_max = np.fmax.reduce(self.heat_index, axis=1) if self.heat_index.shape[1] else np.full(len(valid), np.nan)
+
+        out = []
+        for s in range(len(self.heat_index)):
+            hours = np.bincount(self.risk[s][valid[s]], minlength=len(RISK_LEVELS))
+            days = np.bincount(daily_risk[s][daily_risk[s] >= 0], minlength=len(RISK_LEVELS))
+            out.append(
+                {
+                    "hours": int(n_valid[s]),
+                    "days": int(daily_risk.shape[1]),
+                    "heat_index_mean": _round(hi_sum[s] / n_valid[s]) if n_valid[s] else None,
+                    "heat_index_max": _round(hi_max[s]),
+                    "apparent_temperature_mean": (
+                        _round(at_sum[s] / at_valid[s].sum()) if at_valid[s].any() else None
+                    ),
+                    "risk_hours": dict(zip(RISK_LEVELS, hours.tolist())),
+                    "risk_days": dict(zip(RISK_LEVELS, days.tolist())),
+                    "high_risk_days": int(high_days[s]),
+                }
+            )
+        return out
+
+    def rows(self, scenario: int = 0) -> List[dict]:
+        """Hourly rows of one scenario, newest first."""
+        h = self.history
+        columns = {
+            "temperature": self.temperature[scenario],
+            "humidity": self.humidity[scenario],
+            "wind_speed": self.wind_speed[scenario],
+            "precipitation": self.precipitation[scenario],
+            "apparent_temperature": self.apparent_temperature[scenario],
+            "heat_index": self.heat_index[scenario],
+        }
+        values = {k: _round_list(v[::-1]) for k, v in columns.items()}
+        times = h.datetime_utc[::-1].astype(datetime).tolist()
+        risks = risk_labels(self.risk[scenario][::-1])
+        return [
+            {
+                "station_code": h.station_code,
+                "datetime_utc": t.isoformat(),
+                **{k: v[i] for k, v in values.items()},
+                "risk_class": risks[i],
+            }
+            for i, t in enumerate(times)
+        ]
+
+
+def _round(value) -> Optional[float]:
+    return None if value is None or np.isnan(value) else round(float(value), 2)
+
+
+def _round_list(values: np.ndarray) -> List[Optional[float]]:
+    rounded = np.round(values, 2)
+    return [None if v != v else v for v in rounded.tolist()]
+
+
+def run_scenarios(history: StationHistory, scenarios: ScenarioBatch | Sequence[Mapping[str, float]]) -> ScenarioResult:
+    """Apply every scenario to the history in one broadcast computation.
+
+    The temperature is scaled by ``temperature_pct`` and then shifted by
+    ``temperature`` (°C); humidity (percentage points) is clipped to 0–100 and
+    wind speed and precipitation to non-negative values.
+    """
+    batch = scenarios if isinstance(scenarios, ScenarioBatch) else ScenarioBatch.from_mappings(scenarios)
+    temp = history.temperature[None, :] * (1 + batch.temperature_pct / 100.0) + batch.temperature
+    hum = np.clip(history.humidity[None, :] + batch.humidity, 0, 100)
+    wind = np.maximum(history.wind_speed[None, :] + batch.wind_speed, 0)
+    precip = np.maximum(history.precipitation[None, :] + batch.precipitation, 0)
+    hi = heat_index(temp, hum)
+    return ScenarioResult(
+        history=history,
+        temperature=temp,
+        humidity=hum,
+        wind_speed=wind,
+        precipitation=precip,
+        apparent_temperature=apparent_temperature(temp, hum, wind),
+        heat_index=hi,
+        risk=risk_codes(hi),
+    )
+
+
+def high_risk_day_grid(
+    history: StationHistory,
+    temperature_deltas: Sequence[float],
+    humidity_deltas: Sequence[float],
+) -> np.ndarray:
+    """``(T, H)`` counts of days whose maximum heat index reaches "Alto".
+
+    The heat index depends only on temperature and humidity, so the sweep is a
+    ``(T, H, N)`` broadcast; it is evaluated in slabs of temperature rows so a
+    long history does not allocate the whole cube at once.
+    """
+    t_deltas = np.asarray(temperature_deltas, dtype=float)
+    h_deltas = np.asarray(humidity_deltas, dtype=float)
+    grid = np.zeros((len(t_deltas), len(h_deltas)), dtype=np.int64)
+    starts = history.day_starts()
+    if not len(starts):
+        return grid
+    hum = np.clip(history.humidity[None, :] + h_deltas[:, None], 0, 100)[None, :, :]
+    step = max(1, GRID_CHUNK_CELLS // max(1, hum.size))
+    for lo in range(0, len(t_deltas), step):
+        temp = history.temperature[None, None, :] + t_deltas[lo : lo + step, None, None]
+        daily_max = np.fmax.reduceat(heat_index(temp, hum), starts, axis=2)
+        grid[lo : lo + step] = (daily_max >= HIGH_RISK_HEAT_INDEX).sum(axis=2)
+    return grid
+
+
+__all__ = [
+    "HIGH_RISK_HEAT_INDEX",
+    "RISK_LEVELS",
+    "SCENARIO_KEYS",
+    "ScenarioBatch",
+    "ScenarioResult",
+    "StationHistory",
+    "apparent_temperature",
+    "heat_index",
+    "high_risk_day_grid",
+    "load_all_histories",
+    "load_station_history",
+    "risk_codes",
+    "risk_labels",
+    "run_scenarios",
+]
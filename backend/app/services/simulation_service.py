@@ -1,61 +1,211 @@
 """Simulation helpers for what-if scenarios."""
 from __future__ import annotations
 
-from typing import Dict, List
+import time
+from dataclasses import fields, replace
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
-from ..models import ClimateHourly, ClimateHourlySchema
+import numpy as np
+from flask import current_app
 
-schema_many = ClimateHourlySchema(many=True)
+from ..utils.data_version import get_data_version
+from .gold_cube import get_gold_cube
+from .simulation_engine import (
+    HIGH_RISK_HEAT_INDEX,
+    StationHistory,
+    heat_index,
+    high_risk_day_grid,
+    load_all_histories,
+    load_station_history,
+    run_scenarios,
+)
 
+# Hours of history used by the single-scenario endpoints
+RECENT_HOURS = 100
+# Upper bound on scenarios evaluated in one batch call
+MAX_SCENARIOS = 100
+# Upper bound on steps along each axis of a grid sweep
+MAX_GRID_STEPS = 50
+# Full history of each station loaded so far, for the "climate" stamp in
+# _history_state (one copy per worker; windows are sliced from it)
+_history_cache: Dict[str, StationHistory] = {}
+_history_state: Dict[str, Any] = {"version": None, "loaded_at": 0.0, "complete": False}
 
-def _recent_data(station_code: str, limit: int = 100) -> List[dict]:
-    records = (
-        ClimateHourly.query.filter_by(station_code=station_code)
-        .order_by(ClimateHourly.datetime_utc.desc())
-        .limit(limit)
-        .all()
+
+def _full_histories() -> Dict[str, StationHistory]:
+    """The memoized histories, emptied when the ETL reloads climate data.
+
+    While the stamp is 0 (never bumped) they are kept for
+    ``DATA_VERSION_CHECK_INTERVAL`` seconds instead.
+    """
+    version = get_data_version("climate").version
+    now = time.monotonic()
+    expired = not version and now - _history_state["loaded_at"] >= current_app.config.get(
+        "DATA_VERSION_CHECK_INTERVAL", 30
     )
-    return schema_many.dump(records)
+    if version != _history_state["version"] or expired:
+        _history_cache.clear()
+        _history_state.update(version=version, loaded_at=now, complete=False)
+    return _history_cache
+
+
+def _tail(history: StationHistory, start: int) -> StationHistory:
+    arrays = {f.name: getattr(history, f.name)[start:] for f in fields(history) if f.name != "station_code"}
+    return replace(history, **arrays)
+
+
+def _histories(station_code: Optional[str], hours: Optional[int]) -> Dict[str, StationHistory]:
+    """Base arrays for one station (its last ``hours`` rows) or for all stations
+    (the ``hours`` before the latest reading); the full history if ``hours`` is None."""
+    cache = _full_histories()
+    if station_code:
+        if station_code not in cache and not _history_state["complete"]:
+            history = load_station_history(station_code)
+            if history is not None:
+                cache[station_code] = history
+        history = cache.get(station_code)
+        if history is None:
+            return {}
+        return {station_code: _tail(history, max(len(history) - hours, 0)) if hours else history}
+    if not _history_state["complete"]:
+        cache.update(load_all_histories())
+        _history_state["complete"] = True
+    if not hours or not cache:
+        return dict(cache)
+    latest = max(h.datetime_utc[-1] for h in cache.values() if len(h))
+    cutoff = latest - np.timedelta64(hours, "h")
+    windows = {code: _tail(h, int(np.searchsorted(h.datetime_utc, cutoff, side="right"))) for code, h in cache.items()}
+    return {code: h for code, h in windows.items() if len(h)}
+
+
+def _simulate_recent(station_code: str, scenario: Mapping[str, float]) -> List[dict]:
+    history = _histories(station_code, RECENT_HOURS).get(station_code)
+    if history is None:
+        return []
+    return run_scenarios(history, [scenario]).rows()
 
 
 def simulate_temperature_increase(station_code: str, percentage: float) -> List[dict]:
-    factor = 1 + (percentage or 0) / 100.0
-    data = _recent_data(station_code)
-    for row in data:
-        for field in ["temperature", "apparent_temperature", "heat_index"]:
-            if row.get(field) is not None:
-                row[field] = row[field] * factor
-    return data
+    return _simulate_recent(station_code, {"temperature_pct": percentage or 0})
 
 
 def simulate_rainfall_change(station_code: str, delta_mm: float) -> List[dict]:
-    data = _recent_data(station_code)
-    for row in data:
-        if row.get("precipitation") is not None:
-            row["precipitation"] = max(0, row["precipitation"] + delta_mm)
-    return data
+    return _simulate_recent(station_code, {"precipitation": delta_mm or 0})
 
 
 def simulate_future_heat_scenario(station_code: str, climate_variables: Dict[str, float]) -> List[dict]:
-    data = _recent_data(station_code)
-    temp_delta = climate_variables.get("temperature", 0)
-    humidity_delta = climate_variables.get("humidity", 0)
-    wind_delta = climate_variables.get("wind_speed", 0)
-    precip_delta = climate_variables.get("precipitation", 0)
-    for row in data:
-        if row.get("temperature") is not None:
-            row["temperature"] += temp_delta
-        if row.get("humidity") is not None:
-            row["humidity"] = max(0, min(100, row["humidity"] + humidity_delta))
-        if row.get("wind_speed") is not None:
-            row["wind_speed"] = max(0, row["wind_speed"] + wind_delta)
-        if row.get("precipitation") is not None:
-            row["precipitation"] = max(0, row["precipitation"] + precip_delta)
-    return data
+    return _simulate_recent(station_code, climate_variables)
+
+
+def simulate_scenario_batch(
+    scenarios: Sequence[Mapping[str, float]],
+    station_code: Optional[str] = None,
+    hours: Optional[int] = None,
+) -> Dict[str, dict]:
+    """Summaries of every scenario, per station, next to the unchanged baseline.
+
+    Without ``station_code`` all stations are simulated. ``hours`` limits the
+    history to the most recent hours (the full history if None).
+    """
+    results = {}
+    for code, history in _histories(station_code, hours).items():
+        # Row 0 is the baseline so each scenario can be compared against it
+        summaries = run_scenarios(history, [{}, *scenarios]).summaries()
+        baseline = summaries[0]
+        for summary in summaries[1:]:
+            summary["high_risk_days_delta"] = summary["high_risk_days"] - baseline["high_risk_days"]
+        results[code] = {"baseline": baseline, "scenarios": summaries[1:]}
+    return results
+
+
+def simulate_grid(
+    temperature_deltas: Sequence[float],
+    humidity_deltas: Sequence[float],
+    station_code: Optional[str] = None,
+    hours: Optional[int] = None,
+) -> Dict[str, dict]:
+    """Count "Alto+" days for every (temperature, humidity) delta pair, per station.
+
+    ``high_risk_days[i][j]`` is the count for ``temperature_deltas[i]`` (°C)
+    and ``humidity_deltas[j]`` (percentage points).
+    """
+    results = {}
+    for code, history in _histories(station_code, hours).items():
+        baseline = high_risk_day_grid(history, [0.0], [0.0])
+        results[code] = {
+            "days": int(len(history.day_starts())),
+            "baseline": int(baseline[0, 0]),
+            "high_risk_days": high_risk_day_grid(history, temperature_deltas, humidity_deltas).tolist(),
+        }
+    return results
+
+
+def simulate_statewide(
+    climate_variables: Mapping[str, float],
+    start=None,
+    end=None,
+) -> Optional[dict]:
+    """Change in "Alto+" days for every city's GOLD series under one scenario.
+
+    GOLD keeps daily aggregates only, so the scenario shifts each day's stored
+    ``heat_index_max`` by how much the heat index of (``temp_max``,
+    ``umidade_media``) changes under the temperature (°C) and humidity
+    (percentage points) deltas; the baseline is therefore exactly the
+    stored series. Returns None when GOLD cannot be read.
+    """
+    cube = get_gold_cube()
+    if cube is None:
+        return None
+    span = cube.day_slice(start, end)
+    temp = cube.metric("temp_max")[:, span].astype(float)
+    hum = cube.metric("umidade_media")[:, span].astype(float)
+    hi = cube.metric("heat_index_max")[:, span].astype(float)
+
+    dt = float(climate_variables.get("temperature") or 0)
+    dh = float(climate_variables.get("humidity") or 0)
+    shift = heat_index(temp + dt, np.clip(hum + dh, 0, 100)) - heat_index(temp, hum)
+    simulated = hi + np.nan_to_num(shift)
+
+    baseline_days = (hi >= HIGH_RISK_HEAT_INDEX).sum(axis=1)
+    simulated_days = (simulated >= HIGH_RISK_HEAT_INDEX).sum(axis=1)
+    observed = (cube.present[:, span] & ~cube.interpolated[:, span]).any(axis=1)
+    n_days = cube.present[:, span].sum(axis=1)
+
+    cities = []
+    for row, id_cidade in enumerate(cube.city_ids.tolist()):
+        if not n_days[row]:
+            continue
+        info = cube.cities.get(id_cidade, {})
+        cities.append(
+            {
+                "id_cidade": id_cidade,
+                "nome_cidade": info.get("nome_cidade"),
+                "codigo_ibge": info.get("codigo_ibge"),
+                "interpolado": not bool(observed[row]),
+                "days": int(n_days[row]),
+                "baseline_high_risk_days": int(baseline_days[row]),
+                "simulated_high_risk_days": int(simulated_days[row]),
+                "high_risk_days_delta": int(simulated_days[row] - baseline_days[row]),
+            }
+        )
+    cities.sort(key=lambda c: c["high_risk_days_delta"], reverse=True)
+    days = cube.days[span]
+    return {
+        "start": str(days[0]) if len(days) else None,
+        "end": str(days[-1]) if len(days) else None,
+        "baseline_high_risk_days": int(baseline_days.sum()),
+        "simulated_high_risk_days": int(simulated_days.sum()),
+        "cities": cities,
+    }
 
 
 __all__ = [
+    "MAX_GRID_STEPS",
+    "MAX_SCENARIOS",
     "simulate_temperature_increase",
     "simulate_rainfall_change",
     "simulate_future_heat_scenario",
+    "simulate_grid",
+    "simulate_scenario_batch",
+    "simulate_statewide",
 ]
@@ -0,0 +1,110 @@
+"""Station kNN graph built by the ETL (``dim_estacao_vizinhos``).
+
+The edge list is read once per ETL stamp for ``estacoes`` and kept as CSR
+arrays keyed by station code, so neighbor averages are a gather and a
+weighted sum instead of a distance computation per request.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+from sqlalchemy import text
+
+from ..extensions import db
+from ..utils.data_version import get_data_version
+
+logger = logging.getLogger(__name__)
+
+_EDGES_SQL = text(
+    """
+    SELECT e.codigo_estacao AS station_code, v.codigo_estacao AS neighbor_code,
+           CAST(n.distancia_km AS FLOAT) AS distance_km, CAST(n.peso AS FLOAT) AS weight
+    FROM dim_estacao_vizinhos n
+    JOIN dim_estacao e ON e.id_estacao = n.id_estacao
+    JOIN dim_estacao v ON v.id_estacao = n.id_vizinho
+    ORDER BY e.codigo_estacao, n.ordem
+    """
+)
+
+
+@dataclass
+class StationGraph:
+    codes: List[str]
+    position: Dict[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    distances_km: np.ndarray
+    weights: np.ndarray
+
+    def neighbors_of(self, code: str) -> List[Dict[str, float]]:
+        row = self.position.get(code)
+        if row is None:
+            return []
+        span = slice(self.indptr[row], self.indptr[row + 1])
+        return [
+            {"station_code": self.codes[col], "distance_km": round(float(dist), 3), "weight": round(float(w), 6)}
+            for col, dist, w in zip(self.indices[span], self.distances_km[span], self.weights[span])
+        ]
+
+    def neighbor_mean(self, values: Mapping[str, Optional[float]]) -> Dict[str, Optional[float]]:
+        """Weighted mean of each station's neighbors, renormalized over missing values."""
+        column = np.array([values.get(code) for code in self.codes], dtype=float)
+        gathered = column[self.indices]
+        w = np.where(np.isnan(gathered), 0.0, self.weights)
+        rows = np.repeat(np.arange(len(self.codes)), np.diff(self.indptr))
+        total = np.bincount(rows, weights=w, minlength=len(self.codes))
+        acc = np.bincount(rows, weights=np.nan_to_num(gathered) * w, minlength=len(self.codes))
+        mean = np.divide(acc, total, out=np.full(len(self.codes), np.nan), where=total > 0)
+        return {code: (None if np.isnan(m) else float(m)) for code, m in zip(self.codes, mean)}
+
+
+_cache: Dict[int, StationGraph] = {}
+
+
+def _build_graph(rows) -> StationGraph:
+    codes: List[str] = []
+    position: Dict[str, int] = {}
+    for row in rows:
+        for code in (row.station_code, row.neighbor_code):
+            if code not in position:
+                position[code] = len(codes)
+                codes.append(code)
+    counts = np.zeros(len(codes), dtype=np.int64)
+    for row in rows:
+        counts[position[row.station_code]] += 1
+    # Rows arrive ordered by station code, but CSR needs them by position
+    order = sorted(range(len(rows)), key=lambda i: position[rows[i].station_code])
+    return StationGraph(
+        codes=codes,
+        position=position,
+        indptr=np.concatenate([[0], np.cumsum(counts)]),
+        indices=np.array([position[rows[i].neighbor_code] for i in order], dtype=np.int64),
+        distances_km=np.array([rows[i].distance_km for i in order], dtype=float),
+        weights=np.array([rows[i].weight for i in order], dtype=float),
+    )
+
+
+def get_station_graph() -> Optional[StationGraph]:
+    """Return the neighbor graph, or None if the ETL has not built it."""
+    version = get_data_version("estacoes").version
+    if version and version in _cache:
+        return _cache[version]
+    try:
+        rows = db.session.execute(_EDGES_SQL).all()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning("Station neighbor graph unavailable: %s", e)
+        return None
+    if not rows:
+        return None
+    graph = _build_graph(rows)
+    if version:
+        _cache.clear()
+        _cache[version] = graph
+    return graph
+
+
+__all__ = ["StationGraph", "get_station_graph"]
@@ -5,6 +5,7 @@ from typing import List, Optional
 
 from ..extensions import db
 from ..models import Station, StationSchema
+from .station_graph import get_station_graph
 
 station_schema_many = StationSchema(many=True)
 station_schema = StationSchema()
@@ -22,4 +23,12 @@ def get_station_details(station_code: str) -> Optional[dict]:
     return station_schema.dump(station)
 
 
-__all__ = ["list_stations", "get_station_details"]
+def get_station_neighbors(station_code: str) -> Optional[List[dict]]:
+    """Nearest stations from the precomputed graph (None if the graph is missing)."""
+    graph = get_station_graph()
+    if graph is None:
+        return None
+    return graph.neighbors_of(station_code)
+
+
+__all__ = ["list_stations", "get_station_details", "get_station_neighbors"]
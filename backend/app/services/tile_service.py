@@ -0,0 +1,344 @@
+"""Mapbox Vector Tiles (MVT) for the municipality heat-risk layer.
+
+Tiles are cut in pure Python from the pre-simplified meshes generated by
+``scripts/build_geo_lod.py`` (coarser levels at lower zooms), carry the
+latest ``risco_calor`` of each municipality (observed or interpolated, see
+``map_service``) as feature attributes and are written to disk after the
+first render. The on-disk key includes the GOLD data version, so an ETL run
+naturally starts a fresh tile set.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import shutil
+import struct
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..utils.data_version import get_data_version
+from .map_service import latest_risk_by_ibge
+
+logger = logging.getLogger(__name__)
+
+GEO_DIR = Path(__file__).parent.parent / "static" / "geo"
+LAYER_NAME = "municipios"
+EXTENT = 4096
+BUFFER = 64
+MAX_ZOOM = 16
+
+# Mesh level used at each zoom (see scripts/build_geo_lod.py)
+ZOOM_LEVELS = ((7, "low"), (9, "medium"), (MAX_ZOOM, "high"))
+
+Ring = List[Tuple[float, float]]
+
+
+@dataclass
+class TileFeature:
+    codigo_ibge: int
+    nome: str
+    polygons: List[List[Ring]]  # normalized Web Mercator (0..1) coordinates
+    bbox: Tuple[float, float, float, float]
+
+
+# ============================================================================
+# Geometry loading and projection
+# ============================================================================
+
+def _project(lon: float, lat: float) -> Tuple[float, float]:
+    """Lon/lat to normalized Web Mercator coordinates (0..1, y pointing down)."""
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+
+_features: Dict[str, Tuple[int, List[TileFeature]]] = {}  # level -> (mtime_ns, features)
+_features_lock = threading.Lock()
+
+
+def _mesh_path(level: str) -> Path:
+    path = GEO_DIR / f"municipios_pe.{level}.geojson"
+    return path if path.exists() else GEO_DIR / "municipios_pe.geojson"
+
+
+def _load_features(level: str) -> List[TileFeature]:
+    path = _mesh_path(level)
+    mtime_ns = path.stat().st_mtime_ns
+    cached = _features.get(level)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    with _features_lock:
+        cached = _features.get(level)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        features = []
+        for feature in data.get("features", []):
+            geometry = feature["geometry"]
+            polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+            projected = [[[_project(c[0], c[1]) for c in ring] for ring in polygon] for polygon in polygons]
+            xs = [p[0] for polygon in projected for p in polygon[0]]
+            ys = [p[1] for polygon in projected for p in polygon[0]]
+            props = feature.get("properties") or {}
+            features.append(TileFeature(
+                codigo_ibge=int(props.get("codarea") or props.get("id")),
+                nome=props.get("nome", ""),
+                polygons=projected,
+                bbox=(min(xs), min(ys), max(xs), max(ys)),
+            ))
+        _features[level] = (mtime_ns, features)
+        logger.info("Loaded %d tile features from %s", len(features), path.name)
+        return features
+
+
+def level_for_zoom(z: int) -> str:
+    for max_zoom, level in ZOOM_LEVELS:
+        if z <= max_zoom:
+            return level
+    return ZOOM_LEVELS[-1][1]
+
+
+# ============================================================================
+# Clipping
+# ============================================================================
+
+def _clip_ring(ring: Ring, lo: float, hi: float) -> Ring:
+    """Sutherland–Hodgman clip of a ring (tile pixel coordinates) to [lo, hi]²."""
+    edges = (
+        (lambda p: p[0] >= lo, lambda a, b: _cross_x(a, b, lo)),
+        (lambda p: p[0] <= hi, lambda a, b: _cross_x(a, b, hi)),
+        (lambda p: p[1] >= lo, lambda a, b: _cross_y(a, b, lo)),
+        (lambda p: p[1] <= hi, lambda a, b: _cross_y(a, b, hi)),
+    )
+    output = ring
+    for inside, intersect in edges:
+        if not output:
+            break
+        points, output = output, []
+        prev = points[-1]
+        for point in points:
+            if inside(point):
+                if not inside(prev):
+                    output.append(intersect(prev, point))
+                output.append(point)
+            elif inside(prev):
+                output.append(intersect(prev, point))
+            prev = point
+    return output
+
+
+def _cross_x(a, b, x):
+    t = (x - a[0]) / (b[0] - a[0])
+    return (x, a[1] + t * (b[1] - a[1]))
+
+
+def _cross_y(a, b, y):
+    t = (y - a[1]) / (b[1] - a[1])
+    return (a[0] + t * (b[0] - a[0]), y)
+
+
+def _signed_area(ring: Sequence[Tuple[int, int]]) -> int:
+    return sum(
+        ring[i][0] * ring[(i + 1) % len(ring)][1] - ring[(i + 1) % len(ring)][0] * ring[i][1]
+        for i in range(len(ring))
+    )
+
+
+def _tile_rings(feature: TileFeature, z: int, x: int, y: int) -> List[List[List[Tuple[int, int]]]]:
+    """Clip and quantize a feature to one tile; returns polygons of integer rings."""
+    scale = (1 << z) * EXTENT
+    out = []
+    for polygon in feature.polygons:
+        rings = []
+        for k, ring in enumerate(polygon):
+            pixels = [(px * scale - x * EXTENT, py * scale - y * EXTENT) for px, py in ring[:-1]]
+            clipped = _clip_ring(pixels, -BUFFER, EXTENT + BUFFER)
+            quantized: List[Tuple[int, int]] = []
+            for px, py in clipped:
+                point = (int(round(px)), int(round(py)))
+                if not quantized or quantized[-1] != point:
+                    quantized.append(point)
+            while len(quantized) > 1 and quantized[0] == quantized[-1]:
+                quantized.pop()
+            area = _signed_area(quantized) if len(quantized) >= 3 else 0
+            if area == 0:
+                if k == 0:
+                    break  # exterior vanished: drop the whole polygon
+                continue
+            # MVT: exterior rings clockwise in screen space (positive area), holes negative
+            if (k == 0) != (area > 0):
+                quantized.reverse()
+            rings.append(quantized)
+        if rings:
+            out.append(rings)
+    return out
+
+
+# ============================================================================
+# Protobuf encoding (vector_tile.proto v2)
+# ============================================================================
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _bytes_field(field: int, payload: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _packed(field: int, values: Sequence[int]) -> bytes:
+    return _bytes_field(field, b"".join(_varint(v) for v in values))
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _command(cmd_id: int, count: int) -> int:
+    return (cmd_id & 0x7) | (count << 3)
+
+
+def _encode_geometry(polygons: List[List[List[Tuple[int, int]]]]) -> List[int]:
+    geometry: List[int] = []
+    cx = cy = 0
+    for rings in polygons:
+        for ring in rings:
+            x0, y0 = ring[0]
+            geometry += [_command(1, 1), _zigzag(x0 - cx), _zigzag(y0 - cy)]
+            cx, cy = x0, y0
+            geometry.append(_command(2, len(ring) - 1))
+            for px, py in ring[1:]:
+                geometry += [_zigzag(px - cx), _zigzag(py - cy)]
+                cx, cy = px, py
+            geometry.append(_command(7, 1))
+    return geometry
+
+
+def _encode_value(value) -> bytes:
+    if isinstance(value, bool):
+        return _key(7, 0) + _varint(int(value))
+    if isinstance(value, int):
+        return _key(6, 0) + _varint(_zigzag(value))
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _bytes_field(1, str(value).encode("utf-8"))
+
+
+def encode_layer(name: str, features: List[Tuple[int, dict, List]]) -> bytes:
+    """Encode one MVT layer; ``features`` holds (id, properties, polygons)."""
+    keys: Dict[str, int] = {}
+    values: Dict[Tuple[type, object], int] = {}
+    encoded_features = []
+    for feature_id, properties, polygons in features:
+        tags = []
+        for k, v in properties.items():
+            if v is None:
+                continue
+            tags.append(keys.setdefault(k, len(keys)))
+            tags.append(values.setdefault((type(v), v), len(values)))
+        body = _key(1, 0) + _varint(feature_id)
+        body += _packed(2, tags)
+        body += _key(3, 0) + _varint(3)  # GeomType.POLYGON
+        body += _packed(4, _encode_geometry(polygons))
+        encoded_features.append(_bytes_field(2, body))
+
+    layer = _key(15, 0) + _varint(2)
+    layer += _bytes_field(1, name.encode("utf-8"))
+    layer += b"".join(encoded_features)
+    layer += b"".join(_bytes_field(3, k.encode("utf-8")) for k in keys)
+    layer += b"".join(_bytes_field(4, _encode_value(v)) for (_, v) in values)
+    layer += _key(5, 0) + _varint(EXTENT)
+    return _bytes_field(3, layer)
+
+
+# ============================================================================
+# Risk attributes and tile rendering
+# ============================================================================
+
+# Attributes carried by each feature (the name already comes from the mesh)
+TILE_ATTRIBUTES = ("id_cidade", "data", "risco_calor", "risco", "heat_index_max", "temp_max", "interpolado")
+
+
+def render_tile(z: int, x: int, y: int, risk: Dict[int, dict]) -> bytes:
+    """Render one tile; empty tiles encode to empty bytes."""
+    n = 1 << z
+    pad = BUFFER / EXTENT
+    tx0, ty0 = (x - pad) / n, (y - pad) / n
+    tx1, ty1 = (x + 1 + pad) / n, (y + 1 + pad) / n
+
+    features = []
+    for feature in _load_features(level_for_zoom(z)):
+        fx0, fy0, fx1, fy1 = feature.bbox
+        if fx1 < tx0 or fx0 > tx1 or fy1 < ty0 or fy0 > ty1:
+            continue
+        polygons = _tile_rings(feature, z, x, y)
+        if not polygons:
+            continue
+        properties = {"codigo_ibge": feature.codigo_ibge, "nome": feature.nome}
+        attributes = risk.get(feature.codigo_ibge, {})
+        properties.update((key, attributes.get(key)) for key in TILE_ATTRIBUTES if key in attributes)
+        features.append((feature.codigo_ibge, properties, polygons))
+    return encode_layer(LAYER_NAME, features) if features else b""
+
+
+def _tile_set_dir(cache_dir: Path, version: int, z: int) -> Path:
+    mesh_mtime = _mesh_path(level_for_zoom(z)).stat().st_mtime_ns
+    return cache_dir / f"gold-v{version}" / f"{z}-{mesh_mtime}"
+
+
+def _prune_old_versions(cache_dir: Path, current: str) -> None:
+    for child in cache_dir.glob("gold-v*"):
+        if child.name != current:
+            shutil.rmtree(child, ignore_errors=True)
+
+
+def get_tile(z: int, x: int, y: int, cache_dir: Optional[Path]) -> bytes:
+    """Return tile bytes from the disk cache, rendering and storing on a miss."""
+    version = get_data_version("gold").version
+    path = None
+    if cache_dir is not None:
+        path = _tile_set_dir(cache_dir, version, z) / str(x) / f"{y}.mvt"
+        try:
+            return path.read_bytes()
+        except OSError:
+            pass
+
+    risk = latest_risk_by_ibge(version)
+    tile = render_tile(z, x, y, risk or {})
+
+    if path is not None and risk is not None:
+        try:
+            if not (cache_dir / f"gold-v{version}").exists():
+                _prune_old_versions(cache_dir, f"gold-v{version}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Atomic write: concurrent workers may render the same tile
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(tile)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Could not cache tile %s/%s/%s: %s", z, x, y, e)
+    return tile
+
+
+__all__ = ["get_tile", "render_tile", "encode_layer", "level_for_zoom", "MAX_ZOOM"]
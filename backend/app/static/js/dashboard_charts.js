@@ -66,6 +66,16 @@ const DashboardCharts = (function() {
       });
   }
 
+  /**
+   * URL da série diária em formato colunar: { data: [...datas], temp_max: [...], ..., total }
+   * @param {number} cidadeId - ID da cidade
+   * @param {number} range - Número de meses para consultar
+   * @returns {string} URL da API
+   */
+  function serieUrl(cidadeId, range) {
+    return `/api/gold/${cidadeId}/serie?format=columnar&limit=${range * 30 || 365}`;
+  }
+
   /**
    * Carrega e renderiza gráfico de série temporal de temperatura
    * Exibe: temp_min (azul), temp_media (laranja), temp_max (vermelho)
@@ -79,21 +89,21 @@ const DashboardCharts = (function() {
     const chart = initChart(domId);
     if (!chart) return Promise.reject('Gráfico não inicializado');
 
-    const url = `/api/gold/${cidadeId}/serie?limit=${range * 30 || 365}`;
+    const url = serieUrl(cidadeId, range);
     
     return fetchData(url).then(data => {
-      if (!data || data.length === 0) {
+      if (!data || !data.total) {
         chart.setOption({
           title: { text: 'Sem dados disponíveis', left: 'center' }
         });
         return chart;
       }
 
-      // Extrair datas e temperaturas
-      const dates = data.map(d => d.data || d.date);
-      const tempMin = data.map(d => parseFloat(d.temp_min || 0));
-      const tempMedia = data.map(d => parseFloat(d.temp_media || 0));
-      const tempMax = data.map(d => parseFloat(d.temp_max || 0));
+      // Colunas já prontas para o ECharts (null = dia sem medição)
+      const dates = data.data;
+      const tempMin = data.temp_min;
+      const tempMedia = data.temp_media;
+      const tempMax = data.temp_max;
 
       const option = {
         title: { text: 'Série Temporal de Temperatura' },
@@ -105,7 +115,8 @@ const DashboardCharts = (function() {
             const date = params[0].axisValue;
             let html = `<strong>${date}</strong><br/>`;
             params.forEach(p => {
-              html += `${p.marker} ${p.seriesName}: ${p.value.toFixed(1)}°C<br/>`;
+              const value = p.value == null ? '—' : `${p.value.toFixed(1)}°C`;
+              html += `${p.marker} ${p.seriesName}: ${value}<br/>`;
             });
             return html;
           }
@@ -168,10 +179,10 @@ const DashboardCharts = (function() {
     const chart = initChart(domId);
     if (!chart) return Promise.reject('Gráfico não inicializado');
 
-    const url = `/api/gold/${cidadeId}/serie?limit=${range * 30 || 365}`;
+    const url = serieUrl(cidadeId, range);
     
     return fetchData(url).then(data => {
-      if (!data || data.length === 0) {
+      if (!data || !data.total) {
         chart.setOption({
           title: { text: 'Sem dados disponíveis', left: 'center' }
         });
@@ -187,8 +198,8 @@ const DashboardCharts = (function() {
         'Extremo': 0
       };
 
-      data.forEach(d => {
-        const risk = d.risco_calor || 'Baixo';
+      data.risco_calor.forEach(value => {
+        const risk = value || 'Baixo';
         if (riskCounts.hasOwnProperty(risk)) {
           riskCounts[risk]++;
         }
@@ -1,6 +1,6 @@
 """Utility package for API helpers."""
 from .exceptions import APIError
-from .pagination import paginate_query
+from .pagination import keyset_page, paginate_query
 from .responses import error, success
 
-__all__ = ["APIError", "paginate_query", "error", "success"]
+__all__ = ["APIError", "keyset_page", "paginate_query", "error", "success"]
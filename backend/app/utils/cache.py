@@ -0,0 +1,193 @@
+"""Response cache for read-only API endpoints.
+
+GOLD data only changes when the ETL runs ``run-gold``, so responses are kept
+per worker in an LRU+TTL dict (or in a Redis-compatible store) and keyed by
+route, query arguments and the current ETL data-version stamp. A new stamp
+makes every older key unreachable, which is how ``load_gold`` invalidates.
+Views built from the current date (``per_day``) also key on the UTC day.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import Flask, current_app, make_response, request
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """Thread-safe LRU dict whose entries also expire after a TTL."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class RedisBackend:
+    """Backend over any client exposing ``get(key)`` and ``set(key, value, ex=ttl)``.
+
+    Works with ``redis.Redis`` and with local stand-ins (fakeredis, a dict
+    wrapper in tests) alike. Keys expire server-side; version changes simply
+    stop referencing old keys.
+    """
+
+    name = "redis"
+
+    def __init__(self, client: Any, prefix: str = "ilhas:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def clear(self) -> None:
+        # Shared store: other workers may still read these keys; rely on TTL
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"prefix": self.prefix}
+
+
+def _build_backend(app: Flask):
+    backend = app.config.get("CACHE_BACKEND", "memory").lower()
+    if backend == "redis":
+        try:
+            import redis  # optional dependency
+
+            client = redis.Redis.from_url(app.config["CACHE_REDIS_URL"])
+            return RedisBackend(client)
+        except Exception as e:
+            logger.warning("Redis cache unavailable (%s); falling back to memory", e)
+    return MemoryBackend(app.config.get("CACHE_MAX_ENTRIES", 512))
+
+
+class ResponseCache:
+    """Flask extension caching successful JSON responses of GET endpoints."""
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.backend = None
+        self.enabled = True
+        self.default_ttl = 300
+        self.hits = 0
+        self.misses = 0
+        self._last_version: Dict[str, int] = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask, backend: Any = None) -> None:
+        self.enabled = app.config.get("CACHE_ENABLED", True)
+        self.default_ttl = app.config.get("CACHE_DEFAULT_TTL", 300)
+        self.backend = backend or _build_backend(app)
+        app.extensions["response_cache"] = self
+
+    def _current_version(self, fonte: str) -> int:
+        from .data_version import get_data_version
+
+        version = get_data_version(fonte).version
+        if self._last_version.get(fonte) not in (None, version):
+            logger.info("Data version for %s changed to %s; clearing cache", fonte, version)
+            self.backend.clear()
+        self._last_version[fonte] = version
+        return version
+
+    def make_key(self, fonte: str, per_day: bool = False) -> str:
+        from .conditional import utc_today
+
+        version = self._current_version(fonte)
+        args = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+        day = f":{utc_today().isoformat()}" if per_day else ""
+        return f"{fonte}:v{version}{day}:{request.path}?{args}"
+
+    def cached(self, fonte: str = "gold", ttl: Optional[int] = None, per_day: bool = False) -> Callable:
+        """Decorator caching a view's 200 JSON body for ``ttl`` seconds.
+
+        ``per_day`` views (built from ``utc_today()``) get a new key every UTC day.
+        """
+
+        def decorator(view: Callable) -> Callable:
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or self.backend is None or request.method != "GET":
+                    return view(*args, **kwargs)
+
+                key = self.make_key(fonte, per_day)
+                body = self.backend.get(key)
+                if body is not None:
+                    self.hits += 1
+                    response = current_app.response_class(body, status=200, mimetype="application/json")
+                    response.headers["X-Cache"] = "HIT"
+                    return response
+
+                self.misses += 1
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and response.mimetype == "application/json":
+                    self.backend.set(key, response.get_data(), ttl or self.default_ttl)
+                response.headers["X-Cache"] = "MISS"
+                return response
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        data = {
+            "enabled": self.enabled,
+            "backend": getattr(self.backend, "name", None),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+            "data_versions": dict(self._last_version),
+        }
+        if self.backend is not None:
+            data.update(self.backend.stats())
+        return data
+
+
+__all__ = ["MemoryBackend", "RedisBackend", "ResponseCache"]
@@ -0,0 +1,125 @@
+"""Conditional GET support (ETag / Last-Modified) for data endpoints.
+
+Validators are derived from cheap metadata only — the ETL data-version stamp
+for database-backed endpoints, the file mtime for static GeoJSON — so a
+matching ``If-None-Match`` is answered with 304 before the view runs any
+query or reads any file. Views relative to the current date (``per_day``)
+also seed their tag with ``utc_today()``, so a new UTC day is a new resource.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import date, datetime, timezone
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from flask import current_app, g, make_response, request
+
+from .data_version import get_data_version
+
+# Clients may reuse the body but must revalidate each time (cheap 304s)
+CACHE_CONTROL = "no-cache"
+
+
+def utc_today() -> date:
+    """Today's UTC date, fixed for the whole request (validators, cache key and view agree)."""
+    if "utc_today" not in g:
+        g.utc_today = datetime.utcnow().date()
+    return g.utc_today
+
+
+def _resource_tag(seed: str) -> str:
+    """Hash the seed together with the URL so each resource has its own tag."""
+    raw = f"{seed}|{request.full_path}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:20]
+
+
+def _as_utc(value) -> Optional[datetime]:
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+    if request.if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        return request.if_none_match.contains_weak(etag)
+    if last_modified and request.if_modified_since:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def _apply_validators(response, etag: str, last_modified: Optional[datetime]):
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers.setdefault("Cache-Control", CACHE_CONTROL)
+    return response
+
+
+def _conditional_response(view: Callable, args, kwargs, etag: str, last_modified: Optional[datetime]):
+    if _not_modified(etag, last_modified):
+        response = current_app.response_class(status=304)
+        return _apply_validators(response, etag, last_modified)
+
+    response = make_response(view(*args, **kwargs))
+    if response.status_code == 200:
+        _apply_validators(response, etag, last_modified)
+    return response
+
+
+def conditional(fonte: str = "gold", per_day: bool = False) -> Callable:
+    """Decorator adding ETag/Last-Modified from the ETL data version of ``fonte``.
+
+    Apply it above ``cache.cached`` so 304s skip the cache lookup too. When the
+    version table is missing (version 0) responses are sent unconditionally.
+    ``per_day`` views (built from ``utc_today()``) get a new tag every UTC day
+    and no Last-Modified, which would not change at midnight.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(*args, **kwargs)
+            version = get_data_version(fonte)
+            if not version.version:
+                return view(*args, **kwargs)
+            seed = f"{fonte}:{version.version}"
+            if per_day:
+                seed += f":{utc_today().isoformat()}"
+                return _conditional_response(view, args, kwargs, _resource_tag(seed), None)
+            return _conditional_response(view, args, kwargs, _resource_tag(seed), _as_utc(version.updated_at))
+
+        return wrapper
+
+    return decorator
+
+
+def conditional_file(path: Union[Path, Callable[[], Optional[Path]]]) -> Callable:
+    """Decorator adding ETag/Last-Modified from a file's mtime and size.
+
+    ``path`` may be a callable resolving the file from the current request
+    (e.g. a level-of-detail query argument); returning None skips validators.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            target = path() if callable(path) else path
+            try:
+                stat = target.stat()
+            except (OSError, AttributeError):
+                # Let the view produce its own 404 message
+                return view(*args, **kwargs)
+            etag = _resource_tag(f"{stat.st_mtime_ns}:{stat.st_size}")
+            last_modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+            return _conditional_response(view, args, kwargs, etag, last_modified)
+
+        return wrapper
+
+    return decorator
+
+
+__all__ = ["conditional", "conditional_file", "utc_today"]
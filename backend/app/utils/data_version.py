@@ -0,0 +1,63 @@
+"""Read the data-version stamps bumped by the ETL (table etl_data_version)."""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import text
+
+from ..extensions import db
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLE = "etl_data_version"
+
+
+class DataVersion(NamedTuple):
+    version: int
+    updated_at: Optional[datetime]
+
+
+UNKNOWN_VERSION = DataVersion(0, None)
+
+# fonte -> (checked_at monotonic, DataVersion); one copy per worker process
+_memo: Dict[str, Tuple[float, DataVersion]] = {}
+
+
+def _read_version(fonte: str) -> DataVersion:
+    try:
+        row = db.session.execute(
+            text(f"SELECT versao, atualizado_em FROM {VERSION_TABLE} WHERE fonte = :fonte"),
+            {"fonte": fonte},
+        ).first()
+    except Exception as e:
+        # Table missing (ETL never ran) or DB unavailable: caches fall back to TTL only
+        db.session.rollback()
+        logger.debug("Could not read data version for %s: %s", fonte, e)
+        return UNKNOWN_VERSION
+    if not row:
+        return UNKNOWN_VERSION
+    return DataVersion(int(row[0]), row[1])
+
+
+def get_data_version(fonte: str = "gold") -> DataVersion:
+    """Return the current data version, re-reading the DB at most every few seconds."""
+    interval = current_app.config.get("DATA_VERSION_CHECK_INTERVAL", 30)
+    now = time.monotonic()
+    cached = _memo.get(fonte)
+    if cached and now - cached[0] < interval:
+        return cached[1]
+    version = _read_version(fonte)
+    _memo[fonte] = (now, version)
+    return version
+
+
+def reset_data_version_memo() -> None:
+    """Forget memoized stamps so the next call hits the database."""
+    _memo.clear()
+
+
+__all__ = ["DataVersion", "get_data_version", "reset_data_version_memo", "VERSION_TABLE"]
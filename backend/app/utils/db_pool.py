@@ -0,0 +1,145 @@
+"""Connection pool settings, instrumentation and statement timeouts.
+
+``init_db_pool`` turns the ``DB_POOL_*`` settings into
+``SQLALCHEMY_ENGINE_OPTIONS`` (applied to every bind) with an instrumented
+``QueuePool`` that counts checkouts, the checkouts that had to wait for a
+free connection, the time spent waiting, and pool timeouts.
+
+Each checkout also applies the statement timeout of the current request:
+``DB_STATEMENT_TIMEOUT_MS`` by default, or the value set with the
+``statement_timeout`` decorator for views that legitimately run long. The
+``SET`` is only sent when the connection's current value differs, so in the
+steady state it costs nothing.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from flask import current_app, g, has_app_context
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """``QueuePool`` that records how often and how long checkouts wait."""
+
+    def __init__(self, *args: Any, max_overflow: int = 10, **kwargs: Any):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        self.max_overflow = max_overflow
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def _blocks(self) -> bool:
+        # No idle connection and no room to open another: the checkout waits
+        saturated = self.max_overflow > -1 and self.overflow() >= self.max_overflow
+        return saturated and self.checkedin() == 0
+
+    def _do_get(self):
+        if not self._blocks():
+            return super()._do_get()
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.waits += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "max_overflow": self.max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "wait_seconds_total": round(self.wait_seconds, 6),
+            "wait_seconds_max": round(self.max_wait_seconds, 6),
+            "timeouts": self.timeouts,
+        }
+
+
+def _request_timeout_ms() -> int:
+    if not has_app_context():
+        return 0
+    override = g.get("statement_timeout_ms")
+    if override is not None:
+        return override
+    return int(current_app.config.get("DB_STATEMENT_TIMEOUT_MS") or 0)
+
+
+@event.listens_for(InstrumentedQueuePool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    pool = connection_proxy._pool
+    with pool._stats_lock:
+        pool.checkouts += 1
+    timeout = _request_timeout_ms()
+    if connection_record.info.get("statement_timeout_ms", 0) != timeout:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SET statement_timeout = {int(timeout)}")
+        finally:
+            cursor.close()
+        dbapi_connection.commit()
+        connection_record.info["statement_timeout_ms"] = timeout
+
+
+def statement_timeout(ms: Optional[int]) -> Callable:
+    """Run a view's queries under a different statement timeout (0 = none)."""
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g.statement_timeout_ms = int(ms or 0)
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def init_db_pool(app) -> None:
+    """Build ``SQLALCHEMY_ENGINE_OPTIONS`` from the ``DB_POOL_*`` settings (before ``db.init_app``)."""
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI") or ""
+    if not uri.startswith("postgresql"):
+        return
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": app.config["DB_POOL_SIZE"],
+        "max_overflow": app.config["DB_MAX_OVERFLOW"],
+        "pool_timeout": app.config["DB_POOL_TIMEOUT"],
+        "pool_recycle": app.config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": app.config["DB_POOL_PRE_PING"],
+    }
+    # Explicit SQLALCHEMY_ENGINE_OPTIONS entries win
+    options.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+
+def pool_stats(engines) -> Dict[str, Dict[str, Any]]:
+    """Counters of every engine's pool, keyed by bind name (``primary`` for the default)."""
+    stats = {}
+    for key, engine in engines.items():
+        pool = engine.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            stats[key or "primary"] = pool.stats()
+        else:
+            stats[key or "primary"] = {"status": pool.status()}
+    return stats
+
+
+__all__ = ["InstrumentedQueuePool", "init_db_pool", "pool_stats", "statement_timeout"]
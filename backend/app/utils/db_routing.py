@@ -0,0 +1,109 @@
+"""Read/write routing between the primary database and a read replica.
+
+With ``DATABASE_REPLICA_URL`` set, the replica is registered as the
+``replica`` bind and requests served by the blueprints listed in
+``DB_REPLICA_BLUEPRINTS`` run their reads there; flushes and INSERT/UPDATE/
+DELETE statements always go to the primary. Before routing, each worker
+checks at most every ``DB_REPLICA_CHECK_INTERVAL`` seconds that the replica
+answers and is no more than ``DB_REPLICA_MAX_LAG`` seconds behind; when it
+is not, requests fall back to the primary until the next check.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from flask import current_app, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = "replica"
+
+# Seconds the replica is behind; 0 on a primary or when replay has caught up
+# with everything received (an idle primary must not look like lag)
+_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+# One copy per worker process
+_state: Dict[str, Any] = {"checked_at": None, "usable": False, "lag": None, "error": None}
+
+
+class RoutingSession(Session):
+    """Session sending reads of replica-routed requests to the ``replica`` bind."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not getattr(clause, "is_dml", False) and _use_replica():
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _use_replica() -> bool:
+    return has_app_context() and g.get("db_replica", False)
+
+
+def _check_replica() -> None:
+    from ..extensions import db
+
+    max_lag = current_app.config.get("DB_REPLICA_MAX_LAG", 30)
+    try:
+        with db.engines[REPLICA_BIND].connect() as conn:
+            lag = float(conn.execute(_LAG_SQL).scalar() or 0)
+    except Exception as e:
+        if _state["usable"] or _state["error"] is None:
+            logger.warning("Read replica unavailable, using the primary: %s", e)
+        _state.update(usable=False, lag=None, error=str(e))
+        return
+    usable = lag <= max_lag
+    if usable != _state["usable"]:
+        logger.warning("Read replica %s (lag %.1fs)", "in use" if usable else "lagging, using the primary", lag)
+    _state.update(usable=usable, lag=lag, error=None)
+
+
+def replica_available() -> bool:
+    """Whether the replica answered and was within the lag limit at the last check."""
+    interval = current_app.config.get("DB_REPLICA_CHECK_INTERVAL", 10)
+    now = time.monotonic()
+    if _state["checked_at"] is None or now - _state["checked_at"] >= interval:
+        _state["checked_at"] = now
+        _check_replica()
+    return _state["usable"]
+
+
+def replica_status() -> Optional[dict]:
+    """Last replica check of this worker (None when no replica is configured)."""
+    if not current_app.config.get("DATABASE_REPLICA_URL"):
+        return None
+    return {"usable": _state["usable"], "lag_seconds": _state["lag"], "error": _state["error"]}
+
+
+def _route_request() -> None:
+    if request.blueprint in current_app.config["DB_REPLICA_BLUEPRINTS"] and replica_available():
+        g.db_replica = True
+
+
+def init_db_routing(app) -> None:
+    """Register the replica bind and the per-request routing (before ``db.init_app``)."""
+    url = app.config.get("DATABASE_REPLICA_URL")
+    if not url:
+        return
+    binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+    binds[REPLICA_BIND] = url
+    app.config["SQLALCHEMY_BINDS"] = binds
+    blueprints = app.config.get("DB_REPLICA_BLUEPRINTS") or ""
+    if isinstance(blueprints, str):
+        blueprints = {name.strip() for name in blueprints.split(",") if name.strip()}
+    app.config["DB_REPLICA_BLUEPRINTS"] = frozenset(blueprints)
+    app.before_request(_route_request)
+
+
+__all__ = ["REPLICA_BIND", "RoutingSession", "init_db_routing", "replica_available", "replica_status"]
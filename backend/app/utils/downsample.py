@@ -0,0 +1,61 @@
+"""Point selection for downsampling long time series before they are sent.
+
+Both functions return sorted indices into the input, so every column of the
+selected rows can be taken at once and the points stay real observations.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: ``threshold`` points that keep the visual shape.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    selected point and the mean of the next bucket. ``x`` must be ascending.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, threshold: int) -> np.ndarray:
+    """Minimum and maximum of ``threshold // 2`` equal-count buckets (peaks are never lost)."""
+    n = len(y)
+    if threshold >= n:
+        return np.arange(n)
+    buckets = max(1, threshold // 2)
+    bucket = (np.arange(n) * buckets) // n
+    order = np.lexsort((y, bucket))  # by bucket, then by value
+    starts = np.searchsorted(bucket[order], np.arange(buckets))
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate([order[starts], order[ends]]))
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, threshold: int, method: str = "lttb") -> np.ndarray:
+    """Indices of the rows to keep; rows where ``y`` is missing are never selected."""
+    valid = np.flatnonzero(~np.isnan(y))
+    if method == "minmax":
+        picked = minmax_indices(y[valid], threshold)
+    else:
+        picked = lttb_indices(x[valid], y[valid], threshold)
+    return valid[picked]
+
+
+__all__ = ["DOWNSAMPLE_METHODS", "downsample_indices", "lttb_indices", "minmax_indices"]
@@ -0,0 +1,147 @@
+"""Prometheus metrics: per-route request latency, status, size and DB usage.
+
+``init_metrics`` installs request hooks and SQLAlchemy cursor events that
+record, per route template (``/api/gold/<int:cidade_id>/serie``, not the
+raw path, to keep label cardinality bounded):
+
+* ``http_request_duration_seconds`` histogram (method, route, status)
+* ``http_requests_total`` counter (method, route, status)
+* ``http_response_size_bytes`` histogram (route; streamed bodies are skipped)
+* ``http_request_db_queries`` and ``http_request_db_seconds`` histograms (route)
+* ``db_pool_checked_out`` gauge (bind), summed over live workers
+
+and serves them as ``GET /metrics``. Under gunicorn, set
+``PROMETHEUS_MULTIPROC_DIR`` to an empty writable directory (the gunicorn
+config defaults it to ``/tmp/prometheus``, clears it on start and marks
+exited workers dead) so every worker
+writes its samples there and ``/metrics`` aggregates all of them, whichever
+worker answers. Without ``prometheus_client`` installed nothing is recorded
+and ``/metrics`` answers 503.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+
+from flask import Response, g, has_app_context, request
+from sqlalchemy import event
+
+from ..extensions import db
+
+logger = logging.getLogger(__name__)
+
+# prometheus_client picks multiprocess values at import time and writes a file
+# per labelled child, so the directory must exist before it is imported
+_multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if _multiproc_dir:
+    try:
+        os.makedirs(_multiproc_dir, exist_ok=True)
+    except OSError as e:
+        logger.warning("Cannot create PROMETHEUS_MULTIPROC_DIR %s (%s); metrics cover this process only", _multiproc_dir, e)
+        os.environ.pop("PROMETHEUS_MULTIPROC_DIR")
+
+try:  # optional, only needed for /metrics
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - depends on environment
+    prometheus_client = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        "http_request_duration_seconds",
+        "Time spent handling the request",
+        ("method", "route", "status"),
+        buckets=LATENCY_BUCKETS,
+    )
+    REQUESTS = prometheus_client.Counter(
+        "http_requests_total", "Requests handled", ("method", "route", "status")
+    )
+    RESPONSE_SIZE = prometheus_client.Histogram(
+        "http_response_size_bytes", "Response body size", ("route",), buckets=SIZE_BUCKETS
+    )
+    REQUEST_DB_QUERIES = prometheus_client.Histogram(
+        "http_request_db_queries", "SQL statements executed per request", ("route",), buckets=QUERY_COUNT_BUCKETS
+    )
+    REQUEST_DB_SECONDS = prometheus_client.Histogram(
+        "http_request_db_seconds", "Time spent in SQL statements per request", ("route",), buckets=LATENCY_BUCKETS
+    )
+    POOL_CHECKED_OUT = prometheus_client.Gauge(
+        "db_pool_checked_out", "Connections checked out of the pool", ("bind",), multiprocess_mode="livesum"
+    )
+
+
+def _route() -> str:
+    rule = request.url_rule
+    return rule.rule if rule is not None else "<unmatched>"
+
+
+def _before_request() -> None:
+    g.metrics_start = time.perf_counter()
+    g.db_queries = 0
+    g.db_seconds = 0.0
+
+
+def _after_request(response):
+    start = g.get("metrics_start")
+    if start is None:
+        return response
+    route = _route()
+    status = str(response.status_code)
+    REQUEST_LATENCY.labels(request.method, route, status).observe(time.perf_counter() - start)
+    REQUESTS.labels(request.method, route, status).inc()
+    if not response.is_streamed:
+        RESPONSE_SIZE.labels(route).observe(response.calculate_content_length() or 0)
+    REQUEST_DB_QUERIES.labels(route).observe(g.get("db_queries", 0))
+    REQUEST_DB_SECONDS.labels(route).observe(g.get("db_seconds", 0.0))
+    return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info.pop("query_start", time.perf_counter())
+    if has_app_context() and "db_queries" in g:
+        g.db_queries += 1
+        g.db_seconds += elapsed
+
+
+def _track_pool(engine, bind: str) -> None:
+    gauge = POOL_CHECKED_OUT.labels(bind)
+    event.listen(engine.pool, "checkout", lambda *args: gauge.inc())
+    event.listen(engine.pool, "checkin", lambda *args: gauge.dec())
+
+
+def metrics_view():
+    if prometheus_client is None:
+        return Response("prometheus_client is not installed\n", status=503, mimetype="text/plain")
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(prometheus_client.generate_latest(registry), mimetype=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app) -> None:
+    """Record request/DB metrics and serve ``/metrics`` (after ``db.init_app``)."""
+    app.add_url_rule("/metrics", "metrics", metrics_view)
+    if prometheus_client is None:
+        logger.info("prometheus_client not installed; /metrics disabled")
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            _track_pool(engine, bind or "primary")
+
+
+__all__ = ["init_metrics", "metrics_view"]
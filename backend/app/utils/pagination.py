@@ -1,9 +1,19 @@
-"""Pagination helpers for SQLAlchemy queries."""
+"""Pagination helpers for SQLAlchemy queries.
+
+``paginate_query`` is page/offset based (it runs OFFSET plus a COUNT).
+``keyset_page`` continues after the sort key of the last row instead, so a
+deep page costs the same as the first one; the position travels as an opaque
+cursor (base64 of the key values).
+"""
 from __future__ import annotations
 
-from typing import Any, Dict
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from flask import request
+from flask import request, url_for
+from sqlalchemy import tuple_
 
 
 def paginate_query(query, default_page: int = 1, default_per_page: int = 20) -> Dict[str, Any]:
@@ -22,3 +32,71 @@ def paginate_query(query, default_page: int = 1, default_per_page: int = 20) ->
         "total": pagination.total,
         "pages": pagination.pages,
     }
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    plain = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(plain, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _restore(column, value: Any) -> Any:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return value
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> List[Any]:
+    """Key values stored in ``cursor``; ValueError if it is not one of ours."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError
+        return [_restore(column, value) for column, value in zip(keys, values)]
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+
+
+def keyset_page(
+    query,
+    keys: Sequence,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Tuple[list, Optional[str]]:
+    """One page of ``query`` ordered by ``keys`` and the cursor of the next page.
+
+    ``keys`` must be unique per row (end them with the primary key when the
+    leading columns can repeat, or rows sharing a key at a page boundary are
+    skipped) and selected by the query (under the same names). The next
+    cursor is None on the last page. ValueError if ``limit`` is below 1.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    if cursor:
+        after = decode_cursor(cursor, keys)
+        row_key = tuple_(*keys)
+        query = query.filter(row_key < tuple_(*after) if descending else row_key > tuple_(*after))
+    query = query.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]._mapping
+    return rows, encode_cursor([last[key.key] for key in keys])
+
+
+def cursor_headers(next_cursor: Optional[str]) -> Dict[str, str]:
+    """``X-Next-Cursor`` and ``Link: rel="next"`` headers for list responses."""
+    if not next_cursor:
+        return {}
+    args = {**request.view_args, **request.args.to_dict(), "cursor": next_cursor}
+    link = url_for(request.endpoint, **args)
+    return {"X-Next-Cursor": next_cursor, "Link": f'<{link}>; rel="next"'}
@@ -0,0 +1,112 @@
+"""Fast JSON encoding and row-to-dict helpers for large responses.
+
+``OrjsonProvider`` replaces Flask's JSON provider when ``orjson`` is
+installed, so ``jsonify`` (and therefore ``success``) encodes in C. It keeps
+Flask's conventions for types orjson would format differently (dates as HTTP
+dates, ``Decimal`` as strings); endpoints that want ISO dates convert them
+while building rows, as ``row_dicts`` does.
+
+Time-series endpoints can also answer in column form (``?format=columnar``,
+one array per field) or as an Arrow IPC stream (``?format=arrow``, needs
+``pyarrow``).
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Sequence
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider, _default
+
+try:  # optional, much faster encoder
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+try:  # optional, only for ?format=arrow
+    import pyarrow
+except ImportError:  # pragma: no cover - depends on environment
+    pyarrow = None
+
+RESPONSE_FORMATS = ("rows", "columnar", "arrow")
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (stdlib json for the rest)."""
+
+    def _options(self, indent: bool = False) -> int:
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Templates (tojson) and callers may pass stdlib-only options
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options()).decode()
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=_default, option=self._options(indent)) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json(app) -> None:
+    """Use the orjson provider when orjson is installed."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def row_dicts(rows: Iterable) -> List[dict]:
+    """Plain dicts from SQLAlchemy result rows, with dates as ISO strings."""
+    return [{k: _plain(v) for k, v in row._mapping.items()} for row in rows]
+
+
+def row_columns(rows: Sequence, keys: Sequence[str], iso_dates: bool = True) -> Dict[str, list]:
+    """One list per column from result rows (selected in ``keys`` order)."""
+    columns = zip(*rows) if rows else [()] * len(keys)
+    if iso_dates:
+        return {key: [_plain(v) for v in column] for key, column in zip(keys, columns)}
+    return {key: list(column) for key, column in zip(keys, columns)}
+
+
+def response_format(value: str | None) -> str:
+    """Validate a ``format`` query argument (default ``rows``)."""
+    fmt = (value or "rows").lower()
+    if fmt not in RESPONSE_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(RESPONSE_FORMATS)}")
+    if fmt == "arrow" and pyarrow is None:
+        raise ValueError("format=arrow is not available on this server (pyarrow not installed)")
+    return fmt
+
+
+def arrow_response(columns: Dict[str, Any]):
+    """Columns as an Arrow IPC stream response."""
+    table = pyarrow.table(columns)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return current_app.response_class(sink.getvalue().to_pybytes(), mimetype=ARROW_MIMETYPE)
+
+
+__all__ = [
+    "ARROW_MIMETYPE",
+    "OrjsonProvider",
+    "RESPONSE_FORMATS",
+    "arrow_response",
+    "init_json",
+    "response_format",
+    "row_columns",
+    "row_dicts",
+]
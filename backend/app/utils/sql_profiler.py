@@ -0,0 +1,241 @@
+"""Development SQL profiler: per-request query counts, repeats and plans.
+
+Enabled with ``SQL_PROFILER_ENABLED`` (default: on when ``DEBUG`` is).
+SQLAlchemy ``before_cursor_execute``/``after_cursor_execute`` events record
+every statement of a request; when the request ends the profile is logged,
+summarised in ``X-SQL-Queries``/``X-SQL-Time-Ms`` response headers and
+merged into the JSON report at ``SQL_PROFILER_REPORT`` (per route: request
+count, query counts, DB time, flags, and the latest flagged request). Each
+process keeps its own totals; ``{pid}`` in the path (the default) gives every
+worker its own file, so only set a fixed path with a single process.
+
+Flags raised for a request:
+
+* ``many_queries``: more than ``SQL_PROFILER_MAX_QUERIES`` statements
+  (sequential round trips that one query could serve)
+* ``repeated_statement``: the same SQL run several times with different
+  parameters (the N+1 pattern)
+* ``identical_statement``: the same SQL with the same parameters run again
+* ``full_scan``: with ``X-SQL-Explain: 1`` every read-only SELECT is re-run
+  under ``EXPLAIN (ANALYZE, FORMAT JSON)``, always rolled back (statements
+  that modify data or call ``nextval`` are not re-run), and sequential scans
+  reading at least ``SQL_PROFILER_SCAN_ROWS`` rows are reported (noting when
+  they feed a window function); the plans are kept in the report
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from ..extensions import db
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_HEADER = "X-SQL-Explain"
+
+_report_lock = threading.Lock()
+_report: Dict[str, Any] = {"routes": {}}
+
+
+def _normalize(statement: str) -> str:
+    return re.sub(r"\s+", " ", statement).strip()
+
+
+_WRITES = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|NEXTVAL|SETVAL)\b", re.IGNORECASE)
+
+
+def _explainable(statement: str) -> bool:
+    # ANALYZE executes the statement: only plain reads are re-run (data-modifying
+    # CTEs and sequence calls would have effects a rollback does not fully undo)
+    words = statement.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() in {"SELECT", "WITH"} and not _WRITES.search(statement)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if has_request_context() and "sql_profile" in g:
+        conn.info["profiler_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    start = conn.info.pop("profiler_start", None)
+    if start is None or not has_request_context() or "sql_profile" not in g:
+        return
+    entry = {
+        "sql": _normalize(statement),
+        "params": repr(parameters)[:300],
+        "ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+    # Server-side (named) cursors stream their rows; re-running them would not help
+    if g.get("sql_explain") and not executemany and not getattr(cursor, "name", None) and _explainable(statement):
+        entry["plan"] = _explain(conn, statement, parameters)
+    g.sql_profile.append(entry)
+
+
+def _handle_error(context) -> None:
+    # Failed statements never reach after_cursor_execute
+    conn = context.connection
+    start = conn.info.pop("profiler_start", None) if conn is not None else None
+    if start is None or not has_request_context() or "sql_profile" not in g or context.statement is None:
+        return
+    g.sql_profile.append({
+        "sql": _normalize(context.statement),
+        "params": repr(context.parameters)[:300],
+        "ms": round((time.perf_counter() - start) * 1000, 3),
+        "error": str(context.original_exception).strip(),
+    })
+
+
+def _explain(conn, statement: str, parameters) -> Any:
+    dbapi_connection = conn.connection.dbapi_connection
+    # Whatever the re-run did (or a failure) is always undone: a savepoint
+    # inside the request's transaction, or a transaction of its own
+    autocommit = getattr(dbapi_connection, "autocommit", False)
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("BEGIN" if autocommit else "SAVEPOINT sql_profiler_explain")
+        try:
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters)
+            plan = cursor.fetchone()[0]
+            return plan[0] if isinstance(plan, list) else json.loads(plan)[0]
+        except Exception as e:
+            return {"error": str(e)}
+        finally:
+            if autocommit:
+                cursor.execute("ROLLBACK")
+            else:
+                cursor.execute("ROLLBACK TO SAVEPOINT sql_profiler_explain")
+                cursor.execute("RELEASE SAVEPOINT sql_profiler_explain")
+    finally:
+        cursor.close()
+
+
+def _full_scans(plan: dict, min_rows: int) -> List[dict]:
+    scans = []
+
+    def walk(node: dict, under_window: bool) -> None:
+        under_window = under_window or node.get("Node Type") == "WindowAgg"
+        if node.get("Node Type") == "Seq Scan":
+            rows = (node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)) * node.get("Actual Loops", 1)
+            if rows >= min_rows:
+                scans.append({"relation": node.get("Relation Name"), "rows": rows, "under_window": under_window})
+        for child in node.get("Plans", ()):
+            walk(child, under_window)
+
+    if "Plan" in plan:
+        walk(plan["Plan"], False)
+    return scans
+
+
+def analyze(queries: List[dict], max_queries: int, scan_rows: int) -> Dict[str, Any]:
+    """Flags and totals of one request's statements."""
+    by_sql = Counter(q["sql"] for q in queries)
+    by_call = Counter((q["sql"], q["params"]) for q in queries)
+    flags: Dict[str, Any] = {}
+    if len(queries) > max_queries:
+        flags["many_queries"] = len(queries)
+    repeated = {sql: n for sql, n in by_sql.items() if n > 1}
+    if repeated:
+        flags["repeated_statement"] = [{"sql": sql, "count": n} for sql, n in repeated.items()]
+    identical = [{"sql": sql, "params": params, "count": n} for (sql, params), n in by_call.items() if n > 1]
+    if identical:
+        flags["identical_statement"] = identical
+    scans = [
+        {"sql": q["sql"], **scan} for q in queries if isinstance(q.get("plan"), dict) for scan in _full_scans(q["plan"], scan_rows)
+    ]
+    if scans:
+        flags["full_scan"] = scans
+    return {
+        "queries": len(queries),
+        "db_ms": round(sum(q["ms"] for q in queries), 3),
+        "flags": flags,
+    }
+
+
+def _before_request() -> None:
+    g.sql_profile = []
+    g.sql_explain = request.headers.get(EXPLAIN_HEADER, "").lower() in {"1", "true", "yes", "on"}
+
+
+def _after_request(response):
+    queries = g.pop("sql_profile", None)
+    if queries is None:
+        return response
+    config = current_app.config
+    summary = analyze(queries, config.get("SQL_PROFILER_MAX_QUERIES", 2), config.get("SQL_PROFILER_SCAN_ROWS", 1000))
+    response.headers["X-SQL-Queries"] = str(summary["queries"])
+    response.headers["X-SQL-Time-Ms"] = f"{summary['db_ms']:.1f}"
+    route = f"{request.method} {request.url_rule.rule if request.url_rule else '<unmatched>'}"
+    if summary["flags"]:
+        logger.warning(
+            "SQL profile %s %s: %d queries, %.1f ms, flags: %s",
+            request.method, request.full_path, summary["queries"], summary["db_ms"], ", ".join(summary["flags"]),
+        )
+    else:
+        logger.debug("SQL profile %s: %d queries, %.1f ms", request.full_path, summary["queries"], summary["db_ms"])
+    _record(route, request.full_path, summary, queries, config.get("SQL_PROFILER_REPORT"))
+    return response
+
+
+def _record(route: str, path: str, summary: dict, queries: List[dict], report_path: Optional[str]) -> None:
+    with _report_lock:
+        stats = _report["routes"].setdefault(
+            route, {"requests": 0, "queries_total": 0, "queries_max": 0, "db_ms_total": 0.0, "db_ms_max": 0.0, "flags": {}}
+        )
+        stats["requests"] += 1
+        stats["queries_total"] += summary["queries"]
+        stats["queries_max"] = max(stats["queries_max"], summary["queries"])
+        stats["db_ms_total"] = round(stats["db_ms_total"] + summary["db_ms"], 3)
+        stats["db_ms_max"] = max(stats["db_ms_max"], summary["db_ms"])
+        for flag in summary["flags"]:
+            stats["flags"][flag] = stats["flags"].get(flag, 0) + 1
+        if summary["flags"] or "sample" not in stats or any("plan" in q for q in queries):
+            stats["sample"] = {"path": path, **summary, "statements": queries}
+        _report["generated_at"] = datetime.now(timezone.utc).isoformat()
+        if report_path:
+            _write_report(report_path)
+
+
+def _write_report(path: str) -> None:
+    path = path.replace("{pid}", str(os.getpid()))
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_report, f, indent=2, default=str)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("Could not write SQL profile report %s: %s", path, e)
+
+
+def profiler_report() -> Dict[str, Any]:
+    """The aggregated report of this process."""
+    with _report_lock:
+        return json.loads(json.dumps(_report, default=str))
+
+
+def init_sql_profiler(app) -> None:
+    """Profile every request's SQL when ``SQL_PROFILER_ENABLED`` (after ``db.init_app``)."""
+    if not app.config.get("SQL_PROFILER_ENABLED"):
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(engine, "handle_error", _handle_error)
+    report = (app.config.get("SQL_PROFILER_REPORT") or "").replace("{pid}", str(os.getpid()))
+    logger.warning("SQL profiler enabled; report at %s", report or "(none)")
+
+
+__all__ = ["EXPLAIN_HEADER", "analyze", "init_sql_profiler", "profiler_report"]
@@ -0,0 +1,46 @@
+"""Gunicorn settings: ``gunicorn -c gunicorn.conf.py run_wsgi:app``.
+
+Every setting can be overridden from the environment. With
+``GUNICORN_WORKER_CLASS=gevent`` each worker serves up to
+``GUNICORN_WORKER_CONNECTIONS`` requests concurrently as greenlets, and
+psycopg2 is made cooperative (psycogreen) so a slow query only parks its
+own greenlet instead of the whole worker. The default remains the sync
+worker (one request per worker at a time).
+"""
+import os
+import shutil
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "3"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "100"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "2"))
+
+# Shared directory for per-worker Prometheus samples (see app.utils.metrics);
+# set here rather than image-wide so CLI commands and scripts stay single-process
+prometheus_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus")
+
+
+def on_starting(server):
+    # Samples of a previous run would be aggregated with the new ones
+    if prometheus_dir:
+        shutil.rmtree(prometheus_dir, ignore_errors=True)
+        os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if prometheus_dir:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    # Runs in the worker before the app is loaded, so every connection the
+    # app opens already yields to the gevent hub while waiting on PostgreSQL
+    if worker_class == "gevent":
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
+        server.log.info("Worker %s: psycopg2 patched for gevent", worker.pid)
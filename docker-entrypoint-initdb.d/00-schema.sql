@@ -31,9 +31,20 @@ CREATE TABLE IF NOT EXISTS dim_estacao (
     altitude_m      NUMERIC(8,2),
     data_fundacao   DATE,
     id_cidade       INTEGER REFERENCES dim_cidade_pe(id_cidade),
+    codigo_ibge     INTEGER,                 -- município que contém a estação (point-in-polygon)
     UNIQUE (codigo_estacao)
 );
 
+-- Grafo kNN entre estações (distância haversine; reconstruído quando as estações mudam)
+CREATE TABLE IF NOT EXISTS dim_estacao_vizinhos (
+    id_estacao      INTEGER  NOT NULL REFERENCES dim_estacao(id_estacao) ON DELETE CASCADE,
+    id_vizinho      INTEGER  NOT NULL REFERENCES dim_estacao(id_estacao) ON DELETE CASCADE,
+    ordem           SMALLINT NOT NULL,          -- 1 = vizinho mais próximo
+    distancia_km    NUMERIC(8,3) NOT NULL,
+    peso            NUMERIC(8,6) NOT NULL,      -- inverso da distância², soma 1 por estação
+    PRIMARY KEY (id_estacao, id_vizinho)
+);
+
 -- ============================================================================
 -- BRONZE: DADOS CLIMÁTICOS HORÁRIOS (TIPADOS, LIMPOS O SUFICIENTE)
 -- ============================================================================
@@ -111,6 +122,45 @@ CREATE INDEX IF NOT EXISTS idx_gold_diario_cidade_data
 CREATE INDEX IF NOT EXISTS idx_gold_diario_risco
     ON gold_clima_pe_diario (risco_calor, data);
 
+-- ============================================================================
+-- GOLD: ESTIMATIVAS INTERPOLADAS (municípios sem estação; IDW ou krigagem)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS gold_clima_pe_interpolado (
+    id_cidade               INTEGER NOT NULL REFERENCES dim_cidade_pe(id_cidade),
+    data                    DATE NOT NULL,
+
+    temp_media              NUMERIC(5,2),
+    temp_max                NUMERIC(5,2),
+    temp_min                NUMERIC(5,2),
+    umidade_media           NUMERIC(5,2),
+    precipitacao_total      NUMERIC(10,2),
+    radiacao_total          NUMERIC(12,2),
+    amplitude_termica       NUMERIC(5,2),
+    aparente_media          NUMERIC(5,2),
+    heat_index_max          NUMERIC(5,2),
+    rolling_heat_7d         NUMERIC(5,2),
+    risco_calor             VARCHAR(20),
+
+    metodo                  VARCHAR(10) NOT NULL,   -- idw | kriging
+    n_vizinhos              SMALLINT,               -- estações usadas na estimativa
+    distancia_min_km        NUMERIC(7,2),           -- distância à estação mais próxima
+
+    criado_em               TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (id_cidade, data)
+);
+
+-- ============================================================================
+-- CONTROLE: VERSÃO DOS DADOS (incrementada pelo ETL, invalida caches da API)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS etl_data_version (
+    fonte           VARCHAR(40) PRIMARY KEY,   -- ex: 'gold'
+    versao          BIGINT      NOT NULL DEFAULT 1,
+    atualizado_em   TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- ============================================================================
 -- GOLD: MÉTRICAS DIÁRIAS POR CIDADE (tabela legada, anterior)
 -- ============================================================================
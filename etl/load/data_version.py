@@ -0,0 +1,51 @@
+"""
+Data-version stamps for loaded datasets.
+
+Each successful load bumps a monotonically increasing counter in
+etl_data_version. The API reads this counter to invalidate its caches, so a
+new stamp is all it takes for workers to stop serving stale GOLD data.
+"""
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from etl.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+VERSION_TABLE = "etl_data_version"
+
+_CREATE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (
+    fonte           VARCHAR(40) PRIMARY KEY,
+    versao          BIGINT      NOT NULL DEFAULT 1,
+    atualizado_em   TIMESTAMPTZ NOT NULL DEFAULT NOW()
+)
+"""
+
+_BUMP_SQL = f"""
+INSERT INTO {VERSION_TABLE} (fonte, versao, atualizado_em)
+VALUES (:fonte, 1, NOW())
+ON CONFLICT (fonte)
+DO UPDATE SET
+    versao = {VERSION_TABLE}.versao + 1,
+    atualizado_em = NOW()
+RETURNING versao
+"""
+
+
+def bump_data_version(conn: Connection, fonte: str) -> int:
+    """
+    Increment the data-version stamp for ``fonte`` and return the new value.
+
+    Runs inside the caller's transaction so the stamp only becomes visible
+    together with the data it describes.
+    """
+    conn.execute(text(_CREATE_SQL))
+    version = conn.execute(text(_BUMP_SQL), {"fonte": fonte}).scalar_one()
+    logger.info("Bumped data version for '%s' to %s", fonte, version)
+    return int(version)
+
+
+__all__ = ["bump_data_version", "VERSION_TABLE"]
@@ -0,0 +1,56 @@
+"""
+Keep dim_cidade_pe in sync with the IBGE municipality mesh.
+
+Rows are keyed by codigo_ibge; municipalities missing from the dimension are
+inserted with the mesh name and centroid so GOLD tables can reference them.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from etl.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_UPSERT_SQL = text("""
+    INSERT INTO dim_cidade_pe (nome_cidade, uf, codigo_ibge, latitude, longitude)
+    VALUES (:nome_cidade, 'PE', :codigo_ibge, :latitude, :longitude)
+    ON CONFLICT (nome_cidade, uf) DO UPDATE
+    SET codigo_ibge = EXCLUDED.codigo_ibge,
+        latitude = COALESCE(dim_cidade_pe.latitude, EXCLUDED.latitude),
+        longitude = COALESCE(dim_cidade_pe.longitude, EXCLUDED.longitude)
+""")
+
+
+def get_city_ids(conn: Connection) -> Dict[int, int]:
+    """Map codigo_ibge -> id_cidade for every city with an IBGE code."""
+    result = conn.execute(text("SELECT codigo_ibge, id_cidade FROM dim_cidade_pe WHERE codigo_ibge IS NOT NULL"))
+    return {int(row[0]): int(row[1]) for row in result}
+
+
+def upsert_cities(
+    conn: Connection,
+    cities: Iterable[Tuple[int, str, Optional[float], Optional[float]]],
+) -> Dict[int, int]:
+    """
+    Ensure each (codigo_ibge, nome, latitude, longitude) exists in dim_cidade_pe.
+
+    Returns codigo_ibge -> id_cidade for all cities with an IBGE code.
+    """
+    known = get_city_ids(conn)
+    missing = [
+        {"codigo_ibge": int(code), "nome_cidade": nome, "latitude": lat, "longitude": lon}
+        for code, nome, lat, lon in cities
+        if int(code) not in known
+    ]
+    if not missing:
+        return known
+    conn.execute(_UPSERT_SQL, missing)
+    logger.info("Inserted %d municipalities into dim_cidade_pe", len(missing))
+    return get_city_ids(conn)
+
+
+__all__ = ["get_city_ids", "upsert_cities"]
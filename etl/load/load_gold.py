@@ -12,6 +12,7 @@ import pandas as pd
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 
+from etl.load.data_version import bump_data_version
 from etl.utils.constants import DATABASE_URL
 from etl.utils.logger import get_logger
 
@@ -19,6 +20,37 @@ logger = get_logger(__name__)
 
 TARGET_TABLE = "gold_clima_pe_diario"
 TARGET_SCHEMA = "public"
+INTERPOLATED_TABLE = "gold_clima_pe_interpolado"
+
+INTERPOLATED_COLUMNS = [
+    "id_cidade", "data", "temp_media", "temp_max", "temp_min", "umidade_media",
+    "precipitacao_total", "radiacao_total", "amplitude_termica", "aparente_media",
+    "heat_index_max", "rolling_heat_7d", "risco_calor", "metodo", "n_vizinhos",
+    "distancia_min_km",
+]
+
+_CREATE_INTERPOLATED_SQL = f"""
+CREATE TABLE IF NOT EXISTS {TARGET_SCHEMA}.{INTERPOLATED_TABLE} (
+    id_cidade               INTEGER NOT NULL REFERENCES dim_cidade_pe(id_cidade),
+    data                    DATE NOT NULL,
+    temp_media              NUMERIC(5,2),
+    temp_max                NUMERIC(5,2),
+    temp_min                NUMERIC(5,2),
+    umidade_media           NUMERIC(5,2),
+    precipitacao_total      NUMERIC(10,2),
+    radiacao_total          NUMERIC(12,2),
+    amplitude_termica       NUMERIC(5,2),
+    aparente_media          NUMERIC(5,2),
+    heat_index_max          NUMERIC(5,2),
+    rolling_heat_7d         NUMERIC(5,2),
+    risco_calor             VARCHAR(20),
+    metodo                  VARCHAR(10) NOT NULL,
+    n_vizinhos              SMALLINT,
+    distancia_min_km        NUMERIC(7,2),
+    criado_em               TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id_cidade, data)
+)
+"""
 
 
 def _get_engine(database_url: Optional[str] = None) -> Engine:
@@ -152,10 +184,54 @@ def load_gold(df_gold: pd.DataFrame, engine: Optional[Engine] = None) -> None:
             
             if total_inserted < len(df_gold):
                 logger.warning("Failed to insert %d records", len(df_gold) - total_inserted)
+
+            if total_inserted:
+                # Signal API workers that cached GOLD responses are stale
+                bump_data_version(conn, "gold")
         
         except Exception:
             logger.exception("Failed to load GOLD data")
             raise
 
 
-__all__ = ["load_gold", "TARGET_TABLE", "TARGET_SCHEMA"]
+def load_gold_interpolated(df_interp: pd.DataFrame, engine: Optional[Engine] = None) -> int:
+    """
+    Replace interpolated GOLD estimates for the cities/days in ``df_interp``.
+
+    Rows come from etl.transform.interpolate_gold.interpolate_daily. Loading
+    is an executemany UPSERT in batches (the frame is fully numeric, so no
+    per-row isolation is needed). Returns the number of rows written.
+    """
+    if df_interp.empty:
+        logger.warning("No interpolated GOLD data to load")
+        return 0
+
+    eng = engine or _get_engine()
+    df = df_interp[INTERPOLATED_COLUMNS].copy()
+    df["id_cidade"] = df["id_cidade"].astype(int)
+    df["n_vizinhos"] = df["n_vizinhos"].astype(int)
+    df["data"] = pd.to_datetime(df["data"]).dt.date
+    records = df.astype(object).where(pd.notna(df), None).to_dict("records")
+
+    columns = ", ".join(INTERPOLATED_COLUMNS)
+    values = ", ".join(f":{c}" for c in INTERPOLATED_COLUMNS)
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in INTERPOLATED_COLUMNS[2:])
+    upsert_sql = text(f"""
+        INSERT INTO {TARGET_SCHEMA}.{INTERPOLATED_TABLE} ({columns})
+        VALUES ({values})
+        ON CONFLICT (id_cidade, data) DO UPDATE SET {updates}, criado_em = NOW()
+    """)
+
+    batch_size = 5000
+    with eng.begin() as conn:
+        conn.execute(text(_CREATE_INTERPOLATED_SQL))
+        for i in range(0, len(records), batch_size):
+            conn.execute(upsert_sql, records[i : i + batch_size])
+        # Map/tiles read interpolated rows too
+        bump_data_version(conn, "gold")
+
+    logger.info("Loaded %d interpolated GOLD records into %s.%s", len(records), TARGET_SCHEMA, INTERPOLATED_TABLE)
+    return len(records)
+
+
+__all__ = ["load_gold", "load_gold_interpolated", "TARGET_TABLE", "TARGET_SCHEMA", "INTERPOLATED_TABLE"]
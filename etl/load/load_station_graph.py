@@ -0,0 +1,122 @@
+"""
+Persist the station kNN graph to disk (.npz) and to dim_estacao_vizinhos.
+
+The graph only depends on the stations' codes and coordinates and on k, so
+it is rebuilt only when their fingerprint or k changes (or when the table
+copy is missing); every other run is a cheap no-op.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from etl.load.data_version import bump_data_version
+from etl.transform.station_graph import (
+    DEFAULT_GRAPH_NEIGHBORS,
+    build_neighbor_graph,
+    load_graph,
+    save_graph,
+    station_fingerprint,
+)
+from etl.utils.constants import DATABASE_URL, STATION_GRAPH_PATH
+from etl.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+GRAPH_TABLE = "dim_estacao_vizinhos"
+
+_CREATE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {GRAPH_TABLE} (
+    id_estacao      INTEGER  NOT NULL REFERENCES dim_estacao(id_estacao) ON DELETE CASCADE,
+    id_vizinho      INTEGER  NOT NULL REFERENCES dim_estacao(id_estacao) ON DELETE CASCADE,
+    ordem           SMALLINT NOT NULL,
+    distancia_km    NUMERIC(8,3) NOT NULL,
+    peso            NUMERIC(8,6) NOT NULL,
+    PRIMARY KEY (id_estacao, id_vizinho)
+)
+"""
+
+
+def _get_engine(database_url: Optional[str] = None) -> Engine:
+    url = database_url or DATABASE_URL
+    if not url:
+        raise ValueError("DATABASE_URL is not set")
+    return create_engine(url)
+
+
+def _read_stations(engine: Engine) -> pd.DataFrame:
+    return pd.read_sql(
+        """
+        SELECT id_estacao, codigo_estacao, latitude::float AS latitude, longitude::float AS longitude
+        FROM dim_estacao
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        ORDER BY id_estacao
+        """,
+        engine,
+    )
+
+
+def refresh_station_graph(
+    engine: Optional[Engine] = None,
+    path: Optional[Path] = None,
+    k: int = DEFAULT_GRAPH_NEIGHBORS,
+    force: bool = False,
+) -> bool:
+    """
+    Rebuild the neighbor graph if stations or ``k`` changed. Returns True when rebuilt.
+    """
+    eng = engine or _get_engine()
+    path = path or STATION_GRAPH_PATH
+    stations = _read_stations(eng)
+    if stations.empty:
+        logger.warning("No stations with coordinates; neighbor graph not built")
+        return False
+
+    fingerprint = station_fingerprint(stations["codigo_estacao"], stations["latitude"], stations["longitude"])
+    current = load_graph(path)
+    with eng.begin() as conn:
+        conn.execute(text(_CREATE_SQL))
+        stored_edges = conn.execute(text(f"SELECT COUNT(*) FROM {GRAPH_TABLE}")).scalar_one()
+
+    if (
+        not force
+        and current is not None
+        and current.fingerprint == fingerprint
+        and current.k == k
+        and len(current.indptr) - 1 == len(stations)
+        and stored_edges == len(current.indices)
+    ):
+        logger.info("Station neighbor graph is up to date (%s stations)", len(stations))
+        return False
+
+    graph = build_neighbor_graph(
+        stations["id_estacao"], stations["codigo_estacao"], stations["latitude"], stations["longitude"], k=k
+    )
+    save_graph(graph, path)
+
+    edges = [
+        {"id_estacao": a, "id_vizinho": b, "ordem": order, "distancia_km": round(dist, 3), "peso": round(weight, 6)}
+        for a, b, order, dist, weight in graph.edges()
+    ]
+    with eng.begin() as conn:
+        conn.execute(text(f"DELETE FROM {GRAPH_TABLE}"))
+        if edges:
+            conn.execute(
+                text(f"""
+                    INSERT INTO {GRAPH_TABLE} (id_estacao, id_vizinho, ordem, distancia_km, peso)
+                    VALUES (:id_estacao, :id_vizinho, :ordem, :distancia_km, :peso)
+                """),
+                edges,
+            )
+        # API workers reload their copy of the graph on a new stamp
+        bump_data_version(conn, "estacoes")
+
+    logger.info("Saved station neighbor graph to %s and %s (%s edges)", path, GRAPH_TABLE, len(edges))
+    return True
+
+
+__all__ = ["GRAPH_TABLE", "refresh_station_graph"]
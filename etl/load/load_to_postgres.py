@@ -12,6 +12,7 @@ import pandas as pd
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 
+from etl.load.data_version import bump_data_version
 from etl.utils.constants import DATABASE_URL
 from etl.utils.logger import get_logger
 
@@ -170,6 +171,9 @@ def load_dataframe(df: pd.DataFrame, engine: Optional[Engine] = None, chunksize:
             method="multi",
             chunksize=_safe_chunksize(df, chunksize),
         )
+        # climate_hourly backs /api/climate; new stamp revalidates client ETags
+        with eng.begin() as conn:
+            bump_data_version(conn, "climate")
     except Exception:
         logger.exception("Failed to load data into both bronze and legacy tables")
         raise
@@ -2,7 +2,10 @@
 Populate dim_estacao with weather stations from processed INMET CSV files.
 
 Extracts unique weather stations from normalized INMET data and inserts them
-into the dim_estacao dimension table.
+into the dim_estacao dimension table. Each station's coordinates are resolved
+once to the containing IBGE municipality (point-in-polygon), which sets
+dim_estacao.codigo_ibge and id_cidade (creating the dim_cidade_pe row if
+needed).
 """
 from __future__ import annotations
 
@@ -13,6 +16,8 @@ import pandas as pd
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 
+from etl.load.dim_cidade import upsert_cities
+from etl.load.load_station_graph import refresh_station_graph
 from etl.utils.constants import DATA_DIR, DATABASE_URL
 from etl.utils.logger import get_logger
 
@@ -26,19 +31,85 @@ def _get_engine(database_url: Optional[str] = None) -> Engine:
     return create_engine(url)
 
 
-def _get_city_map(engine: Engine) -> dict[str, int]:
+def _ensure_station_columns(engine: Engine) -> None:
+    """Add dim_estacao.codigo_ibge on databases created before the column existed.
+
+    Also drops the id_cidade the old backfill copied from id_estacao: every
+    city set by spatial resolution comes with its codigo_ibge.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE dim_estacao ADD COLUMN IF NOT EXISTS codigo_ibge INTEGER"))
+        cleared = conn.execute(text(
+            "UPDATE dim_estacao SET id_cidade = NULL WHERE codigo_ibge IS NULL AND id_cidade IS NOT NULL"
+        )).rowcount
+    if cleared:
+        logger.info("Cleared unresolved id_cidade on %d stations", cleared)
+
+
+def _get_resolved_stations(engine: Engine) -> dict[str, tuple[int, int, str]]:
     """
-    Map uppercase city name -> id_cidade from dim_cidade_pe.
+    Map codigo_estacao -> (codigo_ibge, id_cidade, municipio) for stations already resolved.
     """
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("SELECT UPPER(nome_cidade), id_cidade FROM dim_cidade_pe"))
-            return {row[0]: row[1] for row in result}
+            result = conn.execute(text("""
+                SELECT codigo_estacao, codigo_ibge, id_cidade, municipio
+                FROM dim_estacao
+                WHERE codigo_ibge IS NOT NULL AND id_cidade IS NOT NULL
+            """))
+            return {row[0]: (int(row[1]), int(row[2]), row[3]) for row in result}
     except Exception:
-        logger.warning("Could not load city map from dim_cidade_pe")
+        logger.warning("Could not load resolved stations from dim_estacao")
         return {}
 
 
+def _resolve_station_cities(df_stations: pd.DataFrame, engine: Engine) -> pd.DataFrame:
+    """
+    Resolve each station's lat/lon to its containing municipality.
+
+    Adds codigo_ibge, id_cidade and municipio (IBGE name). Stations already
+    resolved in dim_estacao keep their stored values; only new ones go
+    through the point-in-polygon lookup.
+    """
+    from etl.transform.geospatial_enrichment import resolve_municipalities
+
+    df = df_stations.copy()
+    known = _get_resolved_stations(engine)
+    for position, column in enumerate(["codigo_ibge", "id_cidade", "municipio"]):
+        stored = df["codigo_estacao"].map(lambda code: known[code][position] if code in known else None)
+        df[column] = stored if column != "municipio" else stored.fillna(df["municipio"])
+
+    pending = df["codigo_ibge"].isna()
+    if not pending.any():
+        logger.info("All %d stations already resolved to municipalities", len(df))
+        return df
+
+    try:
+        resolved = resolve_municipalities(df.loc[pending, "latitude"], df.loc[pending, "longitude"])
+    except OSError:
+        logger.warning("Municipality mesh not available; stations left without id_cidade")
+        return df
+    resolved.index = df.index[pending]
+
+    resolved = resolved.dropna(subset=["municipality_geocode"])
+    with engine.begin() as conn:
+        city_ids = upsert_cities(conn, (
+            (code, nome, None, None)
+            for code, nome in zip(resolved["municipality_geocode"], resolved["municipality"])
+        ))
+    for idx, row in resolved.iterrows():
+        codigo_ibge = int(row["municipality_geocode"])
+        df.at[idx, "codigo_ibge"] = codigo_ibge
+        df.at[idx, "municipio"] = row["municipality"]
+        df.at[idx, "id_cidade"] = city_ids.get(codigo_ibge)
+
+    unresolved = df.loc[df["codigo_ibge"].isna(), "codigo_estacao"].tolist()
+    if unresolved:
+        logger.warning("Could not resolve municipality for stations: %s", unresolved)
+    logger.info("Resolved %d new stations to municipalities", int(pending.sum()) - len(unresolved))
+    return df
+
+
 def _parse_float_br(value: Optional[str]) -> Optional[float]:
     """Parse Brazilian-style float (uses comma as decimal separator)."""
     if not value:
@@ -143,17 +214,21 @@ def _insert_stations_into_db(df_stations: pd.DataFrame, engine: Engine) -> int:
         return 0
     
     try:
-        city_map = _get_city_map(engine)
+        _ensure_station_columns(engine)
+        df_stations = _resolve_station_cities(df_stations, engine)
         # Insert into dim_estacao using ON CONFLICT to handle duplicates
         with engine.connect() as conn:
-            # Use raw SQL with ON CONFLICT DO NOTHING to avoid duplicates
+            # The spatial resolution is authoritative for id_cidade/codigo_ibge
+            # (already-resolved stations come back with their stored values)
             insert_sql = text("""
-                INSERT INTO dim_estacao (codigo_estacao, nome_estacao, uf, municipio, id_cidade, latitude, longitude, altitude_m)
-                VALUES (:codigo_estacao, :nome_estacao, :uf, :municipio, :id_cidade, :latitude, :longitude, :altitude_m)
+                INSERT INTO dim_estacao (codigo_estacao, nome_estacao, uf, municipio, id_cidade, codigo_ibge, latitude, longitude, altitude_m)
+                VALUES (:codigo_estacao, :nome_estacao, :uf, :municipio, :id_cidade, :codigo_ibge, :latitude, :longitude, :altitude_m)
                 ON CONFLICT (codigo_estacao) DO UPDATE
                 SET nome_estacao = EXCLUDED.nome_estacao,
-                    municipio = COALESCE(dim_estacao.municipio, EXCLUDED.municipio),
-                    id_cidade = COALESCE(dim_estacao.id_cidade, EXCLUDED.id_cidade),
+                    municipio = CASE WHEN EXCLUDED.codigo_ibge IS NOT NULL THEN EXCLUDED.municipio
+                                     ELSE COALESCE(dim_estacao.municipio, EXCLUDED.municipio) END,
+                    id_cidade = EXCLUDED.id_cidade,
+                    codigo_ibge = EXCLUDED.codigo_ibge,
                     latitude = COALESCE(dim_estacao.latitude, EXCLUDED.latitude),
                     longitude = COALESCE(dim_estacao.longitude, EXCLUDED.longitude),
                     altitude_m = COALESCE(dim_estacao.altitude_m, EXCLUDED.altitude_m)
@@ -162,14 +237,13 @@ def _insert_stations_into_db(df_stations: pd.DataFrame, engine: Engine) -> int:
             count = 0
             for _, row in df_stations.iterrows():
                 try:
-                    city_key = str(row["municipio"]).strip().upper()
-                    id_cidade = city_map.get(city_key)
                     conn.execute(insert_sql, {
                         "codigo_estacao": row["codigo_estacao"],
                         "nome_estacao": row["nome_estacao"],
                         "uf": row.get("uf", "PE"),
                         "municipio": row.get("municipio"),
-                        "id_cidade": id_cidade,
+                        "id_cidade": None if pd.isna(row["id_cidade"]) else int(row["id_cidade"]),
+                        "codigo_ibge": None if pd.isna(row["codigo_ibge"]) else int(row["codigo_ibge"]),
                         "latitude": row.get("latitude"),
                         "longitude": row.get("longitude"),
                         "altitude_m": row.get("altitude_m"),
@@ -180,17 +254,6 @@ def _insert_stations_into_db(df_stations: pd.DataFrame, engine: Engine) -> int:
                     continue
             
             conn.commit()
-
-            # Fallback: if no city match, set id_cidade = id_estacao to keep non-null
-            try:
-                conn.execute(text("""
-                    UPDATE dim_estacao
-                    SET id_cidade = id_estacao
-                    WHERE id_cidade IS NULL AND uf = 'PE'
-                """))
-                conn.commit()
-            except Exception:
-                logger.warning("Failed to backfill id_cidade with id_estacao")
             
             logger.info("Inserted %d stations into dim_estacao", count)
             return count
@@ -219,6 +282,12 @@ def populate_dim_estacao(data_dir: Optional[Path] = None, engine: Optional[Engin
     eng = engine or _get_engine()
     count = _insert_stations_into_db(df_stations, eng)
     
+    # Neighbor distances only change with the station set; no-op otherwise
+    try:
+        refresh_station_graph(eng)
+    except Exception:
+        logger.exception("Failed to refresh station neighbor graph")
+    
     logger.info("Completed dim_estacao population: %d rows inserted", count)
     return count
 
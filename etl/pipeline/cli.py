@@ -11,20 +11,25 @@ Usage:
     # Auxiliary Pipelines
     python -m etl.pipeline.cli run-mapbiomas                         # Download + Load MapBiomas land cover (aux_cobertura_vegetal_pe)
     python -m etl.pipeline.cli run-gold                              # Generate GOLD daily metrics from bronze_clima_pe_horario
+    python -m etl.pipeline.cli run-interp --method kriging           # Interpolate GOLD to municipalities without stations
+    python -m etl.pipeline.cli build-neighbors --k 8                 # (Re)build the station kNN graph if stations changed
 
 Pipeline Flow:
     run-full / run-inmet → Download INMET ZIP + Extract CSVs → Load to bronze_clima_pe_horario
     run-inc              → Load already-extracted CSVs to bronze_clima_pe_horario
-    run-gold             → Aggregate bronze (hourly) to GOLD (daily metrics)
+    run-gold             → Aggregate bronze (hourly) to GOLD (daily metrics), then run-interp
+    run-interp           → Interpolate GOLD to every other municipality (gold_clima_pe_interpolado)
     
     Use run-inc when CSV files are already extracted in data/inmet/processed/YYYY/
 """
 from __future__ import annotations
 
 import argparse
+from datetime import date
 
 from etl.pipeline.run_full_pipeline import run_full
 from etl.pipeline.run_incremental import run_incremental
+from etl.transform.station_graph import DEFAULT_GRAPH_NEIGHBORS
 from etl.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -78,6 +83,40 @@ def build_parser() -> argparse.ArgumentParser:
         help="Generate GOLD daily metrics from bronze_clima_pe_horario",
     )
 
+    # GOLD interpolation for municipalities without stations
+    interp_parser = subparsers.add_parser(
+        "run-interp",
+        help="Interpolate GOLD daily metrics to municipalities without stations",
+    )
+    interp_parser.add_argument(
+        "--method",
+        choices=["idw", "kriging"],
+        default="idw",
+        help="Interpolation method (default: idw)",
+    )
+    interp_parser.add_argument(
+        "--start",
+        type=date.fromisoformat,
+        help="Only interpolate days from this date (YYYY-MM-DD)",
+    )
+
+    # Station neighbor graph
+    neighbors_parser = subparsers.add_parser(
+        "build-neighbors",
+        help="Build the station kNN graph (.npz + dim_estacao_vizinhos) if stations or k changed",
+    )
+    neighbors_parser.add_argument(
+        "--k",
+        type=int,
+        default=DEFAULT_GRAPH_NEIGHBORS,
+        help=f"Neighbors per station (default: {DEFAULT_GRAPH_NEIGHBORS})",
+    )
+    neighbors_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild even if stations did not change",
+    )
+
     # Populate dimension tables
     subparsers.add_parser(
         "populate-stations",
@@ -129,7 +168,17 @@ def main() -> None:
             
             logger.info("Reading bronze_clima_pe_horario from database...")
             engine = create_engine(DATABASE_URL)
-            df_bronze = pd.read_sql("SELECT * FROM bronze_clima_pe_horario ORDER BY data_hora_utc", engine)
+            # Stations carry their municipality (resolved once in populate-stations)
+            df_bronze = pd.read_sql(
+                """
+                SELECT b.*, e.id_cidade
+                FROM bronze_clima_pe_horario b
+                JOIN dim_estacao e ON e.id_estacao = b.id_estacao
+                WHERE e.id_cidade IS NOT NULL
+                ORDER BY b.data_hora_utc
+                """,
+                engine,
+            )
             
             if df_bronze.empty:
                 logger.warning("No data found in bronze_clima_pe_horario")
@@ -141,11 +190,30 @@ def main() -> None:
             logger.info("Loading %s GOLD records into database", len(df_gold))
             load_gold(df_gold, engine=engine)
             
+            # Fill municipalities without stations so the map covers the state
+            from etl.pipeline.run_interpolation import run_interpolation
+
+            run_interpolation(engine=engine)
+            
             logger.info("GOLD pipeline completed successfully!")
         except Exception as e:
             logger.exception("GOLD pipeline failed: %s", e)
             raise
     
+    elif args.command == "run-interp":
+        logger.info("Running GOLD interpolation (%s)", args.method)
+        from etl.pipeline.run_interpolation import run_interpolation
+
+        count = run_interpolation(method=args.method, start=args.start)
+        logger.info("Interpolated %d GOLD records", count)
+    
+    elif args.command == "build-neighbors":
+        logger.info("Refreshing station neighbor graph (k=%s)", args.k)
+        from etl.load.load_station_graph import refresh_station_graph
+
+        rebuilt = refresh_station_graph(k=args.k, force=args.force)
+        logger.info("Station neighbor graph %s", "rebuilt" if rebuilt else "already up to date")
+    
     elif args.command == "populate-stations":
         logger.info("Populating dim_estacao from extracted INMET CSV files")
         from etl.load.populate_dim_estacao import populate_dim_estacao
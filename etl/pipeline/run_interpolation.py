@@ -0,0 +1,99 @@
+"""
+Interpolate GOLD daily metrics to municipalities without INMET stations.
+
+Steps:
+  1. Make sure every municipality of the IBGE mesh exists in dim_cidade_pe
+  2. Locate source cities at the mean coordinates of their stations (dim_estacao)
+  3. Read their gold_clima_pe_diario rows and interpolate to the other
+     municipalities' centroids (IDW or ordinary kriging)
+  4. UPSERT the estimates into gold_clima_pe_interpolado
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Optional
+
+import pandas as pd
+from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy.engine import Engine
+
+from etl.load.dim_cidade import upsert_cities
+from etl.load.load_gold import load_gold_interpolated
+from etl.transform.geospatial_enrichment import get_municipality_index
+from etl.transform.interpolate_gold import INTERPOLATED_METRICS, interpolate_daily
+from etl.utils.constants import DATABASE_URL
+from etl.utils.logger import get_logger
+from etl.utils.timers import time_block
+
+logger = get_logger(__name__)
+
+
+def _get_engine(database_url: Optional[str] = None) -> Engine:
+    url = database_url or DATABASE_URL
+    if not url:
+        raise ValueError("DATABASE_URL is not set")
+    return create_engine(url)
+
+
+def _municipality_targets(engine: Engine) -> pd.DataFrame:
+    """id_cidade, codigo_ibge, latitude, longitude (mesh centroid) of all municipalities."""
+    index = get_municipality_index()
+    centroids = index.centroids()
+    with engine.begin() as conn:
+        city_ids = upsert_cities(conn, (
+            (code, nome, float(lat), float(lon))
+            for code, nome, (lon, lat) in zip(index.codes, index.names, centroids)
+        ))
+    return pd.DataFrame({
+        "id_cidade": [city_ids[code] for code in index.codes],
+        "codigo_ibge": index.codes,
+        "latitude": centroids[:, 1],
+        "longitude": centroids[:, 0],
+    })
+
+
+def _station_cities(engine: Engine) -> pd.DataFrame:
+    """id_cidade, latitude, longitude of cities with resolved stations."""
+    return pd.read_sql(
+        """
+        SELECT id_cidade, AVG(latitude)::float AS latitude, AVG(longitude)::float AS longitude
+        FROM dim_estacao
+        WHERE id_cidade IS NOT NULL AND latitude IS NOT NULL AND longitude IS NOT NULL
+        GROUP BY id_cidade
+        """,
+        engine,
+    )
+
+
+def _read_gold(engine: Engine, city_ids, start: Optional[date]) -> pd.DataFrame:
+    metrics = ", ".join(f"{m}::float AS {m}" for m in INTERPOLATED_METRICS)
+    query = text(f"""
+        SELECT id_cidade, data, {metrics}
+        FROM gold_clima_pe_diario
+        WHERE id_cidade IN :ids AND (CAST(:start AS DATE) IS NULL OR data >= :start)
+    """).bindparams(bindparam("ids", expanding=True))
+    return pd.read_sql(query, engine, params={"ids": [int(i) for i in city_ids], "start": start})
+
+
+def run_interpolation(
+    engine: Optional[Engine] = None,
+    method: str = "idw",
+    start: Optional[date] = None,
+) -> int:
+    """Run the interpolation stage; returns the number of rows written."""
+    eng = engine or _get_engine()
+    with time_block("gold_interpolation"):
+        targets = _municipality_targets(eng)
+        sources = _station_cities(eng)
+        if sources.empty:
+            logger.warning("No stations resolved to cities; run populate-stations first")
+            return 0
+
+        # Cities with stations keep their observed GOLD rows
+        targets = targets[~targets["id_cidade"].isin(sources["id_cidade"])]
+        df_gold = _read_gold(eng, sources["id_cidade"], start)
+        df_interp = interpolate_daily(df_gold, sources, targets, method=method)
+        return load_gold_interpolated(df_interp, engine=eng)
+
+
+__all__ = ["run_interpolation"]
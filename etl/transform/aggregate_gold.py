@@ -46,8 +46,8 @@ def aggregate_daily(df_bronze: pd.DataFrame) -> pd.DataFrame:
     """
     Aggregate hourly bronze climate data to daily GOLD metrics by city.
     
-    Input columns expected from bronze_clima_pe_horario:
-        - id_estacao or id_cidade
+    Input columns expected from bronze_clima_pe_horario joined with dim_estacao:
+        - id_cidade
         - data_hora_utc (or datetime_utc)
         - temp_ar_c
         - temp_max_ant, temp_min_ant
@@ -83,13 +83,15 @@ def aggregate_daily(df_bronze: pd.DataFrame) -> pd.DataFrame:
         logger.error("No date column found in bronze data")
         return df.iloc[0:0]
     
-    # Ensure we have id_cidade (from id_estacao lookup if needed)
-    if "id_cidade" not in df.columns and "id_estacao" in df.columns:
-        logger.warning("Using id_estacao as id_cidade (no proper join available)")
-        df["id_cidade"] = df["id_estacao"]
-    elif "id_cidade" not in df.columns:
-        logger.error("No id_cidade or id_estacao column found")
+    # id_cidade comes from dim_estacao (resolved spatially by populate_dim_estacao)
+    if "id_cidade" not in df.columns:
+        logger.error("No id_cidade column found; join bronze with dim_estacao first")
         return df.iloc[0:0]
+    missing_city = df["id_cidade"].isna()
+    if missing_city.any():
+        logger.warning("Dropping %s rows from stations without id_cidade", int(missing_city.sum()))
+        df = df[~missing_city]
+    df["id_cidade"] = df["id_cidade"].astype(int)
     
     # Map column names from bronze schema
     column_mapping = {
@@ -1,36 +1,205 @@
 """
 Geospatial enrichment utilities.
+
+Station coordinates are resolved to IBGE municipalities by point-in-polygon
+tests against the IBGE mesh (``municipios_pe.geojson``). A uniform grid over
+the polygons' bounding boxes narrows each lookup to a handful of candidates,
+and only distinct coordinates are resolved; rows get the result by a
+vectorized broadcast.
 """
 from __future__ import annotations
 
-from typing import Optional
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from etl.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Repository layout (backend/app/static) and Docker layout (/app/app/static)
+_GEOJSON_CANDIDATES = [
+    Path(__file__).resolve().parents[2] / "backend" / "app" / "static" / "geo" / "municipios_pe.geojson",
+    Path(__file__).resolve().parents[2] / "app" / "static" / "geo" / "municipios_pe.geojson",
+]
+
+GRID_CELL_DEGREES = 0.1
+# Coastal stations may fall just outside the mesh; snap to the closest
+# municipality boundary within this distance (~5 km)
+MAX_SNAP_DEGREES = 0.05
+
+
+def default_geojson_path() -> Path:
+    env_path = os.getenv("MUNICIPIOS_GEOJSON")
+    if env_path:
+        return Path(env_path)
+    for candidate in _GEOJSON_CANDIDATES:
+        if candidate.exists():
+            return candidate
+    return _GEOJSON_CANDIDATES[0]
+
+
+class MunicipalityIndex:
+    """Grid-bucketed polygon index answering lon/lat -> (IBGE code, name)."""
+
+    def __init__(self, features: Iterable[dict], cell: float = GRID_CELL_DEGREES):
+        self.cell = cell
+        self.codes: List[int] = []
+        self.names: List[str] = []
+        self.rings: List[List[np.ndarray]] = []  # all rings (exterior + holes) per feature
+        self.bboxes: List[Tuple[float, float, float, float]] = []
+        self.grid: Dict[Tuple[int, int], List[int]] = {}
+
+        for feature in features:
+            geometry = feature.get("geometry") or {}
+            coords = geometry.get("coordinates") or []
+            polygons = [coords] if geometry.get("type") == "Polygon" else coords
+            rings = [np.asarray(ring, dtype=float)[:, :2] for polygon in polygons for ring in polygon if len(ring) >= 4]
+            if not rings:
+                continue
+            props = feature.get("properties") or {}
+            stacked = np.vstack(rings)
+            bbox = (*stacked.min(axis=0), *stacked.max(axis=0))
+            idx = len(self.codes)
+            self.codes.append(int(props.get("codarea") or props.get("id") or props.get("codigo")))
+            self.names.append(props.get("nome"))
+            self.rings.append(rings)
+            self.bboxes.append(bbox)
+            for key in self._cells(bbox):
+                self.grid.setdefault(key, []).append(idx)
+
+    @classmethod
+    def from_geojson(cls, path: Path) -> "MunicipalityIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(data.get("features", []))
+        logger.info("Built municipality index from %s (%s polygons, %s cells)", path.name, len(index.codes), len(index.grid))
+        return index
+
+    def _cells(self, bbox) -> Iterable[Tuple[int, int]]:
+        min_x, min_y, max_x, max_y = bbox
+        for i in range(int(np.floor(min_x / self.cell)), int(np.floor(max_x / self.cell)) + 1):
+            for j in range(int(np.floor(min_y / self.cell)), int(np.floor(max_y / self.cell)) + 1):
+                yield i, j
+
+    def _contains(self, idx: int, lon: float, lat: float) -> bool:
+        """Even-odd ray casting over all rings, so holes are excluded."""
+        inside = False
+        for ring in self.rings[idx]:
+            x0, y0 = ring[:-1, 0], ring[:-1, 1]
+            x1, y1 = ring[1:, 0], ring[1:, 1]
+            crosses = (y0 > lat) != (y1 > lat)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x_at = x0 + (lat - y0) * (x1 - x0) / (y1 - y0)
+            inside ^= bool(np.count_nonzero(crosses & (lon < x_at)) % 2)
+        return inside
 
-def _mock_ibge_lookup(latitude: float, longitude: float) -> str:
-    """Mock lookup that returns a placeholder municipality name."""
-    if pd.isna(latitude) or pd.isna(longitude):
-        return "Unknown"
-    return "Municipio Desconhecido"
+    def _candidates(self, lon: float, lat: float, pad: float = 0.0) -> List[int]:
+        keys = self._cells((lon - pad, lat - pad, lon + pad, lat + pad))
+        found = {idx for key in keys for idx in self.grid.get(key, ())}
+        return [
+            idx for idx in sorted(found)
+            if self.bboxes[idx][0] - pad <= lon <= self.bboxes[idx][2] + pad
+            and self.bboxes[idx][1] - pad <= lat <= self.bboxes[idx][3] + pad
+        ]
 
+    def centroids(self) -> np.ndarray:
+        """(lon, lat) area centroid of each feature's largest ring, shape (n, 2)."""
+        out = np.empty((len(self.codes), 2))
+        for idx, rings in enumerate(self.rings):
+            best_area = 0.0
+            for ring in rings:
+                x, y = ring[:, 0], ring[:, 1]
+                cross = x[:-1] * y[1:] - x[1:] * y[:-1]
+                area = cross.sum() / 2
+                if abs(area) > abs(best_area):
+                    best_area = area
+                    out[idx] = (
+                        ((x[:-1] + x[1:]) * cross).sum() / (6 * area),
+                        ((y[:-1] + y[1:]) * cross).sum() / (6 * area),
+                    )
+        return out
 
-def enrich_with_geospatial(df: pd.DataFrame) -> pd.DataFrame:
-    """Add municipality information using station coordinates.
+    def lookup(self, lon: float, lat: float) -> Optional[int]:
+        """Return the feature position containing (lon, lat), or the nearest within snap distance."""
+        if pd.isna(lon) or pd.isna(lat):
+            return None
+        for idx in self._candidates(lon, lat):
+            if self._contains(idx, lon, lat):
+                return idx
 
-    TODO: Integrate IBGE API to map latitude/longitude to municipality codes.
-    This placeholder uses a deterministic mock to allow downstream processing.
+        best, best_dist = None, MAX_SNAP_DEGREES
+        for idx in self._candidates(lon, lat, pad=MAX_SNAP_DEGREES):
+            dist = min(float(np.hypot(ring[:, 0] - lon, ring[:, 1] - lat).min()) for ring in self.rings[idx])
+            if dist <= best_dist:
+                best, best_dist = idx, dist
+        return best
+
+
+@lru_cache(maxsize=4)
+def get_municipality_index(path: Optional[Path] = None) -> MunicipalityIndex:
+    """Build (once per process) the index over the municipality mesh."""
+    return MunicipalityIndex.from_geojson(path or default_geojson_path())
+
+
+def resolve_municipalities(
+    latitudes: Iterable[float], longitudes: Iterable[float], index: Optional[MunicipalityIndex] = None
+) -> pd.DataFrame:
+    """Resolve coordinates to ``municipality_geocode`` / ``municipality`` (one row per input)."""
+    index = index or get_municipality_index()
+    positions = [index.lookup(lon, lat) for lat, lon in zip(latitudes, longitudes)]
+    return pd.DataFrame({
+        "municipality_geocode": pd.array([index.codes[p] if p is not None else None for p in positions], dtype="Int64"),
+        "municipality": [index.names[p] if p is not None else None for p in positions],
+    })
+
+
+def enrich_with_geospatial(df: pd.DataFrame, index: Optional[MunicipalityIndex] = None) -> pd.DataFrame:
+    """Add IBGE municipality code and name using station coordinates.
+
+    Each distinct (latitude, longitude) pair is resolved once; rows receive
+    the result through their factorized coordinate code.
     """
     df = df.copy()
-    df["municipality"] = df.apply(
-        lambda row: _mock_ibge_lookup(row.get("latitude"), row.get("longitude")), axis=1
+    if df.empty:
+        df["municipality_geocode"] = pd.array([], dtype="Int64")
+        df["municipality"] = pd.Series([], dtype=object)
+        return df
+
+    try:
+        index = index or get_municipality_index()
+    except OSError:
+        logger.warning("Municipality mesh not found at %s; skipping geospatial enrichment", default_geojson_path())
+        df["municipality_geocode"] = pd.array([None] * len(df), dtype="Int64")
+        df["municipality"] = None
+        return df
+
+    codes, uniques = pd.MultiIndex.from_frame(df[["latitude", "longitude"]]).factorize()
+    resolved = resolve_municipalities(
+        uniques.get_level_values(0), uniques.get_level_values(1), index
+    )
+    # NaN coordinates factorize to -1, which take() maps to a missing value
+    df["municipality_geocode"] = resolved["municipality_geocode"].array.take(codes, allow_fill=True)
+    df["municipality"] = resolved["municipality"].astype(object).array.take(codes, allow_fill=True)
+
+    logger.info(
+        "Enriched geospatial data for %s rows (%s distinct coordinates, %s unresolved)",
+        len(df),
+        len(uniques),
+        int(resolved["municipality_geocode"].isna().sum()),
     )
-    logger.info("Enriched geospatial data for %s rows", len(df))
     return df
 
 
-__all__ = ["enrich_with_geospatial"]
+__all__ = [
+    "MunicipalityIndex",
+    "default_geojson_path",
+    "enrich_with_geospatial",
+    "get_municipality_index",
+    "resolve_municipalities",
+]
@@ -0,0 +1,222 @@
+"""
+Spatial interpolation of daily GOLD metrics for municipalities without stations.
+
+Weights from each target municipality (mesh centroid) to its nearest source
+cities (those with INMET stations, located at their stations' mean
+coordinates) are computed once per run, either by inverse-distance weighting
+or by ordinary kriging, and then applied to every day at once as a
+(days x targets x neighbors) array product. Days where a neighbor has no
+data renormalize the remaining weights.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from etl.transform.aggregate_gold import classify_heat_risk
+from etl.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Neighbors per target and the distance beyond which a source is ignored
+DEFAULT_NEIGHBORS = 6
+MAX_DISTANCE_KM = 150.0
+IDW_POWER = 2.0
+
+# Exponential variogram for ordinary kriging (range in km; the sill cancels out)
+KRIGING_RANGE_KM = 150.0
+KRIGING_NUGGET = 0.05
+
+METHODS = ("idw", "kriging")
+
+INTERPOLATED_METRICS = [
+    "temp_media",
+    "temp_max",
+    "temp_min",
+    "umidade_media",
+    "precipitacao_total",
+    "radiacao_total",
+    "aparente_media",
+    "heat_index_max",
+    "rolling_heat_7d",
+]
+
+
+@dataclass
+class NeighborWeights:
+    """Precomputed neighbor indices/weights for a fixed set of sources and targets."""
+
+    method: str
+    neighbors: np.ndarray  # (targets, k) positions into the source axis
+    weights: np.ndarray  # (targets, k); zero for sources beyond MAX_DISTANCE_KM
+    distances_km: np.ndarray  # (targets, k)
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in km; broadcasts like numpy."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _variogram(h: np.ndarray) -> np.ndarray:
+    return np.where(h > 0, KRIGING_NUGGET + (1 - KRIGING_NUGGET) * (1 - np.exp(-3 * h / KRIGING_RANGE_KM)), 0.0)
+
+
+def _kriging_weights(src_lat, src_lon, neighbors, distances) -> np.ndarray:
+    """Solve the ordinary kriging system of each target over its neighbors."""
+    weights = np.zeros_like(distances)
+    for t, (idx, d) in enumerate(zip(neighbors, distances)):
+        usable = d <= MAX_DISTANCE_KM
+        n = int(usable.sum())
+        if n == 0:
+            continue
+        if n == 1:
+            weights[t, usable] = 1.0
+            continue
+        sel = idx[usable]
+        between = haversine_km(src_lat[sel][:, None], src_lon[sel][:, None], src_lat[sel][None, :], src_lon[sel][None, :])
+        system = np.ones((n + 1, n + 1))
+        system[:n, :n] = _variogram(between)
+        system[n, n] = 0.0
+        rhs = np.append(_variogram(d[usable]), 1.0)
+        try:
+            weights[t, usable] = np.linalg.solve(system, rhs)[:n]
+        except np.linalg.LinAlgError:
+            weights[t, usable] = 1.0 / n
+    return weights
+
+
+def compute_weights(
+    source_coords: np.ndarray,
+    target_coords: np.ndarray,
+    method: str = "idw",
+    k: int = DEFAULT_NEIGHBORS,
+) -> NeighborWeights:
+    """
+    Neighbor weights from targets to sources; coordinates are (lat, lon) arrays.
+
+    Distances are a dense (targets x sources) haversine matrix: with a few
+    dozen stations this is cheaper than building a spatial tree.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown interpolation method: {method}")
+    src_lat, src_lon = source_coords[:, 0], source_coords[:, 1]
+    dist = haversine_km(target_coords[:, 0][:, None], target_coords[:, 1][:, None], src_lat[None, :], src_lon[None, :])
+
+    k = min(k, len(src_lat))
+    neighbors = np.argpartition(dist, k - 1, axis=1)[:, :k]
+    distances = np.take_along_axis(dist, neighbors, axis=1)
+    order = np.argsort(distances, axis=1)
+    neighbors = np.take_along_axis(neighbors, order, axis=1)
+    distances = np.take_along_axis(distances, order, axis=1)
+
+    if method == "idw":
+        with np.errstate(divide="ignore"):
+            weights = 1.0 / np.maximum(distances, 1e-6) ** IDW_POWER
+        weights[distances > MAX_DISTANCE_KM] = 0.0
+        total = weights.sum(axis=1, keepdims=True)
+        weights = np.divide(weights, total, out=np.zeros_like(weights), where=total > 0)
+    else:
+        weights = _kriging_weights(src_lat, src_lon, neighbors, distances)
+    return NeighborWeights(method, neighbors, weights, distances)
+
+
+def apply_weights(values: np.ndarray, weights: NeighborWeights) -> np.ndarray:
+    """Interpolate a (days x sources) array to (days x targets), skipping missing values."""
+    gathered = values[:, weights.neighbors]  # (days, targets, k)
+    valid = ~np.isnan(gathered) & (weights.weights != 0)
+    w = np.where(valid, weights.weights, 0.0)
+    total = w.sum(axis=2)
+    estimate = np.where(valid, gathered, 0.0)
+    estimate = (estimate * w).sum(axis=2)
+    return np.divide(estimate, total, out=np.full_like(total, np.nan), where=np.abs(total) > 1e-9)
+
+
+def interpolate_daily(
+    df_gold: pd.DataFrame,
+    source_coords: pd.DataFrame,
+    targets: pd.DataFrame,
+    method: str = "idw",
+    k: int = DEFAULT_NEIGHBORS,
+) -> pd.DataFrame:
+    """
+    Estimate daily metrics for target cities from source-city GOLD rows.
+
+    Args:
+        df_gold: GOLD rows (id_cidade, data, metrics...) of the source cities
+        source_coords: id_cidade, latitude, longitude of cities with stations
+        targets: id_cidade, latitude, longitude of cities to estimate
+        method: "idw" or "kriging"
+        k: neighbors per target
+
+    Returns:
+        DataFrame shaped like gold_clima_pe_interpolado
+    """
+    sources = source_coords[source_coords["id_cidade"].isin(df_gold["id_cidade"].unique())]
+    if df_gold.empty or sources.empty or targets.empty:
+        logger.warning("Nothing to interpolate (gold=%s, sources=%s, targets=%s)", len(df_gold), len(sources), len(targets))
+        return pd.DataFrame()
+
+    source_ids = sources["id_cidade"].to_numpy()
+    weights = compute_weights(
+        sources[["latitude", "longitude"]].to_numpy(dtype=float),
+        targets[["latitude", "longitude"]].to_numpy(dtype=float),
+        method=method,
+        k=k,
+    )
+
+    gold = df_gold.assign(data=pd.to_datetime(df_gold["data"]).dt.date)
+    days = np.sort(gold["data"].unique())
+    metrics = [m for m in INTERPOLATED_METRICS if m in gold.columns]
+    if "heat_index_max" not in metrics:
+        logger.warning("GOLD rows lack heat_index_max; nothing to interpolate")
+        return pd.DataFrame()
+
+    result = pd.DataFrame({
+        "id_cidade": np.tile(targets["id_cidade"].to_numpy(), len(days)),
+        "data": np.repeat(days, len(targets)),
+    })
+    for metric in metrics:
+        grid = (
+            gold.pivot_table(index="data", columns="id_cidade", values=metric, aggfunc="mean")
+            .reindex(index=days, columns=source_ids)
+            .to_numpy(dtype=float)
+        )
+        result[metric] = apply_weights(grid, weights).reshape(-1).round(2)
+        if metric == "heat_index_max":
+            # Sources that actually contributed to the risk estimate
+            used = ~np.isnan(grid[:, weights.neighbors]) & (weights.weights != 0)
+            result["n_vizinhos"] = used.sum(axis=2).reshape(-1)
+    result["distancia_min_km"] = np.tile(weights.distances_km[:, 0].round(2), len(days))
+
+    if "temp_max" in result.columns and "temp_min" in result.columns:
+        result["amplitude_termica"] = (result["temp_max"] - result["temp_min"]).round(2)
+    result["risco_calor"] = result["heat_index_max"].map(classify_heat_risk)
+    result["metodo"] = method
+
+    result = result.dropna(subset=["heat_index_max"]).reset_index(drop=True)
+    logger.info(
+        "Interpolated %s daily records for %s municipalities over %s days (%s, %s sources)",
+        len(result),
+        len(targets),
+        len(days),
+        method,
+        len(source_ids),
+    )
+    return result
+
+
+__all__ = [
+    "INTERPOLATED_METRICS",
+    "METHODS",
+    "NeighborWeights",
+    "apply_weights",
+    "compute_weights",
+    "haversine_km",
+    "interpolate_daily",
+]
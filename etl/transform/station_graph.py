@@ -0,0 +1,142 @@
+"""
+k-nearest-neighbor graph between INMET stations.
+
+The graph is a CSR structure (``indptr``/``indices`` plus per-edge haversine
+distance and row-normalized inverse-distance weight) over the stations of
+dim_estacao. A fingerprint of the station codes and coordinates and the
+requested k are stored with it, so consumers can tell whether the graph is
+still current without recomputing any distance.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from etl.transform.interpolate_gold import IDW_POWER, haversine_km
+from etl.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_GRAPH_NEIGHBORS = 8
+
+
+@dataclass
+class StationGraph:
+    station_ids: np.ndarray  # (n,) id_estacao, row order of the CSR arrays
+    codes: np.ndarray  # (n,) codigo_estacao
+    indptr: np.ndarray  # (n + 1,)
+    indices: np.ndarray  # (nnz,) row positions of the neighbors
+    distances_km: np.ndarray  # (nnz,)
+    weights: np.ndarray  # (nnz,) inverse-distance weights, each row sums to 1
+    fingerprint: str
+    k: Optional[int] = None  # requested neighbors per station (None: unknown, older files)
+
+    def neighbors(self, row: int) -> slice:
+        return slice(self.indptr[row], self.indptr[row + 1])
+
+    def edges(self):
+        """Yield (id_estacao, id_vizinho, ordem, distancia_km, peso) for each edge."""
+        for row in range(len(self.station_ids)):
+            span = self.neighbors(row)
+            for order, (col, dist, weight) in enumerate(
+                zip(self.indices[span], self.distances_km[span], self.weights[span]), start=1
+            ):
+                yield int(self.station_ids[row]), int(self.station_ids[col]), order, float(dist), float(weight)
+
+
+def station_fingerprint(codes: Sequence[str], lats: Sequence[float], lons: Sequence[float]) -> str:
+    """Stable hash of the station set and positions (order-independent)."""
+    items = sorted(f"{c}:{float(la):.6f}:{float(lo):.6f}" for c, la, lo in zip(codes, lats, lons))
+    return hashlib.sha1("|".join(items).encode("utf-8")).hexdigest()
+
+
+def build_neighbor_graph(
+    station_ids: Sequence[int],
+    codes: Sequence[str],
+    lats: Sequence[float],
+    lons: Sequence[float],
+    k: int = DEFAULT_GRAPH_NEIGHBORS,
+) -> StationGraph:
+    """Build the kNN graph; the n x n distance matrix is computed once, here."""
+    lat = np.asarray(lats, dtype=float)
+    lon = np.asarray(lons, dtype=float)
+    n = len(lat)
+    requested = k
+    k = max(0, min(k, n - 1))
+
+    dist = haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+    np.fill_diagonal(dist, np.inf)
+    if k:
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        nearest_dist = np.take_along_axis(dist, nearest, axis=1)
+        order = np.argsort(nearest_dist, axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        nearest_dist = np.take_along_axis(nearest_dist, order, axis=1)
+        weights = 1.0 / np.maximum(nearest_dist, 1e-3) ** IDW_POWER
+        weights /= weights.sum(axis=1, keepdims=True)
+    else:
+        nearest = np.empty((n, 0), dtype=int)
+        nearest_dist = weights = np.empty((n, 0))
+
+    graph = StationGraph(
+        station_ids=np.asarray(station_ids, dtype=np.int64),
+        codes=np.asarray(codes, dtype=str),
+        indptr=np.arange(0, n * k + 1, k, dtype=np.int64) if n else np.zeros(1, dtype=np.int64),
+        indices=nearest.reshape(-1).astype(np.int32),
+        distances_km=nearest_dist.reshape(-1).astype(np.float32),
+        weights=weights.reshape(-1).astype(np.float32),
+        fingerprint=station_fingerprint(codes, lat, lon),
+        k=requested,
+    )
+    logger.info("Built station neighbor graph: %s stations, k=%s, %s edges", n, k, len(graph.indices))
+    return graph
+
+
+def save_graph(graph: StationGraph, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp.npz")
+    np.savez_compressed(
+        tmp,
+        station_ids=graph.station_ids,
+        codes=graph.codes,
+        indptr=graph.indptr,
+        indices=graph.indices,
+        distances_km=graph.distances_km,
+        weights=graph.weights,
+        fingerprint=np.asarray(graph.fingerprint),
+        k=np.asarray(-1 if graph.k is None else graph.k),
+    )
+    tmp.replace(path)
+
+
+def load_graph(path: Path) -> Optional[StationGraph]:
+    """Load a saved graph, or None if the file is missing or unreadable."""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            k = int(data["k"]) if "k" in data.files else -1
+            return StationGraph(
+                station_ids=data["station_ids"],
+                codes=data["codes"],
+                indptr=data["indptr"],
+                indices=data["indices"],
+                distances_km=data["distances_km"],
+                weights=data["weights"],
+                fingerprint=str(data["fingerprint"]),
+                k=None if k < 0 else k,
+            )
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+__all__ = [
+    "DEFAULT_GRAPH_NEIGHBORS",
+    "StationGraph",
+    "build_neighbor_graph",
+    "load_graph",
+    "save_graph",
+    "station_fingerprint",
+]
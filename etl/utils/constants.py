@@ -15,6 +15,8 @@ DATA_DIR: Final[Path] = Path(os.getenv("DATA_DIR", "data/inmet"))
 RAW_DIR: Final[Path] = DATA_DIR / "raw"
 PROCESSED_DIR: Final[Path] = DATA_DIR / "processed"
 DATABASE_URL: Final[str | None] = os.getenv("DATABASE_URL")
+# kNN graph between stations (rebuilt by populate-stations when stations change)
+STATION_GRAPH_PATH: Final[Path] = Path(os.getenv("STATION_GRAPH_PATH", str(DATA_DIR.parent / "station_neighbors.npz")))
 
 # Data defaults
 START_YEAR: Final[int] = int(os.getenv("START_YEAR", "1961"))
@@ -45,6 +47,7 @@ CANONICAL_COLUMNS: Final[List[str]] = [
     "thermal_amplitude",
     "rolling_heat_7d",
     "municipality",
+    "municipality_geocode",
 ]
 
 
@@ -54,6 +57,7 @@ __all__ = [
     "RAW_DIR",
     "PROCESSED_DIR",
     "DATABASE_URL",
+    "STATION_GRAPH_PATH",
     "TARGET_SCHEMA",
     "TARGET_TABLE",
     "CANONICAL_COLUMNS",
@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Gera níveis de detalhe (LOD) simplificados da malha de municípios de PE.
+
+A partir de ``municipios_pe.geojson`` (resolução total do IBGE):
+
+1. Extrai a topologia: as fronteiras compartilhadas entre municípios viram
+   arcos únicos (cortados nas junções onde três ou mais polígonos se tocam).
+2. Calcula, uma única vez por arco, a área efetiva de Visvalingam–Whyatt de
+   cada vértice. Como cada fronteira é simplificada uma só vez, vizinhos
+   continuam encaixados, sem buracos nem sobreposições, em qualquer nível.
+3. Para cada nível (``high``, ``medium``, ``low``) mantém os vértices acima do
+   limiar de área, quantiza as coordenadas e grava:
+       municipios_pe.<nivel>.geojson   (GeoJSON compacto, coordenadas arredondadas)
+       municipios_pe.<nivel>.topojson  (TopoJSON com arcos compartilhados e delta)
+
+Uso:
+    python scripts/build_geo_lod.py
+    python scripts/build_geo_lod.py --input caminho/municipios.geojson --output-dir destino/
+"""
+
+import argparse
+import heapq
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+GEO_DIR = PROJECT_ROOT / "backend" / "app" / "static" / "geo"
+INPUT_MUNICIPIOS = GEO_DIR / "municipios_pe.geojson"
+
+# Limiar de área efetiva (graus²), casas decimais do GeoJSON e quantização do TopoJSON.
+# 1e-6 grau² ≈ 0,012 km² na latitude de PE.
+LEVELS: Dict[str, Dict[str, float]] = {
+    "high": {"min_area": 1.5e-6, "decimals": 4, "quantization": 100_000},
+    "medium": {"min_area": 1.5e-5, "decimals": 3, "quantization": 30_000},
+    "low": {"min_area": 1e-4, "decimals": 3, "quantization": 10_000},
+}
+
+# Propriedades mantidas nas features de saída
+KEEP_PROPERTIES = ("id", "codigo", "codarea", "nome")
+
+Point = Tuple[float, float]
+
+
+# ============================================================================
+# TOPOLOGIA
+# ============================================================================
+
+def _polygons_of(geometry: dict) -> List[List[List[Point]]]:
+    """Retorna a geometria como lista de polígonos, cada um uma lista de anéis abertos."""
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        raise ValueError(f"Geometria não suportada: {geometry['type']}")
+
+    result = []
+    for polygon in polygons:
+        rings = []
+        for ring in polygon:
+            points: List[Point] = []
+            for x, y in ((c[0], c[1]) for c in ring):
+                if not points or points[-1] != (x, y):
+                    points.append((x, y))
+            if len(points) > 1 and points[0] == points[-1]:
+                points.pop()
+            if len(points) >= 3:
+                rings.append(points)
+        if rings:
+            result.append(rings)
+    return result
+
+
+class Topology:
+    """Anéis de polígonos decompostos em arcos compartilhados e deduplicados."""
+
+    def __init__(self, features: Sequence[dict]):
+        self.arcs: List[List[Point]] = []
+        self._index: Dict[Tuple[Point, ...], int] = {}
+        self.features = []  # (properties, [[ [arc refs] por anel ] por polígono])
+
+        polygons_by_feature = [_polygons_of(f["geometry"]) for f in features]
+        junctions = self._find_junctions(
+            ring for polygons in polygons_by_feature for polygon in polygons for ring in polygon
+        )
+
+        for feature, polygons in zip(features, polygons_by_feature):
+            refs = [[self._ring_arcs(ring, junctions) for ring in polygon] for polygon in polygons]
+            self.features.append((feature.get("properties") or {}, refs))
+
+        logger.info(
+            "Topologia: %d features, %d arcos, %d junções",
+            len(self.features), len(self.arcs), len(junctions),
+        )
+
+    @staticmethod
+    def _find_junctions(rings) -> set:
+        """Vértices com mais de dois vizinhos distintos (encontro de fronteiras)."""
+        neighbors: Dict[Point, set] = {}
+        for ring in rings:
+            n = len(ring)
+            for i, point in enumerate(ring):
+                nb = neighbors.setdefault(point, set())
+                nb.add(ring[i - 1])
+                nb.add(ring[(i + 1) % n])
+        return {point for point, nb in neighbors.items() if len(nb) > 2}
+
+    def _ring_arcs(self, ring: List[Point], junctions: set) -> List[int]:
+        cuts = [i for i, point in enumerate(ring) if point in junctions]
+        if not cuts:
+            # Anel sem junções (ilha ou enclave inteiro): início canônico no menor vértice,
+            # para que o mesmo anel visto pelo vizinho gere o mesmo arco
+            start = ring.index(min(ring))
+            rotated = ring[start:] + ring[:start]
+            return [self._add_arc(rotated + [rotated[0]])]
+
+        rotated = ring[cuts[0]:] + ring[:cuts[0]]
+        offsets = [c - cuts[0] for c in cuts] + [len(ring)]
+        closed = rotated + [rotated[0]]
+        return [self._add_arc(closed[a:b + 1]) for a, b in zip(offsets, offsets[1:])]
+
+    def _add_arc(self, points: List[Point]) -> int:
+        key = tuple(points)
+        if key in self._index:
+            return self._index[key]
+        reverse = key[::-1]
+        if reverse in self._index:
+            return ~self._index[reverse]
+        self._index[key] = len(self.arcs)
+        self.arcs.append(points)
+        return self._index[key]
+
+
+# ============================================================================
+# SIMPLIFICAÇÃO (VISVALINGAM–WHYATT)
+# ============================================================================
+
+def _triangle_area(a: Point, b: Point, c: Point) -> float:
+    return abs((b[0] - a[0]) * (c[1] - a[1]) - (c[0] - a[0]) * (b[1] - a[1])) / 2.0
+
+
+def visvalingam_weights(points: Sequence[Point]) -> List[float]:
+    """
+    Área efetiva de cada vértice (extremos = infinito).
+
+    Um vértice removido com área menor que a do anterior herda a área anterior,
+    garantindo que os limiares gerem simplificações aninhadas.
+    """
+    n = len(points)
+    weights = [float("inf")] * n
+    if n < 3:
+        return weights
+
+    prev = list(range(-1, n - 1))
+    nxt = list(range(1, n + 1))
+    area = [0.0] * n
+    heap = []
+    for i in range(1, n - 1):
+        area[i] = _triangle_area(points[i - 1], points[i], points[i + 1])
+        heap.append((area[i], i))
+    heapq.heapify(heap)
+
+    removed = [False] * n
+    max_area = 0.0
+    while heap:
+        a, i = heapq.heappop(heap)
+        if removed[i] or a != area[i]:
+            continue
+        max_area = max(max_area, a)
+        weights[i] = max_area
+        removed[i] = True
+        p, q = prev[i], nxt[i]
+        nxt[p], prev[q] = q, p
+        for j in (p, q):
+            if 0 < j < n - 1:
+                area[j] = _triangle_area(points[prev[j]], points[j], points[nxt[j]])
+                heapq.heappush(heap, (area[j], j))
+    return weights
+
+
+def _select_points(topology: Topology, weights: List[List[float]], min_area: float) -> List[List[bool]]:
+    """Máscara de vértices mantidos por arco, garantindo anéis com ao menos 3 vértices."""
+    keep = [[w >= min_area for w in arc_weights] for arc_weights in weights]
+
+    def ring_size(refs: List[int]) -> int:
+        return sum(sum(keep[r if r >= 0 else ~r]) - 1 for r in refs)
+
+    for _, polygons in topology.features:
+        for rings in polygons:
+            for refs in rings:
+                missing = 3 - ring_size(refs)
+                if missing <= 0:
+                    continue
+                # Devolve os vértices de maior área ao arco (vale para os dois vizinhos)
+                candidates = sorted(
+                    (
+                        (weights[idx][i], idx, i)
+                        for idx in {r if r >= 0 else ~r for r in refs}
+                        for i in range(len(keep[idx]))
+                        if not keep[idx][i]
+                    ),
+                    reverse=True,
+                )
+                for _, idx, i in candidates[:missing]:
+                    keep[idx][i] = True
+    return keep
+
+
+# ============================================================================
+# SAÍDAS
+# ============================================================================
+
+def _ring_coordinates(refs: List[int], arcs: List[List[Point]]) -> List[Point]:
+    ring: List[Point] = []
+    for r in refs:
+        arc = arcs[r] if r >= 0 else arcs[~r][::-1]
+        ring.extend(arc if not ring else arc[1:])
+    return ring
+
+
+def _round_ring(ring: List[Point], decimals: int) -> List[List[float]]:
+    rounded: List[List[float]] = []
+    for x, y in ring:
+        point = [round(x, decimals), round(y, decimals)]
+        if not rounded or rounded[-1] != point:
+            rounded.append(point)
+    return rounded
+
+
+def _filter_properties(properties: dict) -> dict:
+    return {k: properties[k] for k in KEEP_PROPERTIES if k in properties}
+
+
+def build_geojson(topology: Topology, arcs: List[List[Point]], decimals: int) -> dict:
+    """Monta um FeatureCollection a partir dos arcos simplificados."""
+    features = []
+    for properties, polygons in topology.features:
+        out_polygons = []
+        for rings in polygons:
+            out_rings = []
+            for k, refs in enumerate(rings):
+                coords = _ring_coordinates(refs, arcs)
+                rounded = _round_ring(coords + [coords[0]], decimals)
+                if len(rounded) < 4:
+                    if k > 0:
+                        continue  # buraco colapsado pelo arredondamento
+                    rounded = [[x, y] for x, y in coords + [coords[0]]]
+                out_rings.append(rounded)
+            out_polygons.append(out_rings)
+
+        if len(out_polygons) == 1:
+            geometry = {"type": "Polygon", "coordinates": out_polygons[0]}
+        else:
+            geometry = {"type": "MultiPolygon", "coordinates": out_polygons}
+        features.append({
+            "type": "Feature",
+            "id": properties.get("id"),
+            "properties": _filter_properties(properties),
+            "geometry": geometry,
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+def build_topojson(topology: Topology, arcs: List[List[Point]], quantization: int, object_name: str = "municipios") -> dict:
+    """Monta um TopoJSON quantizado (arcos em delta) com os arcos simplificados."""
+    xs = [x for arc in arcs for x, _ in arc]
+    ys = [y for arc in arcs for _, y in arc]
+    x0, y0, x1, y1 = min(xs), min(ys), max(xs), max(ys)
+    kx = (x1 - x0) / (quantization - 1) or 1.0
+    ky = (y1 - y0) / (quantization - 1) or 1.0
+
+    encoded_arcs = []
+    for arc in arcs:
+        encoded = []
+        px = py = 0
+        last = None
+        for x, y in arc:
+            qx, qy = round((x - x0) / kx), round((y - y0) / ky)
+            if (qx, qy) == last:
+                continue
+            encoded.append([qx - px, qy - py])
+            px, py, last = qx, qy, (qx, qy)
+        if len(encoded) == 1:
+            encoded.append([0, 0])  # arco colapsado: mantém dois pontos
+        encoded_arcs.append(encoded)
+
+    geometries = []
+    for properties, polygons in topology.features:
+        if len(polygons) == 1:
+            geometry = {"type": "Polygon", "arcs": polygons[0]}
+        else:
+            geometry = {"type": "MultiPolygon", "arcs": polygons}
+        geometry["id"] = properties.get("id")
+        geometry["properties"] = _filter_properties(properties)
+        geometries.append(geometry)
+
+    return {
+        "type": "Topology",
+        "bbox": [x0, y0, x1, y1],
+        "transform": {"scale": [kx, ky], "translate": [x0, y0]},
+        "objects": {object_name: {"type": "GeometryCollection", "geometries": geometries}},
+        "arcs": encoded_arcs,
+    }
+
+
+def _write_json(data: dict, path: Path) -> None:
+    path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    logger.info("   - %s: %.1f KB", path.name, path.stat().st_size / 1024)
+
+
+def build_levels(input_path: Path = INPUT_MUNICIPIOS, output_dir: Optional[Path] = None) -> Dict[str, Path]:
+    """Gera os arquivos GeoJSON/TopoJSON de cada nível; retorna {nivel: caminho GeoJSON}."""
+    output_dir = output_dir or input_path.parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    data = json.loads(input_path.read_text(encoding="utf-8"))
+    topology = Topology(data.get("features", []))
+    weights = [visvalingam_weights(arc) for arc in topology.arcs]
+    total_points = sum(len(arc) for arc in topology.arcs)
+
+    stem = input_path.name.split(".")[0]
+    outputs = {}
+    for level, params in LEVELS.items():
+        keep = _select_points(topology, weights, params["min_area"])
+        arcs = [[p for p, k in zip(arc, mask) if k] for arc, mask in zip(topology.arcs, keep)]
+        kept = sum(len(arc) for arc in arcs)
+        logger.info("Nível %s: %d de %d vértices (%.1f%%)", level, kept, total_points, 100 * kept / total_points)
+
+        geojson_path = output_dir / f"{stem}.{level}.geojson"
+        _write_json(build_geojson(topology, arcs, int(params["decimals"])), geojson_path)
+        _write_json(build_topojson(topology, arcs, int(params["quantization"])), output_dir / f"{stem}.{level}.topojson")
+        outputs[level] = geojson_path
+    return outputs
+
+
+def main() -> bool:
+    parser = argparse.ArgumentParser(description="Gera níveis de detalhe simplificados da malha de municípios")
+    parser.add_argument("--input", type=Path, default=INPUT_MUNICIPIOS, help="GeoJSON de entrada")
+    parser.add_argument("--output-dir", type=Path, default=None, help="Diretório de saída (padrão: o da entrada)")
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        logger.error("Arquivo não encontrado: %s (execute scripts/fetch_ibge_malhas_pe.py)", args.input)
+        return False
+
+    build_levels(args.input, args.output_dir)
+    return True
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
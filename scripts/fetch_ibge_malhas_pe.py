@@ -4,6 +4,9 @@
 Script para baixar malhas geográficas dos municípios de Pernambuco
 usando a API v4 do IBGE e consolidar em um único FeatureCollection.
 
+Ao final gera também os níveis de detalhe simplificados
+(ver scripts/build_geo_lod.py).
+
 Uso:
     python scripts/fetch_ibge_malhas_pe.py
 """
@@ -15,6 +18,8 @@ from pathlib import Path
 
 import requests
 
+from build_geo_lod import build_levels
+
 # Configuração de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -192,10 +197,10 @@ def save_geojson(features: list, output_path: Path) -> None:
     # Criar diretório se não existir
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Salvar com encoding UTF-8 e sem escape ASCII
+    # Salvar compacto (sem indentação), com encoding UTF-8 e sem escape ASCII
     try:
         output_path.write_text(
-            json.dumps(feature_collection, ensure_ascii=False, indent=2),
+            json.dumps(feature_collection, ensure_ascii=False, separators=(",", ":")),
             encoding="utf-8"
         )
         logger.info(f"✅ GeoJSON salvo com sucesso: {output_path}")
@@ -228,7 +233,7 @@ def fetch_estado_pe() -> None:
         # Salvar
         OUTPUT_ESTADO.parent.mkdir(parents=True, exist_ok=True)
         OUTPUT_ESTADO.write_text(
-            json.dumps(feature_collection, ensure_ascii=False, indent=2),
+            json.dumps(feature_collection, ensure_ascii=False, separators=(",", ":")),
             encoding="utf-8"
         )
         logger.info(f"✅ Malha do estado PE salva: {OUTPUT_ESTADO}")
@@ -258,7 +263,11 @@ def main():
         # 3. Salvar GeoJSON consolidado
         save_geojson(features, OUTPUT_MUNICIPIOS)
         
-        # 4. (Opcional) Buscar e salvar malha do estado
+        # 4. Gerar níveis de detalhe simplificados (GeoJSON + TopoJSON)
+        logger.info("-" * 70)
+        build_levels(OUTPUT_MUNICIPIOS)
+        
+        # 5. (Opcional) Buscar e salvar malha do estado
         logger.info("-" * 70)
         fetch_estado_pe()
         
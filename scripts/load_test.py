@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Closed-loop load test for the read endpoints, at increasing concurrency.
+
+Each level runs N client threads that issue requests back to back for a
+fixed duration, then reports throughput and latency percentiles. Run it once
+against the sync workers and once against the gevent workers to compare how
+throughput scales with concurrency.
+
+Usage:
+    python scripts/load_test.py --base-url http://localhost:8000
+    python scripts/load_test.py --concurrency 1,8,32,128 --duration 15 \\
+        --path /api/gold/mapa --path /dashboard/mapa/dados
+
+The API response cache should be off (CACHE_ENABLED=0) to measure the
+database path rather than cache hits.
+"""
+
+import argparse
+import http.client
+import itertools
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = [
+    "/api/gold/mapa",
+    "/api/gold/resumo",
+    "/api/gold/1/serie",
+    "/dashboard/mapa/dados",
+]
+
+
+def _worker(base, paths, deadline, latencies, errors, lock):
+    """Issue requests over one keep-alive connection until the deadline."""
+    conn_class = http.client.HTTPSConnection if base.scheme == "https" else http.client.HTTPConnection
+    conn = conn_class(base.hostname, base.port, timeout=60)
+    local_latencies, local_errors = [], 0
+    for path in itertools.cycle(paths):
+        if time.perf_counter() >= deadline:
+            break
+        start = time.perf_counter()
+        try:
+            conn.request("GET", base.path.rstrip("/") + path)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                local_errors += 1
+            else:
+                local_latencies.append(time.perf_counter() - start)
+        except (OSError, http.client.HTTPException):
+            local_errors += 1
+            conn.close()
+            conn = conn_class(base.hostname, base.port, timeout=60)
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+
+def run_level(base, paths, concurrency, duration):
+    latencies, errors, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_worker, args=(base, paths, deadline, latencies, errors, lock), daemon=True)
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else float("nan")
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "rps": len(latencies) / elapsed,
+        "p50": pct(0.50),
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+        "mean": statistics.fmean(latencies) * 1000 if latencies else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the read API at increasing concurrency")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    parser.add_argument("--path", action="append", dest="paths", help="endpoint to hit (repeatable)")
+    args = parser.parse_args()
+
+    base = urlsplit(args.base_url)
+    paths = args.paths or DEFAULT_PATHS
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    # Warm up: first requests pay for worker boot, imports and connection setup
+    run_level(base, paths, max(levels), 1.0)
+
+    print(f"Target: {args.base_url}  paths: {', '.join(paths)}  {args.duration:g}s per level")
+    print(f"{'clients':>8} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    baseline = None
+    for concurrency in levels:
+        r = run_level(base, paths, concurrency, args.duration)
+        baseline = baseline or r["rps"]
+        scale = r["rps"] / baseline if baseline else float("nan")
+        print(
+            f"{r['concurrency']:>8} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.1f} "
+            f"{r['p50']:>9.1f} {r['p95']:>9.1f} {r['p99']:>9.1f}   x{scale:.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())